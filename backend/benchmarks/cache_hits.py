@@ -0,0 +1,88 @@
+"""
+Önbellek isabetinde yanıt üretme maliyeti: eski yol (json.loads + Sanic json() ile yeniden serileştirme)
+ile ham bayt yolu (RawJSON gövdesi olduğu gibi yazılır) karşılaştırılır.
+
+    cd backend && python -m benchmarks.cache_hits --iterations 20000
+
+Redis ağ gecikmesi iki yolda da aynı olduğu için ölçüme katılmaz.
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DB_URL", "sqlite://:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from sanic.response import json as sanic_json  # noqa: E402
+from src import serialization  # noqa: E402
+from src.serialization import RawJSON, respond  # noqa: E402
+
+
+def events_page(limit: int):
+    now = datetime(2025, 3, 1, 18, 0)
+    return {
+        "events": [{
+            "id": i,
+            "title": f"Etkinlik {i}: Yapay Zekâ ve Öğrenci Toplulukları",
+            "description": "Kampüs içi buluşma; konuşmacılar, atölyeler ve soru-cevap oturumu. " * 3,
+            "date": str(now + timedelta(hours=i)),
+            "club_name": "Bilgisayar Topluluğu",
+            "club_id": 3,
+            "location": "Mühendislik Fakültesi Amfi 2",
+            "image_url": f"https://cdn.example.com/events/{i}.jpg",
+            "capacity": 150,
+            "participant_count": 40 + i,
+            "comment_count": i % 7,
+        } for i in range(limit)],
+        "pagination": {"total": 5000, "page": 1, "limit": limit, "total_pages": 5000 // limit},
+    }
+
+
+def clubs_list(count: int):
+    return {"clubs": [{
+        "id": i,
+        "name": f"Kulüp {i}",
+        "description": "Öğrencilerin ortak ilgi alanları etrafında buluştuğu topluluk. " * 2,
+        "image_url": f"https://cdn.example.com/clubs/{i}.png",
+        "status": "active",
+        "follower_count": 100 + i,
+        "created_at": "2024-09-01 10:00:00",
+    } for i in range(count)]}
+
+
+WEATHER = {"weather": {"city": "Ankara", "temperature": 12.4, "wind_speed": 8.1, "description": "Parçalı Bulutlu",
+                       "latitude": 39.92, "longitude": 32.85}}
+
+
+def per_hit_us(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run(iterations: int):
+    payloads = {
+        "events (20)": events_page(20),
+        "events (100)": events_page(100),
+        "clubs (50)": clubs_list(50),
+        "weather": WEATHER,
+    }
+    print(f"{'payload':>14} {'bytes':>8} {'before us':>11} {'after us':>10} {'speedup':>8}")
+    for name, payload in payloads.items():
+        # Redis decode_responses=True ile str döner; iki yol da aynı girdiden başlar
+        old_cached = json.dumps(payload)
+        new_cached = serialization.dumps(payload).decode("utf-8")
+
+        before = per_hit_us(lambda: sanic_json(json.loads(old_cached), status=200), iterations)
+        after = per_hit_us(lambda: respond(RawJSON(new_cached), 200), iterations)
+        print(f"{name:>14} {len(new_cached.encode()):>8} {before:>11.1f} {after:>10.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.iterations)
@@ -0,0 +1,85 @@
+"""
+Etkinlik listesinde OFFSET ve keyset (cursor) sayfalamanın derin sayfalardaki maliyetini karşılaştırır.
+
+    cd backend && python -m benchmarks.event_pagination --events 1000000
+
+Geçici bir SQLite dosyası kullanır; MySQL'de mutlak süreler farklı olsa da eğilim aynıdır.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DB_URL", "sqlite://:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from tortoise import Tortoise  # noqa: E402
+from src import pagination  # noqa: E402
+from src.models import Clubs, Events  # noqa: E402
+from src.services.event_service import EventService  # noqa: E402
+
+INSERT_CHUNK = 20000
+
+
+async def populate(total: int):
+    club = await Clubs.create(club_name="Benchmark Kulübü", status="active")
+    conn = Tortoise.get_connection("default")
+    now = datetime.now()
+    sql = (
+        "INSERT INTO events (created_at, updated_at, is_deleted, club_id, title, event_date, quota, "
+        "participant_count, comment_count) VALUES (?, ?, 0, ?, ?, ?, 0, 0, 0)"
+    )
+    for start in range(0, total, INSERT_CHUNK):
+        rows = [
+            (now, now, club.club_id, f"Etkinlik {i}", now + timedelta(minutes=i // 3))
+            for i in range(start, min(start + INSERT_CHUNK, total))
+        ]
+        await conn.execute_many(sql, rows)
+    await conn.execute_script("CREATE INDEX IF NOT EXISTS idx_bench_events_date ON events (event_date, event_id)")
+
+
+async def timed(coro_factory, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await coro_factory()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def run(total: int, limit: int, repeat: int):
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["src.models"]})
+    await Tortoise.generate_schemas()
+    try:
+        started = time.perf_counter()
+        await populate(total)
+        print(f"{total} events inserted in {time.perf_counter() - started:.1f}s\n")
+
+        last_page = max(total // limit, 1)
+        pages = sorted({1, 10, 100, last_page // 10, last_page // 2, last_page} - {0})
+
+        print(f"{'page':>10} {'offset ms':>12} {'cursor ms':>12}")
+        for page in pages:
+            offset = (page - 1) * limit
+            cursor = None
+            if offset:
+                anchor = await Events.all().order_by("event_date", "event_id").offset(offset - 1).first()
+                cursor = pagination.encode_cursor(anchor.event_date, anchor.event_id)
+
+            offset_ms = await timed(lambda: EventService.get_events(None, page, limit), repeat)
+            cursor_ms = await timed(lambda: EventService.get_events_by_cursor(None, cursor, limit), repeat)
+            print(f"{page:>10} {offset_ms:>12.2f} {cursor_ms:>12.2f}")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.events, args.limit, args.repeat))
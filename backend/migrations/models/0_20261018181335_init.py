@@ -0,0 +1,166 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS `users` (
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL,
+    `is_deleted` BOOL NOT NULL,
+    `deleted_at` DATETIME(6),
+    `user_id` BIGINT NOT NULL PRIMARY KEY,
+    `first_name` VARCHAR(50) NOT NULL,
+    `last_name` VARCHAR(50) NOT NULL,
+    `email` VARCHAR(150) NOT NULL UNIQUE,
+    `password` VARCHAR(255) NOT NULL,
+    `department` VARCHAR(100),
+    `gender` VARCHAR(10),
+    `profile_image` VARCHAR(255),
+    `bio` LONGTEXT,
+    `interests` LONGTEXT,
+    `role` VARCHAR(10) NOT NULL COMMENT 'STUDENT: student\nCLUB_ADMIN: club_admin\nADMIN: admin',
+    KEY `idx_users_email_133a6f` (`email`)
+) CHARACTER SET utf8mb4;
+CREATE TABLE IF NOT EXISTS `clubs` (
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL,
+    `is_deleted` BOOL NOT NULL,
+    `deleted_at` DATETIME(6),
+    `club_id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `club_name` VARCHAR(150) NOT NULL UNIQUE,
+    `description` LONGTEXT,
+    `logo_url` VARCHAR(255),
+    `status` VARCHAR(20) NOT NULL,
+    `created_by_id` BIGINT,
+    `president_id` BIGINT,
+    CONSTRAINT `fk_clubs_users_eed2ce85` FOREIGN KEY (`created_by_id`) REFERENCES `users` (`user_id`) ON DELETE SET NULL,
+    CONSTRAINT `fk_clubs_users_c22cdc2c` FOREIGN KEY (`president_id`) REFERENCES `users` (`user_id`) ON DELETE SET NULL
+) CHARACTER SET utf8mb4;
+CREATE TABLE IF NOT EXISTS `club_followers` (
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL,
+    `is_deleted` BOOL NOT NULL,
+    `deleted_at` DATETIME(6),
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `club_id` INT NOT NULL,
+    `user_id` BIGINT NOT NULL,
+    UNIQUE KEY `uid_club_follow_user_id_a5c943` (`user_id`, `club_id`),
+    CONSTRAINT `fk_club_fol_clubs_c258fb4f` FOREIGN KEY (`club_id`) REFERENCES `clubs` (`club_id`) ON DELETE CASCADE,
+    CONSTRAINT `fk_club_fol_users_7f14b037` FOREIGN KEY (`user_id`) REFERENCES `users` (`user_id`) ON DELETE CASCADE
+) CHARACTER SET utf8mb4;
+CREATE TABLE IF NOT EXISTS `events` (
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL,
+    `is_deleted` BOOL NOT NULL,
+    `deleted_at` DATETIME(6),
+    `event_id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `title` VARCHAR(150) NOT NULL,
+    `description` LONGTEXT,
+    `image_url` VARCHAR(255),
+    `event_date` DATETIME(6) NOT NULL,
+    `end_time` DATETIME(6),
+    `location` VARCHAR(255),
+    `quota` INT NOT NULL,
+    `club_id` INT NOT NULL,
+    `created_by_id` BIGINT,
+    CONSTRAINT `fk_events_clubs_480b5c79` FOREIGN KEY (`club_id`) REFERENCES `clubs` (`club_id`) ON DELETE CASCADE,
+    CONSTRAINT `fk_events_users_ad30f8c5` FOREIGN KEY (`created_by_id`) REFERENCES `users` (`user_id`) ON DELETE SET NULL
+) CHARACTER SET utf8mb4;
+CREATE TABLE IF NOT EXISTS `event_comments` (
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL,
+    `is_deleted` BOOL NOT NULL,
+    `deleted_at` DATETIME(6),
+    `comment_id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `content` LONGTEXT NOT NULL,
+    `event_id` INT NOT NULL,
+    `user_id` BIGINT NOT NULL,
+    CONSTRAINT `fk_event_co_events_9a9b4a53` FOREIGN KEY (`event_id`) REFERENCES `events` (`event_id`) ON DELETE CASCADE,
+    CONSTRAINT `fk_event_co_users_4015e91b` FOREIGN KEY (`user_id`) REFERENCES `users` (`user_id`) ON DELETE CASCADE
+) CHARACTER SET utf8mb4;
+CREATE TABLE IF NOT EXISTS `event_participants` (
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL,
+    `is_deleted` BOOL NOT NULL,
+    `deleted_at` DATETIME(6),
+    `participation_id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `status` VARCHAR(10) NOT NULL COMMENT 'GOING: going\nINTERESTED: interested',
+    `event_id` INT NOT NULL,
+    `user_id` BIGINT NOT NULL,
+    UNIQUE KEY `uid_event_parti_event_i_7fc653` (`event_id`, `user_id`),
+    CONSTRAINT `fk_event_pa_events_f1f21506` FOREIGN KEY (`event_id`) REFERENCES `events` (`event_id`) ON DELETE CASCADE,
+    CONSTRAINT `fk_event_pa_users_55ce61e8` FOREIGN KEY (`user_id`) REFERENCES `users` (`user_id`) ON DELETE CASCADE
+) CHARACTER SET utf8mb4;
+CREATE TABLE IF NOT EXISTS `notifications` (
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL,
+    `is_deleted` BOOL NOT NULL,
+    `deleted_at` DATETIME(6),
+    `notification_id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `message` VARCHAR(255) NOT NULL,
+    `is_read` BOOL NOT NULL,
+    `club_id` INT,
+    `event_id` INT,
+    `user_id` BIGINT NOT NULL,
+    CONSTRAINT `fk_notifica_clubs_4beadfa0` FOREIGN KEY (`club_id`) REFERENCES `clubs` (`club_id`) ON DELETE CASCADE,
+    CONSTRAINT `fk_notifica_events_b11787e0` FOREIGN KEY (`event_id`) REFERENCES `events` (`event_id`) ON DELETE CASCADE,
+    CONSTRAINT `fk_notifica_users_e6f60ccf` FOREIGN KEY (`user_id`) REFERENCES `users` (`user_id`) ON DELETE CASCADE
+) CHARACTER SET utf8mb4;
+CREATE TABLE IF NOT EXISTS `aerich` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `version` VARCHAR(255) NOT NULL,
+    `app` VARCHAR(100) NOT NULL,
+    `content` JSON NOT NULL
+) CHARACTER SET utf8mb4;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        """
+
+
+MODELS_STATE = (
+    "eJztXVtz2joQ/iuMn9qZnE5CkibNGxCScppAJyHndJp2PMIWxFNfqC03zfTkvx/JF2z5hp"
+    "VgDGbfQNaC/K201n67K/+RDEvFuvOup7uTC0vXrUdsO9JZ649kIgPTD9kd9loSms+jy6yB"
+    "oInuSSi0qzzl+k4cYiOF0KtTpDuYNqnYUWxtTjTLpK2mq+us0VJoR82cRU2uqf10sUysGS"
+    "YP2KYX7u8l16Gf9vx/kr5/p580U8W/MRv5Pfs6/yFPNayr3J1oKpPx2mXyNPfaBia58Dqy"
+    "f5/IiqW7hhl1nj+RB8tc9NZMwlpn2MQ2Ipj9PLFddjtstMH9h3fojzzq4g8xJqPiKXJ1Er"
+    "v9iRy1SbI8HI3l2/5YliUBwBTLZGDTofp6nLEh/NU+ODo5Oj18f3RKu3jDXLScPPt/HQHj"
+    "C3rwDMfSs3cdEeT38DCOQFVszJCQEUmDe06vEM3A2Qjzkgmk1UD0XfghiXuIchHwYUOEfD"
+    "T71gE9vUF1ZOpPgcoLcB4Prvu34871Z/Z3huP81D38OuM+u9L2Wp8SrW/ev2XtFl1Y/rpb"
+    "/Ejr38H4Y4t9bX0dDfsevJZDZrb3j1G/8VeJjQm5xJJN61FGamx2hq0harRnpHV3rr5Q67"
+    "wkaH1TtB5iFFN7MPqYAXUoXDpmqkhpvWtZOkZmjjHlBBNKn1DJqvS8aKlA0QWK7Y5GV5xO"
+    "u4Mxr7Xh3XW3f/PmwFMm7aQRHLe3EeYBbi9YabzkClZaYBg2ZaFt78JK21NvyyS0P4lJLN"
+    "+kbIPZXMk+JfaEolvETES72iwX1JhQk0D90G4fHp609w/fnx4fnZwcn+4v0E1fKoK5O7hk"
+    "SHPLxIeebbqnPzJ3iOFmnVfDhWVjbWZ+wk+eKgZ03MhUcAb0gQNy5wTOxJbp4DmcZGFrZE"
+    "lt9LhwU+Jzj968b7xZe69z2+uc96WUvVgBpsypazKmMSOZjSmbthOk/HhEtipz85ddsdpW"
+    "omXRN33JaBvJFmSimQcOuws2Zg72HCe7hHNdgU9d1oeu+EEF3jR4083yq8Cb3kWtgzcN3j"
+    "R407V6096XlJJ7D8gu2KeEQgn9UqBesqbq3aoY6LesY3NGHujXg+P9Ag3/07npfezQBXS8"
+    "n1DbMLjU9q8lV1M0shTSY/w7Z0eYEHsR1lu0evpfxtzCCSF9c9358pZbPFej4WXYPaaC3t"
+    "Wom0Bet2aW7Nq6yASPyzQBc36Ct4+PS0xw2it3gnvXeJip/0xcRwTkSGI1JqQMxhL1ArVf"
+    "WFoPzmXsSDvfjLRTViT0XCZPwnxdSvRFrN2mzeu1kXZxLczp81dTsUmElZCUBB2siDhdAL"
+    "tG9nTD9FCW6EvOQY7to4NoDe+urqQcswPwLuVRk3Y2B998OjXCnUsMSliZQPTi0w3WUc7+"
+    "MC8facuIjTzouTmKf2HW/VVA9Re/0USEfK/NItpUUzwgXonWMPlTzVjQz1WGM7wZ1rMMA4"
+    "dPz0RYg++wVxTe8GY8HX+sbz1xDn8EgqEOTgiiHRDt2DXeG6Idu6h1iHZAtGMr90lbuLAy"
+    "oh2WSTJJgnwGPiayPpqyQfS7v0sV2hvGRZqUWwgJm43jHb2pugJSrHHMw16CFouv6eU5m5"
+    "AHu5o82HpyNr3J/BnZRFO0OQpuPpvp4HvtLac75qFAJZTHfbSgvSlYul5yHr8Psaddlijw"
+    "IcCH7JpnDHzILmod+BDgQ4APqYsPKUra6puukdpn15/ANbOYcsR0K12OBsPLs5Yn+82ks7"
+    "1/Q7Hrn5+1qFYxBTQwEcKpoqUyRQsSRVMZXkCXAF0CdAnQJUCX7BZdkp8MUiYLpMbsj8of"
+    "WMB0ANPRLJ8XmI5d1DowHcB0ANNRF9NBNKIL1bguBBqR9QEVrhuybqpIsdEM6liIlrhyQk"
+    "1AfQ01rr7jwgy66KOCl2zgpqxJzwps0lvQso5EWKLkmBzsBjZZw7qloOwHVdGZAEpeQRTY"
+    "y2x7+dO1CBIghhb918e471eF7opjGHDq6coRhbMUNi9ABId1lisyX3ZYJ1Tv11+9H6/MTd"
+    "gW0Zr0eEFwQ6Y0f6JKIqv3lXClsoqbiJnvUkI9f631/DxmGSHcFKj5kdyUKusJ6MaHIbbj"
+    "zJCE8C6Ed3ct0Afh3V3UOoR3Iby7lRumLVxYaXtqYMehOzQRPjcm0sAQbyV8LjVDzDiLG6"
+    "9QCiyXgOVaP+W7YQZq1YxvHbUVDYcUSis2hTmHGoDV1ADU+OqwDbMVlQQj1l4BtKWgLi8A"
+    "qqdYxbcPGUTnwnDkE5yuU8k7zssSm5vxrNoEMnMt5+UD5bk75BdQnruodaA8N5M4AMpzFy"
+    "jPqWY7RPjVbbxUA4nPUqUtBZUt6cIWHb0AZ04IYC4BMzaQJlTBshCANxCWqc+aI8d5tOyM"
+    "53A+xHGZBk7iSoIkKmbZbEYmzZGPNC/VvPqCg/1yRyUVnZWUmtIUEDWL9cyHOZJoIsSrPo"
+    "xqbltTTceyVysoZDeSgs1DuxLbMdGsNMz5tbNB9yaAu/aa2eDct4yc2Xy8OSFAXRx128or"
+    "wl9+2mAou8azBh3ihu+UFEBfuh3fnfeH47NWIP/N7F3ddeXO+fVgeNbywiVINTTzmxk0ed"
+    "+k2kx+KqpYprrBfzdhcBbjy5POd+LdhCFtrYSBwNfh1aCwF+9oA0RLZxLUFAnXFLGVt7K3"
+    "g+5EaVFor9b6TtVtXI41Vl9tzcSqMhuhg21NeZAy0hGCK3tF+Qgo6lNLQoJQJiLUU0lnZZ"
+    "ILftF9pODJHjERIDnLERVsUQkgHHRvILqV8Jq5ryn8+3Y0zMmMyX1NoaoppPVfS9ecbcyt"
+    "LQCXgVHMUCTJiD0+Cst+oCvm/67+Yfb8P0vjv6E="
+)
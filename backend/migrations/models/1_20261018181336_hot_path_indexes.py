@@ -0,0 +1,84 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `clubs` ADD `follower_count` INT NOT NULL DEFAULT 0;
+        ALTER TABLE `events` ADD `comment_count` INT NOT NULL DEFAULT 0;
+        ALTER TABLE `events` ADD `participant_count` INT NOT NULL DEFAULT 0;
+        ALTER TABLE `club_followers` ADD INDEX `idx_club_follow_club_id_ec033b` (`club_id`);
+        ALTER TABLE `clubs` ADD INDEX `idx_clubs_is_dele_069373` (`is_deleted`, `status`);
+        ALTER TABLE `event_comments` ADD INDEX `idx_event_comme_user_id_db2db2` (`user_id`, `created_at`);
+        ALTER TABLE `event_comments` ADD INDEX `idx_event_comme_event_i_24dcab` (`event_id`, `created_at`);
+        ALTER TABLE `event_participants` ADD INDEX `idx_event_parti_event_i_142b7f` (`event_id`, `status`);
+        ALTER TABLE `event_participants` ADD INDEX `idx_event_parti_user_id_02305d` (`user_id`, `status`, `created_at`);
+        ALTER TABLE `events` ADD INDEX `idx_events_club_id_e66dbf` (`club_id`, `event_date`);
+        ALTER TABLE `events` ADD INDEX `idx_events_is_dele_f43d40` (`is_deleted`, `event_date`);
+        ALTER TABLE `notifications` ADD INDEX `idx_notificatio_user_id_3674cf` (`user_id`, `is_read`, `created_at`);
+        ALTER TABLE `events` ADD FULLTEXT INDEX `ft_events_title_description` (`title`, `description`);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `events` DROP INDEX `ft_events_title_description`;
+        ALTER TABLE `notifications` DROP INDEX `idx_notificatio_user_id_3674cf`;
+        ALTER TABLE `events` DROP INDEX `idx_events_is_dele_f43d40`;
+        ALTER TABLE `events` DROP INDEX `idx_events_club_id_e66dbf`;
+        ALTER TABLE `event_participants` DROP INDEX `idx_event_parti_user_id_02305d`;
+        ALTER TABLE `event_participants` DROP INDEX `idx_event_parti_event_i_142b7f`;
+        ALTER TABLE `event_comments` DROP INDEX `idx_event_comme_event_i_24dcab`;
+        ALTER TABLE `event_comments` DROP INDEX `idx_event_comme_user_id_db2db2`;
+        ALTER TABLE `clubs` DROP INDEX `idx_clubs_is_dele_069373`;
+        ALTER TABLE `club_followers` DROP INDEX `idx_club_follow_club_id_ec033b`;
+        ALTER TABLE `clubs` DROP COLUMN `follower_count`;
+        ALTER TABLE `events` DROP COLUMN `comment_count`;
+        ALTER TABLE `events` DROP COLUMN `participant_count`;"""
+
+
+MODELS_STATE = (
+    "eJztXW1T2zgQ/isZf2pnuBsIUDi+JSFQrpB0INx1Sjsex1aCp35JbbmU6fHfT/JLLNmWY9"
+    "E4L85+SyRtIj8rraRnd+Vfiu0ayPL/7FnB+MK1LPcJeb5y1vqlOJqNyIfiBnstRZvN0mpa"
+    "gLWxFUropKk64dqOfexpOia1E83yESkykK975gybrkNKncCyaKGrk4amM02LAsf8HiAVu1"
+    "OEH5FHKh4elMAnn/aif1K+fiWfTMdAP5EfVYcdMI2oZvZNnZjIMriHIpWkKixX8fMsLLty"
+    "8EXYkHZkrOquFdhO2nj2jB9dZ97adDAtnSIHeRpG9OexF9Anox2PoUgeNnqItEnUW0bGQB"
+    "MtsDCDxFhNyxRVHQxH6l1/pKqKBHa661DcSVcjlU5pF/5oHxydHJ0evjs6JU3Cbs5LTl6i"
+    "v06BiQRDeAYj5SWs17AWtQjhTkHVPUSRUDWcB/ec1GDTRsUI85IZpI1Y9M/kQxb3BOUy4J"
+    "OCFPl0IK4CevKAxtCxnmOVl+A8urrp3406Nx/p39m+/90K8euM+rSmHZY+Z0rfvHtLy10y"
+    "x6IpOP+R1r9Xo/ct+rX1eTjoh/C6Pp564T+m7UafFdonLcCu6rhPqmYwozMpTVAjLVOtBz"
+    "PjlVrnJUHrm6L1BCNG7XHvGQPqE7gsRFWR03rXdS2kOQJjyglmlD4mknXpeV5Sg6JLFNsd"
+    "Dq85nXavRrzWBvc33f7tm4NQmaSRiRFrb1PMY9xeMdN4ySXMtNgwbMpE296Jlbenyeal+v"
+    "6EkVi8SdkGs7mUfQqzQpHdYiGiXXMqBJURahKof7Xbh4cn7f3Dd6fHRycnx6f7c3TzVWUw"
+    "d68uKdLcNImgp5vuybfCHWKyb+fVcOF6yJw6H9BzqIor0m/N0VEB9PFZ5N6PzxVbpoOXZJ"
+    "Alpakl9bSn+TGFHXvk4SPjTct7nbte57yv5OzFEjCl57smY8oYyWJM6bAda/q3J80zVG78"
+    "0hq37WZK5m3zVXbbzpZojjYNwaFPQfvMwS44b1c4Z9dwvM4dp/ktGxlIOPBLztY1L2Bwyo"
+    "ZTdrPOW3DK3kWtwykbTtlwyl7rKTv8klNy71HzSvYpiVBGvwSo18yp9W5VbO2naiFnih/J"
+    "14Pj/RIN/9O57b3vkAl0vJ9R2yCuakd12dmU9iyH9Aj9FOwIM2KvwnqLZk//04ibOAmkb2"
+    "46n95yk+d6OLhMmjMq6F0PuxnkLXfqqoFnyQxwVqYJmPMDvH18XGGAk1bCAR7W8TDHxyEJ"
+    "kFOJ5ZiQKhgr5HRo/kDKanCuYkfaYjPSzlmRxJlMUAycgnVZeLLMC66OzNuvC+wl06PJsX"
+    "D8LE2S5kRfhe6mGY2VMaWsFmZkc2MayMHSSshKgg6WxFbPgV0hZb1heqjKrmbHIEexkk60"
+    "BvfX14rA7AC8C8nrrJ0V4CvmsPNracGepRuLXny4RZYm2HyL4sG2jDUSQc+NUfQD0ea/BV"
+    "R//htNRCg6ErvYnJh6CMRvojXI/lQzJvRLnT6kcIT1XNtGyeqZ8SXxDfbKfErhiCf9Z9rW"
+    "61yK/jCyaoyDgrR7YP2gbJXY8xR1W9L5xAmB/wn8T7vmiQD/0y5qHfxP4H/ays3VFk6sAv"
+    "+T6+BCZkHsE2FEVkccN8ghwu40K+4NWZEmRYFCaG3jyMpwqC6BSWscXbGX4dLYOb04uhYi"
+    "lpcTsbye6NpwMH/UPGzq5kyLH76YHuFb7S3mSGaJQC08yUM6ocMhmE9yZcdxEpObIU1ST3"
+    "Ml+mTGQiC3UBaJApUCVMquHaqBStlFrQOVAlQKUCnrolLKIvD6TmDntujrj8abulQ5crpV"
+    "LodXg8uzVij7xSGjvX9LsOufn7WIVhEBNDYR0nG/lcJ+S6J+c+F6wLQA0wJMCzAtwLTsFt"
+    "MiDj6pEnWy+lTmaIDSXVxEnTB5yGyVkDCpfZ0DggQIkmYdlYEg2UWtA0ECBAkQJOsiSLCJ"
+    "Lak857lAI+JMIMt5Q+ZNHUE9pk3OI7JpzpxQE1BfQZ4zcyCSXCp4yQZuypq0ViCHPIJZdC"
+    "3GAiUzcrAb2GQNW66uFS9UZfdC6KK8LbCXxfbye+BiTYIYmreHCwpyqfFppJX0BRCFsgBx"
+    "7g6IOAlOFt6cHECbgxbuc4YLS5rvFYVriKvd5LDoGmK4ImP9V2Sw6e8Z2yJ78QObdd+QIS"
+    "3amy0DrlwUfhMxiwgRuDRjrZdm8JgVxC3kQBWHL+RUWXMUAxMDYvoqdQnSj5VyPNiuyu1K"
+    "CyQhgAECGHbNlQ0BDLuodQhggACGrdxUbeHEyttTG/k+2cXJeCwYkQYGMdTisWC2knLGK5"
+    "ECyyVhuVZPC2+YgVo2K7yOpKOGQwo5R5vCrkNyzHKSY9b44sQNsxW1OCxWnhq3paAuzoxb"
+    "TxZXZB8KyNC54RCToMG8SZ3kp5DY3Iy1ahPIzJW8uAIoz90hv4Dy3EWtA+W5mcQBUJ67QH"
+    "lOTM/H0i+o5KUaSHxWSt4qyd3Kp25Z2itw5oQA5gowI1szpXK05gLwntUqGYgzzfefXK9g"
+    "HRZDzMo0cBDX4iQxEI14swtpDjHSvFTzMmgO9qvdIVZ2iVhuSBNAjCLWUwxzKtFEiCshLH"
+    "FL28xzJ6aF1DAbVspuZAWbh3YttmNsunmYxdnhcfMmgLvyrPD4QsSCuFox3pwQoC6PuueK"
+    "rplYfA1nIrvCSzh9HCQvd5VAX7kb3Z/3B6OzViz/xeld33fVzvnN1eCsFbpLNMM2nS9OXB"
+    "R+U9Zm8nNexSoZENFLQuNLSl8fmL4TLwlNaGs9cQT+Hl4NcnvxB22AaOFIgrwj6bwjOvOW"
+    "9prenUg/SuzVSl9uvI3TcY0ZWlszsOqMRuggz9QflYJwhLhmryweQUvbrCUgQSoSEfKplL"
+    "MqwQU/yD5S8u4aRgRIzmpEBZ1UEgjHzRuIbi28pvDVn3/fDQeCyBjhqz8NU8et/1qW6W9j"
+    "bG0JuBSMcoYiS0bs8V5Y+gNdufPv8hezl/8BpMJcqg=="
+)
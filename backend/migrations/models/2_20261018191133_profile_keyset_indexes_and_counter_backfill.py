@@ -0,0 +1,67 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `club_followers` ADD INDEX `idx_club_follow_user_id_aa96ec` (`user_id`, `created_at`);
+        ALTER TABLE `event_participants` ADD INDEX `idx_event_parti_user_id_a12c6d` (`user_id`, `created_at`);
+        UPDATE `events` e SET
+            `participant_count` = (SELECT COUNT(*) FROM `event_participants` p WHERE p.`event_id` = e.`event_id` AND p.`status` = 'going'),
+            `comment_count` = (SELECT COUNT(*) FROM `event_comments` c WHERE c.`event_id` = e.`event_id`);
+        UPDATE `clubs` c SET
+            `follower_count` = (SELECT COUNT(*) FROM `club_followers` f WHERE f.`club_id` = c.`club_id`);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `event_participants` DROP INDEX `idx_event_parti_user_id_a12c6d`;
+        ALTER TABLE `club_followers` DROP INDEX `idx_club_follow_user_id_aa96ec`;"""
+
+
+MODELS_STATE = (
+    "eJztXetz2jgQ/1cYf2pncjcJSZpcvgEhKdcEOgm56/QxHoEF8dQPastNM7387yf5gSW/sA"
+    "jmYfYbSLtg/1Zar37alX8rpq1hw/2zY3ijK9sw7CfsuMpF47diIRPTD9kCBw0FzWZxN2sg"
+    "aGT4GmMqqk4E2ZFLHDQmtHeCDBfTJg27Y0efEd22aKvlGQZrtMdUULemcZNn6T88rBJ7is"
+    "kjdmjHly+K59JPB8E/Kd++0U+6peFf2A26/QvQNYV2BLLsCxN3MCJYUxEJlGbf1YmODU24"
+    "30DUb1fJ88xv61nkyhdk1zhSx7bhmVYsPHsmj7Y1l9Ytwlqn2MIO+z/aRhyP3TS7pxClCI"
+    "fg/mKR4EY4HQ1PkGcQDqSRGrcpqtofDNX77lBVFQlYx7bFTEIvNbD2lF3CH82jk7OT8+N3"
+    "J+dUxL/MecvZS/DXMTCBog9Pf6i8+P2IoEDCt0QMKod8CtxL2kN0E2cjLGomkNZC1T+jD0"
+    "ncI5SLgI8aYuTjMboO6OkNagPLeA5NXoDzsHfbvR+2bj+yvzNd94fh49cadllP0299TrS+"
+    "efeWtdt0+gWzc/4jjX97w/cN9rXxedDv+vDaLpk6/j/GcsPPCrsm5BFbtewnFWnc6IxaI9"
+    "SoZGx1b6YtaXVRE6y+LVaPMOLMHl4950BdCpeBmSlSVm/btoGRleNMBcWE0UdUsyo7z1sq"
+    "MHSBYduDwY1g03ZvKFqt/3Db7t69OfKNSYV0gnl/G2Me4rbETBM1VzDTQsewLRNtdydW2p"
+    "9GcU35+ITTWByk7ILbXEmcwj2h4uAw4aj0aS6onFKdQP2r2Tw+PmseHr87Pz05Ozs9P5yj"
+    "m+4qgrndu2ZIC9MkgJ4F3ZPvmRFiFNKLZriyHaxPrQ/42TdFj143ssY4A/pwmfLghkuOHb"
+    "PBSzTIotbYkzroab5M4ccevfnAebP2Tuu+07rsKil/sQJM2dKvzphyTjIbUzZsR2j8/Qk5"
+    "miqMX9ZjN+1Ey1w23WU2zWQLstDUB4fdBbtmAfacpXiJJXgFK+/USlsM2ehAIp5bsLau+A"
+    "EGq2xYZddrvQWr7H20OqyyYZUNq+yNrrL9Lykjdx6RUxCnREoJ+1KglplTmw1VTPRLNbA1"
+    "JY/069HpYYGF/2nddd636AQ6PUyYrR92NYO+5GyKryyF9BD/yokIE2pLYb1Ds6f7aShMnA"
+    "jSN7etT2+FyXMz6F9H4pwJOjeDdgJ5w57aqucYMgOc16kD5uIAb56elhjgVCp3gPt9Iszh"
+    "ckgC5FhjNS6kDMYKXR3qP7GyHpzL+JFmvhtpprxItM9MUfSsjOdy7soyrbg+Mu+wKrBXTI"
+    "9Gy8LRszRJmlJdCt1tcxprY0p5K8xocKNr2CLSRkhqgg1WxFbPgV0jZb1ldijLribHoECx"
+    "0oto9B9ubpQctwPwLiSvk342B998Djv9LM2IWdqh6tWHO2ygnOA7L1Vsx1ijPOiFMYp/Yi"
+    "b+KqC689+oI0LBktgm+kQf+0C8Eq1+8qfqMaFfqtxD8kdYxzZNHD09E3tJosBB0Z6SP+Lp"
+    "9XOy1W4uBX+YTt1cJqszvGzJzSdBCfafYP9p33YiYP9pH60O+0+w/7STwdUOTqyM/SfbIp"
+    "nMQv6eCKeyPuK4RhsifKRZMjbkVeqUBQqptbUjK/2hugImrXZ0xUGCS+Pn9OLsWshYXk3G"
+    "8maya/3B/BE5RB/rMxTefDY9IkodLOZIZpFCJTzJl3hC+0MwXf/Kj+MoJzdBmsQ7za9lVm"
+    "Y8OnLP0CxVYFmAZdm39TawLPtodWBZgGUBlmVTLEtRcl7X8sxU9L75RL2pzYwjZ1vletDr"
+    "X180fN2vFh3t3TuKXffyokGtiimgoYuQTgkulRFckBCcyuQDEgZIGCBhgIQBEma/SJj8vJ"
+    "QyCSnrr3IOBiiL4gLChCtR5rtyCZPKn3NAkABBUq+lMhAk+2h1IEiAIAGCZFMECdGJIVUC"
+    "PVeoRQoKFEBvybypIt9HN+l6RLYCWlCqA+prKIHmFkSSjwpRs4ZBWZ2eFdiit6BnnZixwM"
+    "icHkQD22xhwx6j7AdV0ZER47ySLvCX2f7yh2cTJEEMzeXh7IJU1XychCV9NkSmLkCcOh4i"
+    "rI+ThTelB9CmoIWjnuEsk/rvisIJxeUOeVh0QjGcnrH50zP4yviEb5E9E4IvyK/JkM6LzV"
+    "YBVypBv46YBYQInKex0fM0RMwy8hZSoOanL6RMWXEWA5cDorsq2xJkH0vVePCXKheVZmhC"
+    "AgMkMOzbVjYkMOyj1SGBARIYdjKo2sGJlfanJnZdGsXJ7FhwKjVMYqhkx4ILJeWcV6QFnk"
+    "vCc62fFt4yB7VqVngTRUc1hxRqjraFXYfimNUUx2zwnYpb5isq2bBYe2ncjoK6uDJuM1Vc"
+    "gX/IIEPnjiOfBPXmIlWSn7nE5nY8q7aBzFzLOy2A8twf8gsoz320OlCe20kcAOW5D5TnRH"
+    "dcIv3uSlGrhsRnqeKtgtqtdOmWgZbAWVACmEvAjE2kS9VozRXgFaxlKhBnyHWfbCfjOZwP"
+    "Ma9Tw0FcySaJhlnGm5lJc+QjLWrVr4Lm6LDcGWJFh4ilhjQFRMtiPfNhjjXqCHEphCVOaZ"
+    "s59kQ3sOpXw0r5jaRi/dCuxHeMdDsNc351eCheB3DXXhUeHoiYkVebj7egBKjLo+7YecdM"
+    "LD6GM9Jd4yGcLvGi975KoK/cDx8uu/3hRSPU/2p1bh7aauvytte/aPjbJUgzdeurFTb535"
+    "SNufzUrmKZCojg/aHhIaXLJ6bvxftDI9p6HG0Evg6vGm17iQttgGjhSIK6I+m6IzbzVvYG"
+    "370oP4r81Vrfe7yL03GDFVo7M7CqzEZoYUcfPyoZ6Qhhz0FRPgKKZTaSkCCViQj1VMpFme"
+    "SCnzSOlDy7hlMBkrMcUcEmlQTCoXgN0a2E18x9K+jf94N+TmZM7ltBNX1MGv81DN3dxdza"
+    "AnAZGMUMRZKMOBB3YdkPtOXWv6t/mL38D8f/bkg="
+)
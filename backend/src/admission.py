@@ -0,0 +1,81 @@
+from src.cache import run_script
+from src.models import EventParticipation, ParticipationStatus
+
+# Etkinlik başına tek bir hash: "_ready" alanı DB'den yüklendiğini, "u:<id>" alanları koltukları tutar.
+# Tek anahtar olduğu için TTL dolduğunda koltuklar ve hazır bayrağı birlikte düşer.
+SEATS_TTL = 86400
+
+ADMITTED = 1
+FULL = 0
+DUPLICATE = -1
+COLD = -2
+
+_ADMIT_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], '_ready') == 0 then return -2 end
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 1 then return -1 end
+local quota = tonumber(ARGV[2])
+if quota > 0 and (redis.call('HLEN', KEYS[1]) - 1) >= quota then return 0 end
+redis.call('HSET', KEYS[1], ARGV[1], 1)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+_REBUILD_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], '_ready') == 1 then return 0 end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], '_ready', 1)
+for i = 2, #ARGV do redis.call('HSET', KEYS[1], ARGV[i], 1) end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+def seats_key(event_id: int) -> str:
+    return f"event:{event_id}:seats"
+
+
+def _member(user_id) -> str:
+    return f"u:{user_id}"
+
+
+async def rebuild_seats(redis, event_id: int):
+    """Soğuk başlangıçta koltuk sayacını EventParticipation tablosundan yeniden kurar."""
+    user_ids = await EventParticipation.filter(
+        event_id=event_id, status=ParticipationStatus.GOING
+    ).values_list("user_id", flat=True)
+    await run_script(redis, _REBUILD_SCRIPT, [seats_key(event_id)], SEATS_TTL, *[_member(u) for u in user_ids])
+
+
+async def try_admit(redis, event_id: int, user_id: int, quota: int) -> int:
+    """Kota ve tekrar kontrolünü tek adımda yapar; ADMITTED / FULL / DUPLICATE döner."""
+    key = seats_key(event_id)
+    result = await run_script(redis, _ADMIT_SCRIPT, [key], _member(user_id), quota, SEATS_TTL)
+    if result == COLD:
+        await rebuild_seats(redis, event_id)
+        result = await run_script(redis, _ADMIT_SCRIPT, [key], _member(user_id), quota, SEATS_TTL)
+    return int(result)
+
+
+async def release_seat(redis, event_id: int, user_id: int):
+    await redis.hdel(seats_key(event_id), _member(user_id))
+
+
+async def has_seat(redis, event_id: int, user_id: int) -> bool:
+    """Katılım kontrolü; hash soğuksa etkinlik başına bir kez DB'den kurulur."""
+    key = seats_key(event_id)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.hexists(key, "_ready")
+        pipe.hexists(key, _member(user_id))
+        ready, member = await pipe.execute()
+    if not ready:
+        await rebuild_seats(redis, event_id)
+        member = await redis.hexists(key, _member(user_id))
+    return bool(member)
+
+
+async def seat_count(redis, event_id: int):
+    """Yüklü değilse None döner."""
+    key = seats_key(event_id)
+    if not await redis.hexists(key, "_ready"):
+        return None
+    return await redis.hlen(key) - 1
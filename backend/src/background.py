@@ -0,0 +1,33 @@
+import asyncio
+from src.config import logger
+
+# Referans tutulmayan task'lar GC tarafından yarıda toplanabiliyor
+_tasks = set()
+
+
+def spawn(coro, name: str):
+    """İstek döngüsünden bağımsız çalışacak bir iş başlatır; hatalar loglanır, yutulmaz."""
+    task = asyncio.get_running_loop().create_task(coro, name=name)
+    _tasks.add(task)
+    task.add_done_callback(_on_done)
+    return task
+
+
+def _on_done(task):
+    _tasks.discard(task)
+    if task.cancelled():
+        logger.warning(f"Background task cancelled: {task.get_name()}")
+    elif task.exception():
+        logger.error(f"Background task failed: {task.get_name()}: {task.exception()!r}")
+
+
+async def drain(timeout: float = 10):
+    """Kapanışta devam eden işlerin bitmesini bekler, süre dolarsa iptal eder."""
+    if not _tasks:
+        return
+    pending = list(_tasks)
+    done, still_running = await asyncio.wait(pending, timeout=timeout)
+    for task in still_running:
+        task.cancel()
+    if still_running:
+        await asyncio.gather(*still_running, return_exceptions=True)
@@ -0,0 +1,33 @@
+import time
+from contextlib import contextmanager
+from src import metrics
+from src.config import logger
+
+
+class BootTimer:
+    """Süreç açılışını aşamalara bölüp ölçer; toplam ve aşama süreleri tek satırda loglanır"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.phases = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, label: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.phases.append((label, elapsed))
+            metrics.observe(f"boot_{label}_seconds", elapsed)
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self._started
+
+    def log(self):
+        total = self.total
+        metrics.observe("boot_seconds", total)
+        breakdown = ", ".join(f"{label}={elapsed * 1000:.1f}ms" for label, elapsed in self.phases)
+        logger.info(f"{self.name} ready in {total * 1000:.1f}ms ({breakdown})")
@@ -0,0 +1,258 @@
+import asyncio
+import hashlib
+import math
+import random
+import time
+import uuid
+from redis.exceptions import NoScriptError
+from src import background, db_router, metrics, serialization
+from src.serialization import RawJSON
+
+# Etkinlik listeleri, cursor sayfaları, toplamlar ve arama sonuçları bu isim alanında tutulur
+EVENTS_NAMESPACE = "events"
+
+
+def _generation_key(namespace: str) -> str:
+    return f"gen:{namespace}"
+
+
+def _initial_generation() -> int:
+    # Sayaç anahtarı kaybolursa (flush/eviction) eski nesil anahtarlarıyla çakışmasın diye zaman tabanlı başlatılır
+    return int(time.time() * 1000)
+
+
+async def get_generation(redis, namespace: str) -> int:
+    key = _generation_key(namespace)
+    value = await redis.get(key)
+    if value is None:
+        await redis.set(key, _initial_generation(), nx=True)
+        value = await redis.get(key)
+    return int(value)
+
+
+async def bump_generation(redis, *namespaces: str):
+    """İsim alanındaki tüm anahtarları tek INCR ile geçersiz kılar; eski anahtarlar TTL ile düşer"""
+    if not redis:
+        return
+    async with redis.pipeline(transaction=True) as pipe:
+        for namespace in namespaces:
+            key = _generation_key(namespace)
+            pipe.set(key, _initial_generation(), nx=True)
+            pipe.incr(key)
+        await pipe.execute()
+
+
+async def versioned_key(redis, namespace: str, suffix: str) -> str:
+    generation = await get_generation(redis, namespace)
+    return f"{namespace}:g{generation}:{suffix}"
+
+
+_script_shas = {}
+
+
+async def run_script(redis, script: str, keys: list, *args):
+    """Lua betiğini önce EVALSHA ile dener; sunucu betiği bilmiyorsa EVAL ile yükler"""
+    sha = _script_shas.get(script)
+    if sha is None:
+        sha = _script_shas[script] = hashlib.sha1(script.encode("utf-8")).hexdigest()
+    try:
+        return await redis.evalsha(sha, len(keys), *keys, *args)
+    except NoScriptError:
+        return await redis.eval(script, len(keys), *keys, *args)
+
+
+# --- Single-flight önbellek ---------------------------------------------------
+#
+# Değer tek anahtarda "<expires_at>|<delta>|<json>" olarak tutulur. expires_at mantıksal bitiş zamanı,
+# delta yüklemenin sürdüğü saniyedir (erken yenileme olasılığı buna göre ölçeklenir).
+# Fiziksel TTL, stale-while-revalidate için ttl + stale_ttl'dir.
+#
+# Geçersiz kılma invalidate() ile yapılır: anahtarı siler ve "<key>:ver" sürümünü artırır. Yükleme,
+# DB'yi okumadan önce sürümü okur ve değeri yalnızca sürüm değişmediyse yazar; yükleme sürerken
+# commit edip geçersiz kılan bir yazının ardından eski satırlar TTL boyunca önbellekte kalmaz.
+
+LOCK_TTL_MS = 10000
+LOCK_WAIT_SECONDS = 2.0
+LOCK_POLL_SECONDS = 0.025
+# Sürüm anahtarı yüklemelerden çok uzun yaşar; düşerse en kötü ihtimalle bir yazma atlanır
+VERSION_TTL = 86400
+
+# Kilit bırakma ve bozuk değer silme: anahtar hâlâ aynı değeri tutuyorsa siler
+_DELETE_IF_EQUAL_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end
+return 0
+"""
+
+_STORE_IF_VERSION_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then return 0 end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+# Aynı worker'daki eşzamanlı ıskalar tek yüklemeyi bekler; arka plan yenilemeleri ayrı izlenir
+_loading = {}
+_refreshing = {}
+
+
+def _lock_key(key: str) -> str:
+    return f"lock:{key}"
+
+
+def version_key(key: str) -> str:
+    return f"{key}:ver"
+
+
+async def invalidate(redis, *keys):
+    """Önbellek anahtarlarını siler; o sırada sürmekte olan yüklemeler sonuçlarını geri yazamaz"""
+    if not redis or not keys:
+        return
+    async with redis.pipeline(transaction=True) as pipe:
+        for key in keys:
+            pipe.incr(version_key(key))
+            pipe.expire(version_key(key), VERSION_TTL)
+            pipe.delete(key)
+        await pipe.execute()
+
+
+def _pack(body: bytes, ttl: int, delta: float) -> bytes:
+    return f"{time.time() + ttl:.3f}|{delta:.4f}|".encode("utf-8") + body
+
+
+def _unpack(raw):
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8")
+    expires_at, delta, body = raw.split("|", 2)
+    return float(expires_at), float(delta), body
+
+
+async def _get_unpacked(redis, key):
+    """Anahtar yoksa ya da değer çözülemiyorsa (eski biçim, bozuk veri) None; bozuk değer silinir"""
+    raw = await redis.get(key)
+    if raw is None:
+        return None
+    try:
+        return _unpack(raw)
+    except ValueError:
+        metrics.inc("cache_corrupt_values_total")
+        # Arada yazılmış geçerli bir değeri silmemek için yalnız okunan değer siliniyor
+        await run_script(redis, _DELETE_IF_EQUAL_SCRIPT, [key], raw)
+        return None
+
+
+def _should_refresh(expires_at: float, delta: float, beta: float) -> bool:
+    """XFetch: bitişe yaklaştıkça (ve yükleme pahalıysa) bir isteğin erkenden yenileme ihtimali artar"""
+    now = time.time()
+    if now >= expires_at:
+        return True
+    if beta <= 0 or delta <= 0:
+        return False
+    return now - delta * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+async def _store(redis, key, result, ttl, stale_ttl, delta):
+    await redis.set(key, _pack(serialization.dumps(result), ttl, delta), ex=ttl + stale_ttl)
+
+
+async def _load_and_store(redis, key, loader, ttl, stale_ttl):
+    version = await redis.get(version_key(key)) or ""
+    started = time.perf_counter()
+    # Paylaşılan anahtara yazılacak değer gecikmeli replikadan okunmamalı; eski satırlar TTL boyunca kalırdı
+    with db_router.primary_read():
+        result, status = await loader()
+    delta = time.perf_counter() - started
+    metrics.observe("cache_load_seconds", delta)
+    # Hata yanıtları önbelleğe alınmaz
+    if status == 200:
+        body = _pack(serialization.dumps(result), ttl, delta)
+        stored = await run_script(
+            redis, _STORE_IF_VERSION_SCRIPT, [key, version_key(key)], version, body, ttl + stale_ttl
+        )
+        if not stored:
+            metrics.inc("cache_stale_writes_skipped_total")
+    return result, status
+
+
+async def _acquire_lock(redis, key):
+    token = uuid.uuid4().hex
+    if await redis.set(_lock_key(key), token, nx=True, px=LOCK_TTL_MS):
+        return token
+    return None
+
+
+async def _release_lock(redis, key, token):
+    await run_script(redis, _DELETE_IF_EQUAL_SCRIPT, [_lock_key(key)], token)
+
+
+async def refresh(redis, key, loader, ttl, stale_ttl=0):
+    """Değeri kilit altında yeniden yükler; başka biri zaten yüklüyorsa None döner"""
+    token = await _acquire_lock(redis, key)
+    if token is None:
+        return None
+    try:
+        result = await _load_and_store(redis, key, loader, ttl, stale_ttl)
+        metrics.inc("cache_refreshes_total")
+        return result
+    finally:
+        await _release_lock(redis, key, token)
+
+
+async def expires_in(redis, key):
+    """Mantıksal bitişe kalan saniye (geçtiyse negatif); anahtar yoksa None"""
+    entry = await _get_unpacked(redis, key)
+    if entry is None:
+        return None
+    return entry[0] - time.time()
+
+
+async def _load_single_flight(redis, key, loader, ttl, stale_ttl):
+    token = await _acquire_lock(redis, key)
+    if token is not None:
+        try:
+            return await _load_and_store(redis, key, loader, ttl, stale_ttl)
+        finally:
+            await _release_lock(redis, key, token)
+
+    # Başka bir worker yüklüyor: kısa süre sonucunu bekle, gelmezse kendin yükle
+    metrics.inc("cache_lock_waits_total")
+    deadline = time.monotonic() + LOCK_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        await asyncio.sleep(LOCK_POLL_SECONDS)
+        entry = await _get_unpacked(redis, key)
+        if entry is not None:
+            return RawJSON(entry[2]), 200
+        if not await redis.exists(_lock_key(key)):
+            break
+    metrics.inc("cache_lock_timeouts_total")
+    return await _load_and_store(redis, key, loader, ttl, stale_ttl)
+
+
+async def get_or_load(redis, key: str, ttl: int, loader, stale_ttl: int = 0, beta: float = 1.0):
+    """
+    loader: argümansız, (sonuç, status) dönen coroutine fonksiyonu. İsabette RawJSON döner.
+    Iskalarda aynı worker'daki istekler tek bir yüklemeyi paylaşır, worker'lar arası Redis kilidiyle
+    tek yükleme yapılır. Süresi geçmiş (stale_ttl içindeki) değer hemen döner ve arka planda yenilenir.
+    """
+    if not redis:
+        return await loader()
+
+    entry = await _get_unpacked(redis, key)
+    if entry is not None:
+        expires_at, delta, body = entry
+        if key not in _refreshing and _should_refresh(expires_at, delta, beta):
+            metrics.inc("cache_stale_hits_total" if time.time() >= expires_at else "cache_early_refreshes_total")
+            task = background.spawn(refresh(redis, key, loader, ttl, stale_ttl), name=f"cache-refresh:{key}")
+            _refreshing[key] = task
+            task.add_done_callback(lambda _, k=key: _refreshing.pop(k, None))
+        metrics.inc("cache_hits_total")
+        return RawJSON(body), 200
+
+    metrics.inc("cache_misses_total")
+    task = _loading.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_load_single_flight(redis, key, loader, ttl, stale_ttl))
+        _loading[key] = task
+        task.add_done_callback(lambda _, k=key: _loading.pop(k, None))
+    else:
+        metrics.inc("cache_coalesced_total")
+    # Bekleyen isteklerden biri iptal edilirse ortak yükleme iptal olmasın
+    return await asyncio.shield(task)
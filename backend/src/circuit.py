@@ -0,0 +1,47 @@
+import time
+from src import metrics
+from src.config import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Üst servis art arda hata verince (veya zaman aşımına uğrayınca) devre açılır ve istekler
+    reset_timeout boyunca hiç gönderilmez. Süre dolunca tek bir deneme isteğine izin verilir.
+    Durum her worker sürecinde ayrı tutulur.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            return True
+        # Yarı açıkken deneme isteği sürerken diğerleri beklemeden reddedilir
+        return False
+
+    def record_success(self):
+        if self.state != CLOSED:
+            logger.info(f"Circuit '{self.name}' closed")
+        self.state = CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(f"Circuit '{self.name}' opened after {self.failures} failures")
+                metrics.inc(f"circuit_{self.name}_opened_total")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
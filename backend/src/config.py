@@ -1,6 +1,7 @@
 import os
 import logging
 import sys
+from tortoise.backends.base.config_generator import expand_db_url
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,12 +22,93 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 if not SECRET_KEY:
     raise ValueError("KRİTİK HATA: SECRET_KEY ayarlanmamış! Güvenlik için zorunludur.")
 
+HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", "2"))
+HASH_POOL_MAX_PENDING = int(os.getenv("HASH_POOL_MAX_PENDING", "64"))
+
+# Etkinlik listesi önbelleği nesil numarasıyla geçersiz kılındığı için uzun tutulabilir
+EVENTS_CACHE_TTL = int(os.getenv("EVENTS_CACHE_TTL", "1800"))
+# Süresi dolan liste bu kadar saniye daha sunulur, arka planda yenilenir
+EVENTS_STALE_TTL = int(os.getenv("EVENTS_STALE_TTL", "60"))
+# Profil özeti aktivite yazımlarında silinir; TTL yalnızca kaçan geçersiz kılmalara karşı üst sınır
+PROFILE_CACHE_TTL = int(os.getenv("PROFILE_CACHE_TTL", "300"))
+# Profilde her aktivite listesinden gösterilen kayıt; devamı sayfalı uçlardan gelir
+PROFILE_ACTIVITY_LIMIT = int(os.getenv("PROFILE_ACTIVITY_LIMIT", "10"))
+# Ad/avatar önbelleğinin süreç içi katmanı; diğer worker'lardaki kopyalar en geç bu sürede tazelenir
+MINI_PROFILE_LRU_SIZE = int(os.getenv("MINI_PROFILE_LRU_SIZE", "2048"))
+MINI_PROFILE_LRU_SECONDS = float(os.getenv("MINI_PROFILE_LRU_SECONDS", "30"))
+# Redis'teki kopya; geçersiz kılma kaçarsa bile en geç bu sürede düşer
+MINI_PROFILE_CACHE_TTL = int(os.getenv("MINI_PROFILE_CACHE_TTL", "3600"))
+
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "2"))
+
+REALTIME_QUEUE_SIZE = int(os.getenv("REALTIME_QUEUE_SIZE", "100"))
+REALTIME_HEARTBEAT_SECONDS = float(os.getenv("REALTIME_HEARTBEAT_SECONDS", "25"))
+
+# Worker başına havuz: toplam bağlantı = worker sayısı x DB_POOL_MAX_SIZE, MySQL max_connections'ın altında kalmalı
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+# MySQL wait_timeout dolmadan boştaki bağlantılar yenilenir
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "3600"))
+DB_POOL_ACQUIRE_TIMEOUT = float(os.getenv("DB_POOL_ACQUIRE_TIMEOUT", "10"))
+
+
+def _db_connection(url: str):
+    """MySQL için havuz ayarlı ve ölçümlü istemciyi kullanan bağlantı tanımı; diğerleri URL olarak kalır"""
+    if not url.startswith("mysql://"):
+        return url
+    config = expand_db_url(url)
+    config["engine"] = "src.db_pool"
+    config["credentials"].update(
+        minsize=DB_POOL_MIN_SIZE,
+        maxsize=DB_POOL_MAX_SIZE,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        acquire_timeout=DB_POOL_ACQUIRE_TIMEOUT,
+    )
+    return config
+
+
+# Şema normalde `python -m src.migrate` ile kurulur; 1 ise her açılışta generate_schemas çalışır (tek süreçli geliştirme)
+DB_GENERATE_SCHEMAS = os.getenv("DB_GENERATE_SCHEMAS", "0") == "1"
+
+# Virgülle ayrılmış replika adresleri; boşsa tüm sorgular birincile gider
+DB_REPLICA_URLS = [u.strip() for u in os.getenv("DB_REPLICA_URLS", "").split(",") if u.strip()]
+DB_REPLICA_NAMES = [f"replica_{i}" for i in range(len(DB_REPLICA_URLS))]
+# Yazan kullanıcı bu süre boyunca birincilden okur (replikasyon gecikmesinin üst sınırı)
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+# Dış HTTP çağrıları (Open-Meteo) için paylaşılan oturum
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "20"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "2"))
+HTTP_TOTAL_TIMEOUT = float(os.getenv("HTTP_TOTAL_TIMEOUT", "5"))
+
+GEOCODING_API_URL = os.getenv("GEOCODING_API_URL", "https://geocoding-api.open-meteo.com/v1/search")
+WEATHER_API_URL = os.getenv("WEATHER_API_URL", "https://api.open-meteo.com/v1/forecast")
+# Şehir koordinatları değişmediği için günlerce tutulur
+GEOCODE_CACHE_TTL = int(os.getenv("GEOCODE_CACHE_TTL", str(7 * 86400)))
+WEATHER_CIRCUIT_FAILURES = int(os.getenv("WEATHER_CIRCUIT_FAILURES", "5"))
+WEATHER_CIRCUIT_RESET_SECONDS = float(os.getenv("WEATHER_CIRCUIT_RESET_SECONDS", "30"))
+
+# En popüler N şehrin hava durumu, süresi dolmadan job worker tarafından yenilenir
+WEATHER_PREFETCH_TOP_N = int(os.getenv("WEATHER_PREFETCH_TOP_N", "10"))
+WEATHER_PREFETCH_INTERVAL = float(os.getenv("WEATHER_PREFETCH_INTERVAL", "60"))
+# Mantıksal bitişine bu kadar saniyeden az kalan değerler yenilenir (aralıktan büyük olmalı)
+WEATHER_PREFETCH_AHEAD = float(os.getenv("WEATHER_PREFETCH_AHEAD", "120"))
+# Popülerlik puanları bu aralıkla yarıya iner; eskiden popüler şehirler listeyi işgal etmez
+WEATHER_POPULARITY_HALF_LIFE = int(os.getenv("WEATHER_POPULARITY_HALF_LIFE", "3600"))
+
 TORTOISE_ORM = {
-    "connections": {"default": DB_URL},
+    "connections": {
+        "default": _db_connection(DB_URL),
+        **{name: _db_connection(url) for name, url in zip(DB_REPLICA_NAMES, DB_REPLICA_URLS)},
+    },
     "apps": {
         "models": {
             "models": ["src.models", "aerich.models"],
             "default_connection": "default",
         }
     },
-}
\ No newline at end of file
+}
+if DB_REPLICA_NAMES:
+    TORTOISE_ORM["routers"] = ["src.db_router.ReplicaRouter"]
\ No newline at end of file
@@ -0,0 +1,12 @@
+from tortoise.expressions import F
+
+
+async def adjust(model, field: str, delta: int, **filters):
+    """Sayaç kolonunu tek UPDATE ile değiştirir; çağıran transaction içindeyse ona dahil olur."""
+    if delta == 0:
+        return
+    query = model.filter(**filters)
+    if delta < 0:
+        # Sapma olsa bile sayaç negatife düşmesin
+        query = query.filter(**{f"{field}__gte": -delta})
+    await query.update(**{field: F(field) + delta})
@@ -1,12 +1,21 @@
-from tortoise import Tortoise
-from src.config import DB_URL
+from tortoise import Tortoise, connections
+from src.config import TORTOISE_ORM, DB_GENERATE_SCHEMAS
+from src.search import ensure_fulltext_index
 
 async def init_db():
-    await Tortoise.init(
-        db_url=DB_URL,
-        modules={'models': ['src.models']}
-    )
-    await Tortoise.generate_schemas(safe=True) 
+    """
+    Hızlı açılış: şema `python -m src.migrate` ile bir kez kurulduğu için burada sadece
+    bağlantı havuzları açılır. DB_GENERATE_SCHEMAS=1 eski davranışı (her açılışta şema kontrolü) geri getirir.
+    """
+    await Tortoise.init(config=TORTOISE_ORM)
+    if DB_GENERATE_SCHEMAS:
+        await Tortoise.generate_schemas(safe=True)
+        await ensure_fulltext_index()
+
+async def warm_pools():
+    """Havuzları ilk istekten önce açar; ilk istek bağlantı kurma maliyetini ödemez"""
+    for name in TORTOISE_ORM["connections"]:
+        await connections.get(name).execute_query("SELECT 1")
 
 async def close_db():
-    await Tortoise.close_connections()
\ No newline at end of file
+    await Tortoise.close_connections()
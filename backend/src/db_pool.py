@@ -0,0 +1,72 @@
+import asyncio
+import time
+from tortoise import Tortoise, connections
+from tortoise.backends.mysql.client import MySQLClient
+from tortoise.exceptions import DBConnectionError
+from src import metrics
+
+
+class InstrumentedPool:
+    """aiomysql havuzunu sarar; bağlantı bekleme süresini ölçer ve bekleyişi acquire_timeout ile sınırlar"""
+
+    def __init__(self, pool, acquire_timeout: float):
+        self._pool = pool
+        self.acquire_timeout = acquire_timeout
+        self.waiting = 0
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+    async def acquire(self):
+        self.waiting += 1
+        started = time.perf_counter()
+        try:
+            conn = await asyncio.wait_for(self._pool.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            metrics.inc("db_pool_acquire_timeouts_total")
+            raise DBConnectionError(f"Timed out after {self.acquire_timeout}s waiting for a database connection")
+        finally:
+            self.waiting -= 1
+        metrics.observe("db_pool_acquire_seconds", time.perf_counter() - started)
+        return conn
+
+    def release(self, conn):
+        return self._pool.release(conn)
+
+    def stats(self) -> dict:
+        in_use = len(self._pool._used)
+        return {
+            "size": self._pool.size,
+            "min_size": self._pool.minsize,
+            "max_size": self._pool.maxsize,
+            "in_use": in_use,
+            "idle": self._pool.freesize,
+            "waiting": self.waiting,
+        }
+
+
+class InstrumentedMySQLClient(MySQLClient):
+    def __init__(self, *args, acquire_timeout: float = 10.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.acquire_timeout = float(acquire_timeout)
+
+    async def create_connection(self, with_db: bool) -> None:
+        await super().create_connection(with_db)
+        if self._pool is not None and not isinstance(self._pool, InstrumentedPool):
+            self._pool = InstrumentedPool(self._pool, self.acquire_timeout)
+
+
+# Tortoise "engine" olarak bu modülü yükler
+client_class = InstrumentedMySQLClient
+
+
+def pool_stats() -> dict:
+    """Bu worker sürecindeki bağlantı havuzlarının anlık durumu; havuzsuz (SQLite) bağlantılar atlanır"""
+    stats = {}
+    if not Tortoise._inited:
+        return stats
+    for name in connections.db_config:
+        pool = getattr(connections.get(name), "_pool", None)
+        if isinstance(pool, InstrumentedPool):
+            stats[name] = pool.stats()
+    return stats
@@ -0,0 +1,66 @@
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from src.config import DB_REPLICA_NAMES, READ_YOUR_WRITES_SECONDS
+
+# İsteğin okuması gereken bağlantı; None ise Tortoise modelin varsayılan (birincil) bağlantısını kullanır
+_read_db = ContextVar("read_db", default=None)
+# Kullanıcı yakın zamanda yazdıysa istek boyunca tüm okumalar birincilde kalır
+_pinned = ContextVar("pinned_to_primary", default=False)
+
+_replicas = itertools.cycle(DB_REPLICA_NAMES) if DB_REPLICA_NAMES else None
+
+
+class ReplicaRouter:
+    """Tortoise router'ı: sadece replica_read kapsamındaki okumalar replikaya gider, yazmalar hep birincile"""
+
+    def db_for_read(self, model):
+        return _read_db.get()
+
+    def db_for_write(self, model):
+        return None
+
+
+def replica_read(func):
+    """Salt okunur servis metodlarını sıradaki replikaya yönlendirir"""
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        if _replicas is None or _pinned.get() or _read_db.get():
+            return await func(*args, **kwargs)
+        token = _read_db.set(next(_replicas))
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _read_db.reset(token)
+    return wrapper
+
+
+@contextmanager
+def primary_read():
+    """Kapsamdaki tüm okumaları birincile zorlar (içteki replica_read'ler dahil)"""
+    pinned, read_db = _pinned.set(True), _read_db.set(None)
+    try:
+        yield
+    finally:
+        _read_db.reset(read_db)
+        _pinned.reset(pinned)
+
+
+def _pin_key(user_id) -> str:
+    return f"db:pin:{user_id}"
+
+
+async def pin_to_primary(redis, user_id):
+    """Yazan kullanıcının sonraki okumaları, replikasyon gecikmesi süresince birincilden yapılır"""
+    if _replicas is None or not redis or user_id is None:
+        return
+    await redis.set(_pin_key(user_id), 1, ex=READ_YOUR_WRITES_SECONDS)
+
+
+async def use_primary_if_pinned(redis, user_id) -> bool:
+    if _replicas is None or not redis or user_id is None:
+        return False
+    pinned = bool(await redis.exists(_pin_key(user_id)))
+    _pinned.set(pinned)
+    return pinned
@@ -0,0 +1,71 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from src import metrics, security
+from src.config import HASH_POOL_WORKERS, HASH_POOL_MAX_PENDING, logger
+
+_executor = None
+_max_pending = HASH_POOL_MAX_PENDING
+_pending = 0
+
+
+class HashPoolSaturated(Exception):
+    """Bekleyen hash işi sayısı sınırı aştığında fırlatılır (503'e çevrilir)."""
+
+
+def init_hash_pool(workers: int = None, max_pending: int = None):
+    global _executor, _max_pending
+    if _executor is not None:
+        return
+    workers = workers or HASH_POOL_WORKERS
+    _max_pending = max_pending if max_pending is not None else HASH_POOL_MAX_PENDING
+    # Event loop'u olan bir süreçten fork almak yerine temiz süreçler başlatıyoruz
+    _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    logger.info(f"Hash pool started with {workers} processes (max pending: {_max_pending})")
+
+
+async def shutdown_hash_pool():
+    global _executor, _max_pending
+    if _executor is not None:
+        executor, _executor = _executor, None
+        # Süreçlerin kapanmasını beklemek bloklayıcı; event loop'u tutmamak için thread havuzunda beklenir
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: executor.shutdown(wait=True, cancel_futures=True)
+        )
+    _max_pending = HASH_POOL_MAX_PENDING
+
+
+def _timed_call(fn, *args):
+    started = time.time()
+    result = fn(*args)
+    return started, time.time() - started, result
+
+
+async def _submit(fn, *args):
+    global _pending
+    if _pending >= _max_pending:
+        metrics.inc("hash_pool_rejected_total")
+        raise HashPoolSaturated()
+
+    _pending += 1
+    submitted = time.time()
+    try:
+        loop = asyncio.get_running_loop()
+        # Havuz kurulmamışsa (seed, testler) varsayılan thread havuzuna düşeriz
+        started, elapsed, result = await loop.run_in_executor(_executor, _timed_call, fn, *args)
+    finally:
+        _pending -= 1
+
+    metrics.observe("hash_pool_wait_seconds", max(started - submitted, 0.0))
+    metrics.observe("hash_duration_seconds", elapsed)
+    metrics.inc("hash_jobs_total")
+    return result
+
+
+async def hash_password(password: str) -> str:
+    return await _submit(security.hash_password, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _submit(security.verify_password, plain_password, hashed_password)
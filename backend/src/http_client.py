@@ -0,0 +1,32 @@
+import aiohttp
+from src.config import HTTP_POOL_LIMIT, HTTP_CONNECT_TIMEOUT, HTTP_TOTAL_TIMEOUT, logger
+
+# Worker ömrü boyunca paylaşılan oturum: DNS ve TLS bağlantıları istekler arasında yeniden kullanılır
+_session = None
+
+USER_AGENT = "CampusHub-Project/1.0 (Student Project; contact@example.com)"
+
+
+def init_http_session():
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=HTTP_POOL_LIMIT, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=HTTP_TOTAL_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            headers={"User-Agent": USER_AGENT},
+            trust_env=True,
+        )
+        logger.info(f"Shared HTTP session opened (limit={HTTP_POOL_LIMIT})")
+    return _session
+
+
+def get_session():
+    """Sunucu açılışında oluşturulan oturum; job worker gibi süreçlerde ilk kullanımda açılır"""
+    return _session if _session is not None and not _session.closed else init_http_session()
+
+
+async def close_http_session():
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import os
+import random
+import socket
+import time
+from redis.exceptions import ResponseError
+from src import metrics
+from src.config import logger, JOB_MAX_ATTEMPTS, JOB_RETRY_BASE_SECONDS
+
+STREAM = "jobs:stream"
+GROUP = "jobs:workers"
+DELAYED = "jobs:delayed"
+DEAD = "jobs:dead"
+STATS = "jobs:metrics"
+# Çalışan işin sahipliği claim_idle_ms'in üçte birinde bir tazelenir (çok kısa eşiklerde bu alt sınırla)
+HEARTBEAT_MIN_SECONDS = 0.05
+
+# Zamanı gelen yeniden denemeleri tek adımda sıralı kümeden stream'e taşır
+_PROMOTE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, payload in ipairs(due) do
+    redis.call('ZREM', KEYS[1], payload)
+    local job = cjson.decode(payload)
+    redis.call('XADD', KEYS[2], '*', 'name', job.name, 'kwargs', job.kwargs,
+               'attempt', job.attempt, 'enqueued_at', job.enqueued_at)
+end
+return #due
+"""
+
+_handlers = {}
+
+
+class RetryFrom(Exception):
+    """İş yarıda kaldı; yeniden deneme, kwargs bu değerlerle güncellenerek kaldığı yerden sürer"""
+
+    def __init__(self, cause: Exception, **resume):
+        super().__init__(repr(cause))
+        self.resume = resume
+
+
+def job(name: str):
+    """Bir coroutine'i kuyruk işi olarak kaydeder; imza: async def fn(redis, **kwargs)"""
+    def decorator(fn):
+        _handlers[name] = fn
+        return fn
+    return decorator
+
+
+async def enqueue(redis, name: str, **kwargs) -> str:
+    return await redis.xadd(STREAM, {
+        "name": name,
+        "kwargs": json.dumps(kwargs),
+        "attempt": 0,
+        "enqueued_at": time.time(),
+    })
+
+
+async def ensure_group(redis):
+    try:
+        await redis.xgroup_create(STREAM, GROUP, id="0", mkstream=True)
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+async def queue_stats(redis):
+    """Kuyruk derinliği ve iş metrikleri; tüm worker süreçlerinin toplamı Redis'ten okunur"""
+    await ensure_group(redis)
+    groups = await redis.xinfo_groups(STREAM)
+    group = next((g for g in groups if g["name"] == GROUP), {})
+    counters = await redis.hgetall(STATS)
+    latency_count = float(counters.get("latency_count", 0))
+    return {
+        "waiting": group.get("lag") or 0,
+        "in_progress": group.get("pending", 0),
+        "delayed": await redis.zcard(DELAYED),
+        "dead": await redis.xlen(DEAD),
+        "avg_queue_latency_seconds": round(float(counters.get("latency_sum", 0)) / latency_count, 4) if latency_count else 0.0,
+        "counters": {k: int(float(v)) for k, v in counters.items() if not k.startswith("latency_")},
+    }
+
+
+class Worker:
+    def __init__(self, redis, concurrency: int = 4, block_ms: int = 5000, claim_idle_ms: int = 60000,
+                 max_attempts: int = JOB_MAX_ATTEMPTS, retry_base: float = JOB_RETRY_BASE_SECONDS):
+        self.redis = redis
+        self.concurrency = concurrency
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.name = f"{socket.gethostname()}-{os.getpid()}"
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        self._stopping.set()
+
+    async def run(self):
+        await ensure_group(self.redis)
+        logger.info(f"Job worker {self.name} started with concurrency {self.concurrency}")
+        consumers = [self._consume_loop(f"{self.name}-{i}") for i in range(self.concurrency)]
+        await asyncio.gather(self._maintenance_loop(), *consumers)
+        logger.info(f"Job worker {self.name} stopped")
+
+    async def _consume_loop(self, consumer: str):
+        while not self._stopping.is_set():
+            try:
+                await self.run_once(consumer, block_ms=self.block_ms)
+            except Exception as e:
+                logger.error(f"Job consumer {consumer} error: {str(e)}")
+                await asyncio.sleep(1)
+
+    async def _maintenance_loop(self):
+        while not self._stopping.is_set():
+            try:
+                await self.promote_delayed()
+                await self.reclaim_stale()
+            except Exception as e:
+                logger.error(f"Job maintenance error: {str(e)}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=1)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_once(self, consumer: str = None, block_ms: int = None) -> int:
+        """Stream'den en fazla bir iş alıp işler; işlenen iş sayısını döner"""
+        consumer = consumer or f"{self.name}-0"
+        response = await self.redis.xreadgroup(GROUP, consumer, {STREAM: ">"}, count=1, block=block_ms)
+        processed = 0
+        for _, messages in response or []:
+            for message_id, fields in messages:
+                await self._process(message_id, fields, consumer)
+                processed += 1
+        return processed
+
+    async def promote_delayed(self, batch: int = 100) -> int:
+        return await self.redis.eval(_PROMOTE_SCRIPT, 2, DELAYED, STREAM, time.time(), batch)
+
+    async def reclaim_stale(self):
+        """Çöken bir worker'ın onaylamadan bıraktığı işleri yeniden işler"""
+        consumer = f"{self.name}-reclaim"
+        _, messages, *_ = await self.redis.xautoclaim(
+            STREAM, GROUP, consumer, min_idle_time=self.claim_idle_ms, start_id="0-0", count=10
+        )
+        for message_id, fields in messages:
+            if fields:
+                await self._process(message_id, fields, consumer)
+
+    async def _heartbeat(self, message_id, consumer: str):
+        """Uzun süren iş sürerken mesajın boşta kalma süresini sıfırlar; başka worker onu yeniden almaz"""
+        while True:
+            await asyncio.sleep(max(self.claim_idle_ms / 3000, HEARTBEAT_MIN_SECONDS))
+            try:
+                await self.redis.xclaim(STREAM, GROUP, consumer, 0, [message_id], justid=True)
+            except Exception as e:
+                logger.warning(f"Job heartbeat for {message_id} failed: {str(e)}")
+
+    async def _process(self, message_id, fields, consumer: str):
+        name = fields.get("name")
+        attempt = int(fields.get("attempt", 0)) + 1
+        enqueued_at = float(fields.get("enqueued_at", time.time()))
+        started = time.time()
+        metrics.observe("job_queue_latency_seconds", started - enqueued_at)
+        await self.redis.hincrbyfloat(STATS, "latency_sum", started - enqueued_at)
+        await self.redis.hincrby(STATS, "latency_count", 1)
+
+        try:
+            handler = _handlers.get(name)
+            if handler is None:
+                raise LookupError(f"Unknown job: {name}")
+            heartbeat = asyncio.ensure_future(self._heartbeat(message_id, consumer))
+            try:
+                await handler(self.redis, **json.loads(fields.get("kwargs") or "{}"))
+            finally:
+                heartbeat.cancel()
+            metrics.observe("job_run_seconds", time.time() - started)
+            await self.redis.hincrby(STATS, f"{name}:succeeded", 1)
+        except Exception as e:
+            try:
+                await self._handle_failure(name, fields, attempt, e)
+            except Exception as record_error:
+                # Yeniden deneme / dead-letter yazılamadı: mesaj onaylanmaz, XAUTOCLAIM sonra tekrar alır
+                logger.error(f"Job {name} failure could not be recorded, leaving {message_id} pending: {record_error!r}")
+                return
+        await self.redis.xack(STREAM, GROUP, message_id)
+        await self.redis.xdel(STREAM, message_id)
+
+    async def _handle_failure(self, name, fields, attempt: int, error: Exception):
+        if isinstance(error, RetryFrom):
+            kwargs = {**json.loads(fields.get("kwargs") or "{}"), **error.resume}
+            fields = {**fields, "kwargs": json.dumps(kwargs)}
+        if attempt >= self.max_attempts or name not in _handlers:
+            logger.error(f"Job {name} moved to dead-letter after {attempt} attempts: {error!r}")
+            await self.redis.xadd(DEAD, {**fields, "attempt": attempt, "error": repr(error), "failed_at": time.time()})
+            await self.redis.hincrby(STATS, f"{name}:dead", 1)
+            return
+
+        delay = self.retry_base * (2 ** (attempt - 1))
+        delay += random.uniform(0, delay * 0.1)
+        logger.warning(f"Job {name} failed (attempt {attempt}), retrying in {delay:.1f}s: {error!r}")
+        payload = json.dumps({
+            "name": name,
+            "kwargs": fields.get("kwargs") or "{}",
+            "attempt": attempt,
+            "enqueued_at": fields.get("enqueued_at"),
+            "nonce": random.random(),
+        })
+        await self.redis.zadd(DELAYED, {payload: time.time() + delay})
+        await self.redis.hincrby(STATS, f"{name}:retried", 1)
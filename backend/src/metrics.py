@@ -0,0 +1,65 @@
+import threading
+from collections import defaultdict
+
+# Süre ölçümleri için kova sınırları (saniye)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_lock = threading.Lock()
+_counters = defaultdict(float)
+_histograms = {}
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "buckets": {str(b): c for b, c in zip(self.buckets, self.bucket_counts)},
+        }
+
+
+def inc(name: str, value: float = 1):
+    with _lock:
+        _counters[name] += value
+
+
+def observe(name: str, value: float):
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.observe(value)
+
+
+def snapshot():
+    """Bu worker sürecine ait tüm sayaç ve histogramların anlık kopyası"""
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "histograms": {name: h.to_dict() for name, h in _histograms.items()},
+        }
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
@@ -4,6 +4,15 @@ from src.security import decode_access_token
 from src.models import UserRole
 from src.config import logger
 
+def authenticate_token(token):
+    """Geçerli token için payload'ı (sub int'e çevrilmiş) döner, aksi halde None"""
+    payload = decode_access_token(token) if token else None
+    if not payload:
+        return None
+    if "sub" in payload and isinstance(payload["sub"], str) and payload["sub"].isdigit():
+        payload["sub"] = int(payload["sub"])
+    return payload
+
 def authorized():
     def decorator(f):
         @wraps(f)
@@ -14,15 +23,12 @@ def authorized():
                 logger.warning(f"Unauthorized access attempt to {request.path}: Missing token")
                 return json({"error": "Missing token"}, 401)
             
-            payload = decode_access_token(token)
+            payload = authenticate_token(token)
             
             if not payload:
                 logger.warning(f"Unauthorized access attempt to {request.path}: Invalid/Expired token")
                 return json({"error": "Invalid or expired token"}, 401)
             
-            if "sub" in payload and isinstance(payload["sub"], str) and payload["sub"].isdigit():
-                payload["sub"] = int(payload["sub"])
-            
             request.ctx.user = payload
             return await f(request, *args, **kwargs)
         return decorated_function
@@ -0,0 +1,49 @@
+"""
+Şemayı tek seferde günceller; sunucu ve job worker'ları başlatılmadan önce bir kez çalıştırılır.
+
+    cd backend && python -m src.migrate
+
+MySQL'de migrations/ altındaki aerich migration'larını uygular. Migration'lar MySQL DDL'i olduğu
+için SQLite (geliştirme/test) veritabanları doğrudan modellerden oluşturulur.
+"""
+import argparse
+import asyncio
+import os
+from aerich import Command
+from tortoise import Tortoise, connections
+from src.config import TORTOISE_ORM, logger
+from src.search import ensure_fulltext_index
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+
+async def migrate(fake: bool = False) -> list:
+    """Uygulanan migration dosyalarının listesini döner"""
+    await Tortoise.init(config=TORTOISE_ORM)
+    try:
+        if connections.get("default").capabilities.dialect != "mysql":
+            await Tortoise.generate_schemas(safe=True)
+            logger.info("Schema generated from models (non-MySQL database)")
+            return []
+
+        command = Command(tortoise_config=TORTOISE_ORM, app="models", location=MIGRATIONS_DIR)
+        await command.init()
+        applied = await command.upgrade(run_in_transaction=True, fake=fake)
+        await ensure_fulltext_index()
+        if applied:
+            logger.info(f"Applied migrations: {', '.join(applied)}")
+        else:
+            logger.info("Database schema is up to date")
+        return applied
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply CampusHub database migrations")
+    parser.add_argument(
+        "--fake", action="store_true",
+        help="Mark pending migrations as applied without running them (schema already built by generate_schemas)",
+    )
+    args = parser.parse_args()
+    asyncio.run(migrate(args.fake))
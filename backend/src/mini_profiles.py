@@ -0,0 +1,128 @@
+"""
+Yorum, üye listesi gibi yerlerde başka kullanıcıları göstermek için gereken küçük profil:
+ad, avatar, bölüm, rol. Parola, biyografi gibi alanlar hiç okunmaz.
+
+Önce süreç içi LRU, sonra Redis (kullanıcı başına TTL'li anahtar, tek MGET), eksikler tek sorguda
+birincil DB'den gelir. Yükleme sürerken geçersiz kılınan profil Redis'e geri yazılmaz.
+"""
+import time
+from collections import OrderedDict
+from src import cache, metrics, serialization
+from src.config import MINI_PROFILE_LRU_SIZE, MINI_PROFILE_LRU_SECONDS, MINI_PROFILE_CACHE_TTL
+from src.db_router import primary_read
+from src.models import Users, UserRole
+
+# KEYS: (profil, sürüm) çiftleri; ARGV: ttl, sonra her çift için (okunan sürüm, profil).
+# Sürüm DB okumasından önce okunur; invalidate arada artırdıysa eski profil yazılmaz.
+_STORE_SCRIPT = """
+local stored = 0
+for i = 1, #KEYS, 2 do
+  local n = i + 1
+  if (redis.call('GET', KEYS[i + 1]) or '') == ARGV[n] then
+    redis.call('SET', KEYS[i], ARGV[n + 1], 'EX', ARGV[1])
+    stored = stored + 1
+  end
+end
+return stored
+"""
+
+# user_id -> (geçerlilik sonu, profil)
+_lru = OrderedDict()
+
+
+def unknown(user_id: int) -> dict:
+    return {"id": user_id, "name": "Unknown User", "avatar": None, "department": None, "role": None, "is_active": False}
+
+
+def cache_key(user_id) -> str:
+    return f"user:mini:{user_id}"
+
+
+def _version_key(user_id) -> str:
+    return f"user:mini:{user_id}:ver"
+
+
+def _from_row(row) -> dict:
+    return {
+        "id": row["user_id"],
+        "name": f"{row['first_name']} {row['last_name']}",
+        "avatar": row["profile_image"],
+        "department": row["department"],
+        "role": row["role"].value if isinstance(row["role"], UserRole) else row["role"],
+        "is_active": not row["is_deleted"],
+    }
+
+
+def _remember(user_id: int, profile: dict):
+    _lru[user_id] = (time.monotonic() + MINI_PROFILE_LRU_SECONDS, profile)
+    _lru.move_to_end(user_id)
+    while len(_lru) > MINI_PROFILE_LRU_SIZE:
+        _lru.popitem(last=False)
+
+
+def _rows_query(user_ids):
+    return Users.filter(user_id__in=user_ids).values(
+        "user_id", "first_name", "last_name", "profile_image", "department", "role", "is_deleted"
+    )
+
+
+async def get_many(redis, user_ids, cache_locally: bool = True) -> dict:
+    """
+    user_id -> mini profil. Bulunamayan (silinmiş) kullanıcılar sonuçta yer almaz.
+    Toplu dökümlerde cache_locally=False verilir; sıcak girdiler LRU'dan itilmez.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    found, now = {}, time.monotonic()
+    for uid in user_ids:
+        entry = _lru.get(uid)
+        if entry and entry[0] > now:
+            _lru.move_to_end(uid)
+            found[uid] = entry[1]
+    local_hits = set(found)
+
+    missing = [uid for uid in user_ids if uid not in found]
+    if redis and missing:
+        cached = await redis.mget([cache_key(uid) for uid in missing])
+        for uid, raw in zip(missing, cached):
+            if raw is not None:
+                found[uid] = serialization.loads(raw)
+        missing = [uid for uid in missing if uid not in found]
+
+    if missing:
+        metrics.inc("mini_profile_db_queries_total")
+        versions = await redis.mget([_version_key(uid) for uid in missing]) if redis else []
+        # Sonuç paylaşılan önbelleğe yazılacağı için gecikmeli replikadan okunmaz
+        with primary_read():
+            rows = await _rows_query(missing)
+        loaded = {row["user_id"]: _from_row(row) for row in rows}
+        if redis and loaded:
+            keys, args = [], [MINI_PROFILE_CACHE_TTL]
+            for uid, version in zip(missing, versions):
+                if uid in loaded:
+                    keys += [cache_key(uid), _version_key(uid)]
+                    args += [version or "", serialization.dumps(loaded[uid])]
+            await cache.run_script(redis, _STORE_SCRIPT, keys, *args)
+        found.update(loaded)
+
+    if cache_locally:
+        for uid in user_ids:
+            if uid in found and uid not in local_hits:
+                _remember(uid, found[uid])
+    return found
+
+
+async def invalidate(redis, *user_ids):
+    """Profil, rol veya yasak değişince çağrılır"""
+    for uid in user_ids:
+        _lru.pop(uid, None)
+    if redis and user_ids:
+        async with redis.pipeline(transaction=True) as pipe:
+            for uid in user_ids:
+                pipe.incr(_version_key(uid))
+                pipe.expire(_version_key(uid), MINI_PROFILE_CACHE_TTL)
+                pipe.delete(cache_key(uid))
+            await pipe.execute()
+
+
+def clear_local():
+    _lru.clear()
@@ -46,6 +46,7 @@ class Clubs(BaseModel):
     description = fields.TextField(null=True)
     logo_url = fields.CharField(max_length=255, null=True)
     status = fields.CharField(max_length=20, default="active")
+    follower_count = fields.IntField(default=0)
     
     # Kulüp Başkanı ve Oluşturan Kişi
     president = fields.ForeignKeyField('models.Users', related_name='led_clubs', on_delete=fields.SET_NULL, null=True)
@@ -53,6 +54,7 @@ class Clubs(BaseModel):
 
     class Meta:
         table = "clubs"
+        indexes = (("is_deleted", "status"),)
 
 class ClubFollowers(BaseModel):
     id = fields.IntField(pk=True)
@@ -62,6 +64,7 @@ class ClubFollowers(BaseModel):
     class Meta:
         table = "club_followers"
         unique_together = ("user", "club")
+        indexes = (("club_id",), ("user_id", "created_at"))
 
 class Events(BaseModel):
     event_id = fields.IntField(pk=True)
@@ -73,11 +76,14 @@ class Events(BaseModel):
     end_time = fields.DatetimeField(null=True)
     location = fields.CharField(max_length=255, null=True)
     quota = fields.IntField(default=0)
+    participant_count = fields.IntField(default=0)
+    comment_count = fields.IntField(default=0)
     
     created_by = fields.ForeignKeyField('models.Users', related_name='created_events', on_delete=fields.SET_NULL, null=True)
 
     class Meta:
         table = "events"
+        indexes = (("is_deleted", "event_date"), ("club_id", "event_date"))
 
 class EventParticipation(BaseModel):
     participation_id = fields.IntField(pk=True)
@@ -88,6 +94,7 @@ class EventParticipation(BaseModel):
     class Meta:
         table = "event_participants"
         unique_together = ("event", "user")
+        indexes = (("event_id", "status"), ("user_id", "status", "created_at"), ("user_id", "created_at"))
 
 class EventComments(BaseModel):
     comment_id = fields.IntField(pk=True)
@@ -97,6 +104,7 @@ class EventComments(BaseModel):
 
     class Meta:
         table = "event_comments"
+        indexes = (("event_id", "created_at"), ("user_id", "created_at"))
 
 class Notifications(BaseModel):
     notification_id = fields.IntField(pk=True)
@@ -107,4 +115,5 @@ class Notifications(BaseModel):
     is_read = fields.BooleanField(default=False)
 
     class Meta:
-        table = "notifications"
\ No newline at end of file
+        table = "notifications"
+        indexes = (("user_id", "is_read", "created_at"),)
\ No newline at end of file
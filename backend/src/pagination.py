@@ -0,0 +1,42 @@
+import base64
+import json
+from datetime import datetime
+from tortoise.expressions import Q
+
+
+def encode_cursor(*values) -> str:
+    """Keyset değerlerini istemciye opak bir dize olarak verir; datetime değerleri ISO biçiminde saklanır"""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *types):
+    """types sırasıyla her değere uygulanır (ör. datetime, int); geçersiz cursor için ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if len(values) != len(types):
+            raise ValueError
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for t, v in zip(types, values)
+        )
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+
+def newest_first(query, cursor: str = None, pk: str = "id", field: str = "created_at"):
+    """(field, pk) azalan keyset sırası; cursor önceki sayfanın son satırıdır. Geçersiz cursor için ValueError"""
+    if cursor:
+        value, last_id = decode_cursor(cursor, datetime, int)
+        query = query.filter(Q(**{f"{field}__lt": value}) | Q(**{field: value, f"{pk}__lt": last_id}))
+    return query.order_by(f"-{field}", f"-{pk}")
+
+
+def split_page(rows: list, limit: int, pk: str = "id", field: str = "created_at"):
+    """limit + 1 satır çekilmiş sonuçtan (sayfa, sonraki cursor) döner"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1][field], rows[-1][pk])
@@ -0,0 +1,82 @@
+import asyncio
+from src import cache, metrics
+from src.config import (
+    logger, WEATHER_PREFETCH_TOP_N, WEATHER_PREFETCH_INTERVAL, WEATHER_PREFETCH_AHEAD,
+    WEATHER_POPULARITY_HALF_LIFE,
+)
+from src.services.weather_service import WeatherService, POPULAR_KEY
+
+LOCK_KEY = "weather:prefetch:lock"
+DECAY_KEY = "weather:popular:decayed"
+
+
+class WeatherPrefetcher:
+    """
+    En çok istenen şehirlerin hava durumunu, önbellekteki değerin süresi dolmadan yeniler.
+    Job worker içinde çalışır; birden fazla worker varsa her turu yalnızca biri yapar.
+    """
+
+    def __init__(self, redis, top_n: int = WEATHER_PREFETCH_TOP_N, interval: float = WEATHER_PREFETCH_INTERVAL,
+                 ahead: float = WEATHER_PREFETCH_AHEAD, half_life: int = WEATHER_POPULARITY_HALF_LIFE):
+        self.redis = redis
+        self.top_n = top_n
+        self.interval = interval
+        self.ahead = ahead
+        self.half_life = half_life
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        self._stopping.set()
+
+    async def run(self):
+        logger.info(f"Weather prefetcher started (top {self.top_n}, every {self.interval}s)")
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Weather prefetch error: {str(e)}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_once(self):
+        """Tur sonucunu döner; tur başka bir worker'da çalıştıysa None"""
+        if not await self.redis.set(LOCK_KEY, 1, nx=True, px=max(int(self.interval * 900), 1)):
+            return None
+        await self._decay()
+
+        cities = await WeatherService.popular_cities(self.redis, self.top_n)
+        outcomes = await asyncio.gather(*[self._prefetch(city_key) for city_key in cities])
+        summary = {outcome: outcomes.count(outcome) for outcome in ("refreshed", "fresh", "busy", "failed", "skipped")}
+        metrics.inc("weather_prefetch_refreshed_total", summary["refreshed"])
+        metrics.inc("weather_prefetch_failed_total", summary["failed"])
+
+        upstream = await WeatherService.upstream_stats(self.redis)
+        logger.info(
+            f"Weather prefetch: {summary['refreshed']} refreshed, {summary['fresh']} still fresh, "
+            f"{summary['failed']} failed, {summary['skipped']} skipped of top {len(cities)}; "
+            f"upstream {upstream['calls_per_minute']} calls/min over {upstream['window_minutes']}m"
+        )
+        return summary
+
+    async def _prefetch(self, city_key: str) -> str:
+        remaining = await cache.expires_in(self.redis, WeatherService.cache_key(city_key))
+        if remaining is not None and remaining > self.ahead:
+            return "fresh"
+        # Popülerlik listesinde katlanmış anahtar var; geocode'a gerçek şehir adı gerekir.
+        # Kullanıcı isteği geocode'u önbelleğe almadıysa (ya da şehir bulunamadıysa) tahmin yapılmaz
+        place = await WeatherService.cached_place(self.redis, city_key)
+        if place is None:
+            return "skipped"
+        result = await WeatherService.refresh_city(self.redis, city_key, place)
+        if result is None:
+            return "busy"  # aynı anda bir kullanıcı isteği yüklüyor
+        return "refreshed" if result[1] == 200 else "failed"
+
+    async def _decay(self):
+        # Yarılanma süresinde bir kez: puanlar yarıya iner, artık istenmeyen şehirler listeden düşer
+        if not await self.redis.set(DECAY_KEY, 1, nx=True, ex=self.half_life):
+            return
+        await self.redis.zunionstore(POPULAR_KEY, {POPULAR_KEY: 0.5})
+        await self.redis.zremrangebyscore(POPULAR_KEY, "-inf", 0.25)
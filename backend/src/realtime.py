@@ -0,0 +1,107 @@
+import asyncio
+import json
+from collections import defaultdict
+from src import metrics
+from src.config import logger, REALTIME_QUEUE_SIZE, REALTIME_HEARTBEAT_SECONDS
+
+# Tüm worker'lar bu kanala abone olur; mesaj hangi kullanıcılara gideceğini taşır
+CHANNEL = "notifications:push"
+
+
+async def publish(redis, user_ids, payload: dict):
+    """Bildirimi, kullanıcının bağlı olduğu worker hangisiyse ona ulaştırır"""
+    if not redis or not user_ids:
+        return
+    message = json.dumps({"user_ids": [int(u) for u in user_ids], "payload": payload})
+    await redis.publish(CHANNEL, message)
+
+
+class Connection:
+    def __init__(self, user_id: int, max_queue: int = REALTIME_QUEUE_SIZE):
+        self.user_id = user_id
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+    def offer(self, payload: dict):
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Yavaş istemci tüm worker'ı bekletmesin: mesaj düşer, istemciye yeniden senkron söylenir
+            self.overflowed = True
+            metrics.inc("realtime_dropped_messages_total")
+
+    async def next_message(self, timeout: float):
+        """Sıradaki mesaj; kuyruk taşmışsa önce bir kez "resync", boşta kalınırsa "ping" döner"""
+        if self.overflowed:
+            self.overflowed = False
+            return {"type": "resync"}
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return {"type": "ping"}
+
+
+class NotificationHub:
+    """Bu worker sürecindeki açık bağlantılar ve Redis pub/sub dinleyicisi"""
+
+    def __init__(self):
+        self._connections = defaultdict(set)
+
+    def register(self, conn: Connection):
+        self._connections[conn.user_id].add(conn)
+        metrics.inc("realtime_connections_opened_total")
+
+    def unregister(self, conn: Connection):
+        conns = self._connections.get(conn.user_id)
+        if conns is not None:
+            conns.discard(conn)
+            if not conns:
+                del self._connections[conn.user_id]
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(c) for c in self._connections.values())
+
+    def dispatch(self, raw: str) -> int:
+        data = json.loads(raw)
+        payload = {"type": "notification", **data.get("payload", {})}
+        delivered = 0
+        for user_id in data.get("user_ids", []):
+            for conn in self._connections.get(user_id, ()):
+                conn.offer(payload)
+                delivered += 1
+        return delivered
+
+    async def run(self, redis):
+        pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(CHANNEL)
+        logger.info("Realtime hub subscribed to notification channel")
+        try:
+            while True:
+                try:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self.dispatch(message["data"])
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Realtime hub error: {str(e)}")
+                    await asyncio.sleep(1)
+        finally:
+            await pubsub.unsubscribe(CHANNEL)
+            await pubsub.aclose()
+
+
+hub = NotificationHub()
+
+
+async def serve(ws, user_id: int, heartbeat: float = REALTIME_HEARTBEAT_SECONDS):
+    conn = Connection(user_id)
+    hub.register(conn)
+    try:
+        await ws.send(json.dumps({"type": "ready"}))
+        while True:
+            message = await conn.next_message(heartbeat)
+            await ws.send(json.dumps(message))
+    finally:
+        hub.unregister(conn)
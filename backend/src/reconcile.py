@@ -0,0 +1,67 @@
+import asyncio
+from tortoise import Tortoise
+from tortoise.functions import Count
+from src.config import TORTOISE_ORM, logger
+from src.models import Events, Clubs, EventParticipation, EventComments, ClubFollowers, ParticipationStatus
+
+BATCH_SIZE = 500
+
+
+async def _actual_counts(model, fk_field: str, ids, **filters):
+    rows = await model.filter(**{f"{fk_field}__in": ids}, **filters).annotate(
+        total=Count(fk_field)
+    ).group_by(fk_field).values(fk_field, "total")
+    return {r[fk_field]: r["total"] for r in rows}
+
+
+async def _reconcile_table(model, pk: str, counters: dict, batch_size: int):
+    """counters: {kolon: (kaynak model, fk alanı, ek filtreler)}"""
+    repaired = 0
+    last_id = 0
+    while True:
+        batch = await model.filter(**{f"{pk}__gt": last_id}).order_by(pk).limit(batch_size).values(pk, *counters.keys())
+        if not batch:
+            break
+        ids = [row[pk] for row in batch]
+        last_id = ids[-1]
+
+        actual = {}
+        for column, (source, fk_field, filters) in counters.items():
+            actual[column] = await _actual_counts(source, fk_field, ids, **filters)
+
+        for row in batch:
+            fixes = {}
+            for column in counters:
+                real = actual[column].get(row[pk], 0)
+                if row[column] != real:
+                    fixes[column] = real
+            if fixes:
+                await model.filter(**{pk: row[pk]}).update(**fixes)
+                logger.warning(f"Counter drift repaired on {model.__name__} {row[pk]}: {fixes}")
+                repaired += 1
+    return repaired
+
+
+async def reconcile_counters(batch_size: int = BATCH_SIZE):
+    """Denormalize sayaçları (katılımcı, yorum, takipçi) gerçek satır sayılarıyla eşitler."""
+    events_fixed = await _reconcile_table(Events, "event_id", {
+        "participant_count": (EventParticipation, "event_id", {"status": ParticipationStatus.GOING}),
+        "comment_count": (EventComments, "event_id", {}),
+    }, batch_size)
+    clubs_fixed = await _reconcile_table(Clubs, "club_id", {
+        "follower_count": (ClubFollowers, "club_id", {}),
+    }, batch_size)
+
+    logger.info(f"Counter reconciliation finished: {events_fixed} events, {clubs_fixed} clubs repaired")
+    return {"events": events_fixed, "clubs": clubs_fixed}
+
+
+async def main():
+    await Tortoise.init(config=TORTOISE_ORM)
+    try:
+        await reconcile_counters()
+    finally:
+        await Tortoise.close_connections()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -12,6 +12,20 @@ async def get_stats(request):
     result, status = await AdminService.get_dashboard_stats()
     return json(result, status=status)
 
+@admin_bp.get("/jobs")
+@authorized()
+@admin_only()
+async def get_job_stats(request):
+    result, status = await AdminService.get_job_stats(request.app.ctx.redis)
+    return json(result, status=status)
+
+@admin_bp.get("/metrics")
+@authorized()
+@admin_only()
+async def get_metrics(request):
+    result, status = await AdminService.get_metrics(request.app.ctx.redis)
+    return json(result, status=status)
+
 @admin_bp.get("/users")
 @authorized()
 @admin_only()
@@ -31,7 +45,7 @@ async def list_users(request):
 @authorized()
 @admin_only()
 async def ban_user(request, user_id):
-    result, status = await AdminService.toggle_user_ban(user_id)
+    result, status = await AdminService.toggle_user_ban(user_id, request.app.ctx.redis)
     return json(result, status=status)
 
 
@@ -39,7 +53,7 @@ async def ban_user(request, user_id):
 @authorized()
 @admin_only()
 async def delete_comment(request, comment_id):
-    result, status = await AdminService.delete_comment(comment_id)
+    result, status = await AdminService.delete_comment(comment_id, request.app.ctx.redis)
     return json(result, status=status)
 
 @admin_bp.patch("/users/<user_id:int>/role")
@@ -49,7 +63,7 @@ async def update_role(request, user_id):
     new_role = request.json.get("role")
     if not new_role:
         return json({"error": "Role is required"}, 400)
-    result, status = await AdminService.update_user_role(user_id, new_role)
+    result, status = await AdminService.update_user_role(user_id, new_role, request.app.ctx.redis)
     return json(result, status=status)
 
 @admin_bp.post("/announce")
@@ -57,12 +71,14 @@ async def update_role(request, user_id):
 @admin_only()
 async def make_announcement(request):
     message = request.json.get("message")
-    result, status = await AdminService.send_global_announcement(message)
+    redis = request.app.ctx.redis
+    result, status = await AdminService.send_global_announcement(message, redis)
     return json(result, status=status)
 
 @admin_bp.put("/clubs/<club_id:int>")
 @authorized()
 @admin_only()
 async def update_club(request, club_id):
-    result, status = await AdminService.update_club_details(club_id, request.json)
+    redis = request.app.ctx.redis
+    result, status = await AdminService.update_club_details(club_id, request.json, redis)
     return json(result, status=status)
\ No newline at end of file
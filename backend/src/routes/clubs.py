@@ -2,6 +2,8 @@ from sanic import Blueprint
 from sanic.response import json
 from src.services.club_service import ClubService
 from src.middleware import authorized
+from src import serialization
+from src.serialization import respond
 
 clubs_bp = Blueprint("clubs", url_prefix="/clubs")
 
@@ -30,25 +32,58 @@ async def delete_club(request, club_id):
 async def list_clubs(request):
     redis = request.app.ctx.redis
     result, status = await ClubService.get_all_clubs(redis)
-    return json(result, status=status)
+    return respond(result, status)
 
 @clubs_bp.get("/<club_id:int>")
 @authorized()
 async def get_club(request, club_id):
     user_ctx = getattr(request.ctx, "user", None)
-    result, status = await ClubService.get_club_details(club_id, user_ctx)
+    result, status = await ClubService.get_club_details(club_id, user_ctx, request.app.ctx.redis)
+    return respond(result, status)
+
+def _page_args(request, default_limit: int):
+    try:
+        limit = max(1, min(int(request.args.get("limit", default_limit)), 100))
+    except ValueError:
+        limit = default_limit
+    return request.args.get("cursor"), limit
+
+@clubs_bp.get("/<club_id:int>/events")
+@authorized()
+async def get_club_events(request, club_id):
+    cursor, limit = _page_args(request, 20)
+    result, status = await ClubService.get_club_events(club_id, cursor, limit)
     return json(result, status=status)
 
+@clubs_bp.get("/<club_id:int>/members")
+@authorized()
+async def get_club_members(request, club_id):
+    cursor, limit = _page_args(request, 50)
+    result, status = await ClubService.get_members(request.ctx.user, club_id, cursor, limit, request.app.ctx.redis)
+    return json(result, status=status)
+
+@clubs_bp.get("/<club_id:int>/members/stream")
+@authorized()
+async def stream_club_members(request, club_id):
+    """Tüm üyeler satır başına bir JSON nesnesi (NDJSON) olarak, parça parça gönderilir"""
+    denied = await ClubService.check_manager(request.ctx.user, club_id)
+    if denied:
+        return json(*denied)
+    response = await request.respond(content_type="application/x-ndjson")
+    async for chunk in ClubService.iter_members(club_id, redis=request.app.ctx.redis):
+        await response.send(b"".join(serialization.dumps(member) + b"\n" for member in chunk))
+    await response.eof()
+
 @clubs_bp.post("/<club_id:int>/follow")
 @authorized()
 async def follow_club(request, club_id):
-    result, status = await ClubService.follow_club(request.ctx.user, club_id)
+    result, status = await ClubService.follow_club(request.ctx.user, club_id, request.app.ctx.redis)
     return json(result, status=status)
 
 @clubs_bp.post("/<club_id:int>/leave")
 @authorized()
 async def leave_club(request, club_id):
-    result, status = await ClubService.leave_club(request.ctx.user, club_id)
+    result, status = await ClubService.leave_club(request.ctx.user, club_id, request.app.ctx.redis)
     return json(result, status=status)
 
 @clubs_bp.post("/<club_id:int>/remove-member")
@@ -57,7 +92,7 @@ async def remove_member(request, club_id):
     target_user_id = request.json.get("user_id")
     if not target_user_id:
         return json({"error": "User ID is required"}, 400)
-    result, status = await ClubService.remove_follower(request.ctx.user, club_id, target_user_id)
+    result, status = await ClubService.remove_follower(request.ctx.user, club_id, target_user_id, request.app.ctx.redis)
     return json(result, status=status)
 
 @clubs_bp.get("/my-clubs")
@@ -13,10 +13,15 @@ async def add_comment(request, event_id):
     if not content:
         return json({"error": "Content is required"}, 400)
         
-    result, status = await CommentService.add_comment(request.ctx.user, event_id, content)
+    result, status = await CommentService.add_comment(request.ctx.user, event_id, content, request.app.ctx.redis)
     return json(result, status=status)
 
 @comments_bp.get("/<event_id:int>/comments")
 async def get_comments(request, event_id):
-    result, status = await CommentService.get_comments(event_id)
+    try:
+        limit = max(1, min(int(request.args.get("limit", 20)), 50))
+    except ValueError:
+        limit = 20
+    cursor = request.args.get("cursor")
+    result, status = await CommentService.get_comments(event_id, cursor, limit, request.app.ctx.redis)
     return json(result, status=status)
\ No newline at end of file
@@ -2,26 +2,30 @@ from sanic import Blueprint
 from sanic.response import json
 from src.services.event_service import EventService
 from src.middleware import authorized
+from src.serialization import respond
 
 events_bp = Blueprint("events", url_prefix="/events")
 
 @events_bp.post("/")
 @authorized()
 async def create_event(request):
-    result, status = await EventService.create_event(request.ctx.user, request.json)
+    redis = request.app.ctx.redis
+    result, status = await EventService.create_event(request.ctx.user, request.json, redis)
     return json(result, status=status)
 
 @events_bp.delete("/<event_id:int>")
 @authorized()
 async def delete_event(request, event_id):
-    result, status = await EventService.delete_event(request.ctx.user, event_id)
+    redis = request.app.ctx.redis
+    result, status = await EventService.delete_event(request.ctx.user, event_id, redis)
     return json(result, status=status)
 
 @events_bp.get("/")
 async def list_events(request):
     try:
         page = int(request.args.get("page", 1))
-        limit = int(request.args.get("limit", 20))
+        # limit=0 boş sayfada cursor üretirken, büyük değerler de tüm tabloyu ve ayrı önbellek anahtarları yükler
+        limit = max(1, min(int(request.args.get("limit", 20)), 100))
     except ValueError:
         page = 1
         limit = 20
@@ -30,33 +34,44 @@ async def list_events(request):
     date_filter = request.args.get("date")
 
     redis = request.app.ctx.redis
+
+    # "?cursor=" boş gönderilse de keyset moduna geçilir; page/limit eski istemciler için korunuyor
+    if "cursor" in request.get_args(keep_blank_values=True):
+        with_total = request.args.get("with_total") in ("1", "true")
+        result, status = await EventService.get_events_by_cursor(
+            redis, request.args.get("cursor"), limit, search, date_filter, with_total
+        )
+        return respond(result, status)
     
     result, status = await EventService.get_events(redis, page, limit, search, date_filter)
-    return json(result, status=status)
+    return respond(result, status)
 
 @events_bp.get("/<event_id:int>")
 @authorized()
 async def get_event_detail(request, event_id):
     user_ctx = getattr(request.ctx, "user", None)
-    result, status = await EventService.get_event_detail(event_id, user_ctx)
-    return json(result, status=status)
+    result, status = await EventService.get_event_detail(event_id, user_ctx, request.app.ctx.redis)
+    return respond(result, status)
 
 @events_bp.put("/<event_id:int>")
 @authorized()
 async def update_event(request, event_id):
-    result, status = await EventService.update_event(request.ctx.user, event_id, request.json)
+    redis = request.app.ctx.redis
+    result, status = await EventService.update_event(request.ctx.user, event_id, request.json, redis)
     return json(result, status=status)
 
 @events_bp.post("/<event_id:int>/join")
 @authorized()
 async def join_event(request, event_id):
-    result, status = await EventService.join_event(request.ctx.user, event_id)
+    redis = request.app.ctx.redis
+    result, status = await EventService.join_event(request.ctx.user, event_id, redis)
     return json(result, status=status)
 
 @events_bp.post("/<event_id:int>/leave")
 @authorized()
 async def leave_event(request, event_id):
-    result, status = await EventService.leave_event(request.ctx.user, event_id)
+    redis = request.app.ctx.redis
+    result, status = await EventService.leave_event(request.ctx.user, event_id, redis)
     return json(result, status=status)
 
 @events_bp.post("/<event_id:int>/remove-participant")
@@ -65,5 +80,6 @@ async def remove_participant(request, event_id):
     target_user_id = request.json.get("user_id")
     if not target_user_id:
         return json({"error": "User ID is required"}, 400)
-    result, status = await EventService.remove_participant(request.ctx.user, event_id, target_user_id)
+    redis = request.app.ctx.redis
+    result, status = await EventService.remove_participant(request.ctx.user, event_id, target_user_id, redis)
     return json(result, status=status)
\ No newline at end of file
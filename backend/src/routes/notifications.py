@@ -1,7 +1,9 @@
 from sanic import Blueprint
 from sanic.response import json
 from src.services.notification_service import NotificationService
-from src.middleware import authorized
+from src.middleware import authorized, authenticate_token
+from src import realtime
+from src.config import logger
 
 notif_bp = Blueprint("notifications", url_prefix="/notifications")
 
@@ -9,12 +11,47 @@ notif_bp = Blueprint("notifications", url_prefix="/notifications")
 @authorized()
 async def get_notifications(request):
     user_id = request.ctx.user["sub"]
-    result, status = await NotificationService.get_my_notifications(user_id)
+    try:
+        limit = max(1, min(int(request.args.get("limit", 20)), 100))
+    except ValueError:
+        limit = 20
+    cursor = request.args.get("cursor")
+    result, status = await NotificationService.get_my_notifications(user_id, cursor, limit)
+    return json(result, status=status)
+
+@notif_bp.websocket("/ws")
+async def notification_stream(request, ws):
+    # Tarayıcılar WebSocket'e başlık ekleyemediği için token sorgu parametresiyle de kabul edilir
+    payload = authenticate_token(request.token or request.args.get("token"))
+    if not payload:
+        logger.warning(f"Unauthorized websocket attempt to {request.path}")
+        await ws.close(code=4401, reason="Invalid or expired token")
+        return
+    await realtime.serve(ws, payload["sub"])
+
+@notif_bp.get("/unread-count")
+@authorized()
+async def get_unread_count(request):
+    user_id = request.ctx.user["sub"]
+    redis = request.app.ctx.redis
+    result, status = await NotificationService.get_unread_count(user_id, redis)
+    return json(result, status=status)
+
+@notif_bp.post("/read")
+@authorized()
+async def mark_many_read(request):
+    user_id = request.ctx.user["sub"]
+    data = request.json or {}
+    redis = request.app.ctx.redis
+    result, status = await NotificationService.mark_many_as_read(
+        user_id, data.get("ids"), data.get("before"), bool(data.get("all")), redis, since=data.get("since")
+    )
     return json(result, status=status)
 
 @notif_bp.post("/<notif_id:int>/read")
 @authorized()
 async def mark_read(request, notif_id):
     user_id = request.ctx.user["sub"]
-    result, status = await NotificationService.mark_as_read(notif_id, user_id)
+    redis = request.app.ctx.redis
+    result, status = await NotificationService.mark_as_read(notif_id, user_id, redis)
     return json(result, status=status)
\ No newline at end of file
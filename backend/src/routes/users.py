@@ -2,6 +2,7 @@ from sanic import Blueprint
 from sanic.response import json
 from src.services.user_service import UserService
 from src.middleware import authorized
+from src.serialization import respond
 
 users_bp = Blueprint("users", url_prefix="/users")
 
@@ -17,7 +18,35 @@ async def get_history(request):
 async def get_profile(request):
     """Get complete user profile with all activities"""
     user_id = request.ctx.user["sub"]
-    result, status = await UserService.get_user_profile(user_id)
+    result, status = await UserService.get_user_profile(user_id, request.app.ctx.redis)
+    return respond(result, status)
+
+def _page_args(request):
+    try:
+        limit = max(1, min(int(request.args.get("limit", 20)), 100))
+    except ValueError:
+        limit = 20
+    return request.args.get("cursor"), limit
+
+@users_bp.get("/profile/events")
+@authorized()
+async def get_profile_events(request):
+    cursor, limit = _page_args(request)
+    result, status = await UserService.get_participations(request.ctx.user["sub"], cursor, limit)
+    return json(result, status=status)
+
+@users_bp.get("/profile/clubs")
+@authorized()
+async def get_profile_clubs(request):
+    cursor, limit = _page_args(request)
+    result, status = await UserService.get_followed_clubs(request.ctx.user["sub"], cursor, limit)
+    return json(result, status=status)
+
+@users_bp.get("/profile/comments")
+@authorized()
+async def get_profile_comments(request):
+    cursor, limit = _page_args(request)
+    result, status = await UserService.get_comments(request.ctx.user["sub"], cursor, limit)
     return json(result, status=status)
 
 @users_bp.put("/profile")
@@ -25,5 +54,5 @@ async def get_profile(request):
 async def update_profile(request):
     """Update user profile"""
     user_id = request.ctx.user["sub"]
-    result, status = await UserService.update_profile(user_id, request.json)
+    result, status = await UserService.update_profile(user_id, request.json, request.app.ctx.redis)
     return json(result, status=status)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from sanic import Blueprint
-from sanic.response import json
 from src.services.weather_service import WeatherService
+from src.serialization import respond
 
 weather_bp = Blueprint("weather", url_prefix="/weather")
 
@@ -11,4 +11,7 @@ async def get_weather(request):
     redis = request.app.ctx.redis
     
     result, status = await WeatherService.get_current_weather(redis, city)
-    return json(result, status=status)
\ No newline at end of file
+    if status == 200:
+        # Önceden yükleyici en çok istenen şehirleri buradan seçer
+        await WeatherService.record_request(redis, city)
+    return respond(result, status)
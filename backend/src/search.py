@@ -0,0 +1,198 @@
+import asyncio
+import math
+import re
+from collections import defaultdict
+from tortoise import Tortoise
+from src.config import logger
+from src.models import Events
+
+FULLTEXT_INDEX_NAME = "ft_events_title_description"
+# Arama en fazla bu kadar sonuç döndürür; toplam ve sayfalama da bununla sınırlıdır (yanıtta "truncated")
+MAX_RESULTS = 1000
+TITLE_WEIGHT = 3
+
+_TOKEN_RE = re.compile(r"(\w+)(?:['’]\w+)?")  # "Ankara'da" -> "ankara"
+_ASCII_FOLD = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+
+
+def turkish_lower(text: str) -> str:
+    # str.lower() "I" harfini "i" yapar; Türkçede karşılığı "ı"
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+
+def tokenize(text: str, ascii_fold: bool = True, min_length: int = 2):
+    if not text:
+        return []
+    lowered = turkish_lower(text)
+    if ascii_fold:
+        lowered = lowered.translate(_ASCII_FOLD)
+    return [t for t in _TOKEN_RE.findall(lowered) if len(t) >= min_length]
+
+
+def normalize_query(query: str) -> str:
+    """Önbellek anahtarı için: aynı anlama gelen aramalar aynı metne iner"""
+    return " ".join(sorted(set(tokenize(query))))
+
+
+class InMemoryIndex:
+    """
+    SQLite (test/geliştirme) için süreç içi ters indeks; üretimde MySQL FULLTEXT kullanılır.
+    Her worker kendi kopyasını tutar; ilk aramada veritabanından kurulur. Başka bir worker'daki
+    yazma yalnızca "events" nesli üzerinden görülür: nesil değişince indeks baştan kurulur.
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(dict)  # token -> {event_id: ağırlıklı tf}
+        self._docs = {}  # event_id -> token kümesi
+        self._built = False
+        self._generation = None
+        self._lock = asyncio.Lock()
+
+    def _is_current(self, generation) -> bool:
+        return self._built and (generation is None or generation == self._generation)
+
+    async def _ensure_built(self, generation=None):
+        if self._is_current(generation):
+            return
+        async with self._lock:
+            if self._is_current(generation):
+                return
+            self.reset()
+            rows = await Events.filter(is_deleted=False).values_list("event_id", "title", "description")
+            for event_id, title, description in rows:
+                self._add(event_id, title, description)
+            self._built = True
+            self._generation = generation
+            logger.info(f"In-memory search index built with {len(rows)} events")
+
+    def _add(self, event_id: int, title: str, description: str):
+        weights = defaultdict(int)
+        for token in tokenize(title):
+            weights[token] += TITLE_WEIGHT
+        for token in tokenize(description):
+            weights[token] += 1
+        for token, weight in weights.items():
+            self._postings[token][event_id] = weight
+        self._docs[event_id] = set(weights)
+
+    def _remove(self, event_id: int):
+        for token in self._docs.pop(event_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(event_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    async def index_event(self, event):
+        if not self._built:
+            return  # İlk aramada zaten tümü yüklenecek
+        self._remove(event.event_id)
+        if not event.is_deleted:
+            self._add(event.event_id, event.title, event.description)
+
+    async def remove_event(self, event_id: int):
+        if self._built:
+            self._remove(event_id)
+
+    async def search(self, query: str, limit: int = MAX_RESULTS, generation=None):
+        await self._ensure_built(generation)
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        total_docs = max(len(self._docs), 1)
+        scores = None
+        for term in set(terms):
+            # Tam eşleşme tam puan, önek eşleşmesi ("hackathon" -> "hackathonu") yarım puan alır
+            matches = {}
+            for token, postings in self._postings.items():
+                if token == term or (len(term) >= 3 and token.startswith(term)):
+                    factor = 1.0 if token == term else 0.5
+                    for event_id, weight in postings.items():
+                        matches[event_id] = max(matches.get(event_id, 0), weight * factor)
+            if not matches:
+                return []
+            idf = math.log(1 + total_docs / len(matches))
+            term_scores = {event_id: weight * idf for event_id, weight in matches.items()}
+            if scores is None:
+                scores = term_scores
+            else:
+                # Tüm kelimeler geçmeli (MySQL tarafındaki "+kelime*" ile aynı davranış)
+                scores = {e: scores[e] + s for e, s in term_scores.items() if e in scores}
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [event_id for event_id, _ in ranked[:limit]]
+
+    def reset(self):
+        self._postings.clear()
+        self._docs.clear()
+        self._built = False
+        self._generation = None
+
+
+class MySQLFullTextIndex:
+    """FULLTEXT(title, description) üzerinde BOOLEAN MODE arama; indeksi MySQL kendisi günceller"""
+
+    async def index_event(self, event):
+        return None
+
+    async def remove_event(self, event_id: int):
+        return None
+
+    async def search(self, query: str, limit: int = MAX_RESULTS, generation=None):
+        # InnoDB varsayılan innodb_ft_min_token_size=3; daha kısa kelimeler eşleşmez
+        terms = tokenize(query, ascii_fold=False, min_length=3)
+        if not terms:
+            return []
+        against = " ".join(f"+{t}*" for t in terms)
+        conn = Tortoise.get_connection("default")
+        rows = await conn.execute_query_dict(
+            "SELECT event_id FROM events "
+            "WHERE MATCH(title, description) AGAINST (%s IN BOOLEAN MODE) AND is_deleted = 0 "
+            "ORDER BY MATCH(title, description) AGAINST (%s IN BOOLEAN MODE) DESC, event_id "
+            "LIMIT %s",
+            [against, against, limit],
+        )
+        return [r["event_id"] for r in rows]
+
+
+_memory_index = InMemoryIndex()
+_mysql_index = MySQLFullTextIndex()
+
+
+def _is_mysql() -> bool:
+    return Tortoise.get_connection("default").capabilities.dialect == "mysql"
+
+
+def get_index():
+    return _mysql_index if _is_mysql() else _memory_index
+
+
+async def ensure_fulltext_index():
+    """MySQL'de FULLTEXT indeksi yoksa oluşturur (generate_schemas bunu yapamıyor)"""
+    if not _is_mysql():
+        return
+    conn = Tortoise.get_connection("default")
+    rows = await conn.execute_query_dict(
+        "SELECT 1 FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'events' AND index_name = %s LIMIT 1",
+        [FULLTEXT_INDEX_NAME],
+    )
+    if not rows:
+        await conn.execute_script(
+            f"ALTER TABLE events ADD FULLTEXT INDEX {FULLTEXT_INDEX_NAME} (title, description)"
+        )
+        logger.info("FULLTEXT index created on events(title, description)")
+
+
+async def search_events(query: str, limit: int = MAX_RESULTS, generation=None):
+    """generation: "events" nesli; süreç içi indeks başka worker'ların yazmalarını bununla fark eder"""
+    return await get_index().search(query, limit, generation)
+
+
+async def index_event(event):
+    await get_index().index_event(event)
+
+
+async def remove_event(event_id: int):
+    await get_index().remove_event(event_id)
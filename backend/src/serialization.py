@@ -0,0 +1,49 @@
+from collections.abc import Mapping
+import orjson
+from sanic.response import HTTPResponse, json as json_response
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj) -> bytes:
+    # Bilinmeyen tipler (Decimal vb.) json.dumps(default=str) gibi metne çevrilir
+    return orjson.dumps(obj, default=str, option=_OPTIONS)
+
+
+def loads(data):
+    return orjson.loads(data)
+
+
+class RawJSON(Mapping):
+    """
+    Önbellekten gelen, zaten serileştirilmiş JSON gövdesi. Route bunu olduğu gibi gönderir;
+    servis içinde veya testlerde alan okunursa ilk erişimde bir kez parse edilir.
+    """
+
+    __slots__ = ("body", "_data")
+
+    def __init__(self, body):
+        self.body = body.encode("utf-8") if isinstance(body, str) else body
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = loads(self.body)
+        return self._data
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+
+def respond(result, status: int = 200) -> HTTPResponse:
+    """Servis sonucunu yanıta çevirir; RawJSON tekrar serileştirilmeden gövde olarak yazılır"""
+    if isinstance(result, RawJSON):
+        return HTTPResponse(result.body, status=status, content_type="application/json")
+    return json_response(result, status=status, dumps=dumps)
@@ -1,8 +1,12 @@
 from sanic import Sanic
 from sanic.response import json
 from sanic_ext import Extend
-from src.database import init_db, close_db
-from src.config import REDIS_URL, logger
+from src.database import init_db, warm_pools, close_db
+from src.boot import BootTimer
+from src.hashing import init_hash_pool, shutdown_hash_pool
+from src import background, db_router, http_client, realtime, serialization
+from src.config import REDIS_URL, DB_REPLICA_NAMES, logger
+from src.middleware import authenticate_token
 from src.routes.auth import auth_bp
 from src.routes.clubs import clubs_bp
 from src.routes.events import events_bp
@@ -14,7 +18,8 @@ from redis import asyncio as aioredis
 from sanic_limiter import Limiter, get_remote_address
 from src.routes.weather import weather_bp
 
-app = Sanic("CampusHubAPI")
+# Önbellek dışı yanıtlar da orjson ile serileştirilir
+app = Sanic("CampusHubAPI", dumps=serialization.dumps)
 app.config.CORS_ORIGINS = "*"
 
 limiter = Limiter(
@@ -38,17 +43,51 @@ Extend(app)
 @app.before_server_start
 async def setup_db(app, loop):
     logger.info("Server Starting... Connecting to DB and Redis.")
-    await init_db()
-    app.ctx.redis = aioredis.from_url(REDIS_URL, decode_responses=True)
-    logger.info("Connected to Database and Redis.")
+    timer = BootTimer("Server worker")
+    with timer.phase("db_init"):
+        await init_db()
+    with timer.phase("db_pool"):
+        await warm_pools()
+    with timer.phase("hash_pool"):
+        init_hash_pool()
+    with timer.phase("http"):
+        http_client.init_http_session()
+    with timer.phase("redis"):
+        app.ctx.redis = aioredis.from_url(REDIS_URL, decode_responses=True)
+    timer.log()
+
+@app.after_server_start
+async def start_realtime(app, loop):
+    app.add_task(realtime.hub.run(app.ctx.redis), name="realtime_hub")
+
+@app.before_server_stop
+async def stop_realtime(app, loop):
+    await app.cancel_task("realtime_hub", raise_exception=False)
 
 @app.after_server_stop
 async def stop_db(app, loop):
     logger.info("Server Stopping... Closing connections.")
+    await background.drain()
+    await http_client.close_http_session()
     await close_db()
+    await shutdown_hash_pool()
     await app.ctx.redis.close()
     logger.info("Connections closed.")
 
+@app.on_request
+async def route_reads(request):
+    # Replika yoksa token çözmeye gerek yok
+    if DB_REPLICA_NAMES and request.method in ("GET", "HEAD"):
+        payload = authenticate_token(request.token)
+        await db_router.use_primary_if_pinned(request.app.ctx.redis, payload and payload.get("sub"))
+
+@app.on_response
+async def remember_writes(request, response):
+    if DB_REPLICA_NAMES and request.method not in ("GET", "HEAD", "OPTIONS") and response.status < 400:
+        user = getattr(request.ctx, "user", None)
+        if user:
+            await db_router.pin_to_primary(request.app.ctx.redis, user.get("sub"))
+
 @app.get("/")
 async def health_check(request):
     return json({"status": "active", "message": "CampusHub Backend is running!"})
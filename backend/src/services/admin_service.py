@@ -1,8 +1,15 @@
-from src.models import Users, Clubs, Events, UserRole, EventComments, Notifications
+from src.models import Users, Clubs, Events, UserRole, EventComments
 from tortoise.exceptions import DoesNotExist
 from tortoise.expressions import Q 
 from tortoise.transactions import in_transaction 
 from src.config import logger
+from src import background, cache, counters, db_pool, jobs, metrics, mini_profiles
+from src.services.notification_service import NotificationService
+from src.services.user_service import UserService
+from src.services.event_service import EventService
+from src.services.club_service import ClubService
+from src.services.comment_service import CommentService
+from src.services.weather_service import WeatherService
 
 class AdminService:
 
@@ -27,6 +34,24 @@ class AdminService:
             logger.error(f"Stats Error: {str(e)}")
             return {"error": "Failed to fetch stats"}, 500
 
+    @staticmethod
+    async def get_job_stats(redis):
+        """Arka plan iş kuyruğunun derinliği, gecikmesi ve iş sayaçları"""
+        try:
+            return {"jobs": await jobs.queue_stats(redis)}, 200
+        except Exception as e:
+            logger.error(f"Job Stats Error: {str(e)}")
+            return {"error": "Failed to fetch job stats"}, 500
+
+    @staticmethod
+    async def get_metrics(redis=None):
+        """Bu worker sürecinin sayaç/histogramları ve DB havuzu göstergeleri (her worker kendi değerini döner)"""
+        result = {"db_pool": db_pool.pool_stats(), **metrics.snapshot()}
+        if redis:
+            # Open-Meteo çağrı hızı Redis'te tüm süreçler için ortak tutulur
+            result["weather_upstream"] = await WeatherService.upstream_stats(redis)
+        return result, 200
+
     @staticmethod
     async def get_all_users(page: int, limit: int, search: str = None):
         """Kullanıcıları listeleme ve arama"""
@@ -62,7 +87,7 @@ class AdminService:
         }, 200
 
     @staticmethod
-    async def toggle_user_ban(target_user_id: int):
+    async def toggle_user_ban(target_user_id: int, redis=None):
         """Kullanıcıyı yasakla / yasağını kaldır"""
         try:
             user = await Users.get(user_id=target_user_id)
@@ -71,6 +96,8 @@ class AdminService:
             
             user.is_deleted = not user.is_deleted
             await user.save()
+            await UserService.invalidate_summary(redis, target_user_id)
+            await mini_profiles.invalidate(redis, target_user_id)
             
             action = "Banned" if user.is_deleted else "Unbanned"
             logger.info(f"User {target_user_id} was {action} by admin.")
@@ -80,17 +107,24 @@ class AdminService:
             return {"error": "User not found"}, 404
 
     @staticmethod
-    async def delete_comment(comment_id: int):
+    async def delete_comment(comment_id: int, redis=None):
         """A. Yorum Denetimi: İstenmeyen yorumu sil"""
-        deleted_count = await EventComments.filter(comment_id=comment_id).delete()
-        if deleted_count == 0:
+        comment = await EventComments.get_or_none(comment_id=comment_id)
+        if not comment:
             return {"error": "Comment not found"}, 404
+
+        async with in_transaction():
+            deleted_count = await EventComments.filter(comment_id=comment_id).delete()
+            await counters.adjust(Events, "comment_count", -deleted_count, event_id=comment.event_id)
+        await CommentService.forget_cached(redis, comment.event_id)
+        await UserService.invalidate_summary(redis, comment.user_id)
+        await EventService.invalidate_detail(redis, comment.event_id)
         
         logger.info(f"Comment {comment_id} deleted by admin.")
         return {"message": "Comment deleted successfully"}, 200
 
     @staticmethod
-    async def update_user_role(user_id: int, new_role: str):
+    async def update_user_role(user_id: int, new_role: str, redis=None):
         """B. Rol Yönetimi: Kullanıcı yetkisini değiştir"""
         if new_role not in [r.value for r in UserRole]:
             return {"error": f"Invalid role. Valid options: {[r.value for r in UserRole]}"}, 400
@@ -100,6 +134,8 @@ class AdminService:
             old_role = user.role
             user.role = UserRole(new_role)
             await user.save()
+            await UserService.invalidate_summary(redis, user_id)
+            await mini_profiles.invalidate(redis, user_id)
             
             logger.info(f"Role Change: User {user_id} changed from {old_role} to {new_role} by admin.")
             return {"message": f"User role updated to {new_role}"}, 200
@@ -107,35 +143,32 @@ class AdminService:
             return {"error": "User not found"}, 404
 
     @staticmethod
-    async def send_global_announcement(message: str):
-        """C. Sistem Duyurusu: Herkese bildirim gönder"""
+    async def send_global_announcement(message: str, redis=None):
+        """C. Sistem Duyurusu: Herkese bildirim gönder (arka planda, parça parça)"""
         if not message:
             return {"error": "Message content is required"}, 400
 
         try:
-            users = await Users.filter(is_deleted=False).all()
-            
-            notif_objects = [
-                Notifications(user_id=u.user_id, message=f"📢 SİSTEM DUYURUSU: {message}") 
-                for u in users
-            ]
-            
-            await Notifications.bulk_create(notif_objects)
-            
-            logger.info(f"Global Announcement Sent to {len(users)} users: {message}")
-            return {"message": f"Announcement sent to {len(users)} users"}, 200
+            if redis:
+                await jobs.enqueue(redis, "send_announcement", message=message)
+            else:
+                background.spawn(NotificationService.send_announcement(message), name="global_announcement")
+
+            logger.info(f"Global Announcement Queued: {message}")
+            return {"message": "Announcement is being delivered to all users"}, 202
         except Exception as e:
             logger.error(f"Announcement Error: {str(e)}")
             return {"error": "Failed to send announcement"}, 500
 
     @staticmethod
-    async def update_club_details(club_id: int, data: dict):
+    async def update_club_details(club_id: int, data: dict, redis=None):
         """D. Kulüp İçerik Müdahalesi + Otomatik Başkan Rol Yönetimi"""
         try:
             async with in_transaction():
                 club = await Clubs.get(club_id=club_id)
                 
                 changes = []
+                role_changed = []
                 
                 if "name" in data:
                     club.club_name = data["name"]
@@ -162,11 +195,13 @@ class AdminService:
                             if old_president and old_president.role == UserRole.CLUB_ADMIN:
                                 old_president.role = UserRole.STUDENT
                                 await old_president.save()
+                                role_changed.append(old_president.user_id)
                                 logger.info(f"Auto-Downgrade: User {old_president.user_id} role changed to STUDENT")
 
                         if new_president.role == UserRole.STUDENT:
                             new_president.role = UserRole.CLUB_ADMIN
                             await new_president.save()
+                            role_changed.append(new_president.user_id)
                             logger.info(f"Auto-Upgrade: User {new_president.user_id} role changed to CLUB_ADMIN")
                         
                         club.president_id = new_pid
@@ -176,13 +211,24 @@ class AdminService:
                     return {"message": "No changes detected"}, 200
 
                 await club.save()
-                logger.info(f"Club {club_id} updated by Admin. Fields: {changes}")
-                
-                return {"message": "Club updated successfully", "club": {
-                    "id": club.club_id,
-                    "name": club.club_name,
-                    "president_id": club.president_id
-                }}, 200
+            logger.info(f"Club {club_id} updated by Admin. Fields: {changes}")
+
+            # Geçersiz kılmalar commit'ten sonra: araya giren okuma eski adı/başkanı yeni anahtara yazamaz
+            await cache.invalidate(redis, "clubs:all_active")
+            await cache.bump_generation(redis, cache.EVENTS_NAMESPACE)
+            await ClubService.invalidate_detail(redis, club_id)
+            await mini_profiles.invalidate(redis, *role_changed)
+            await UserService.invalidate_summary(redis, *role_changed)
+            if redis and "name" in changes:
+                # Detay önbelleği kulüp adını da taşır
+                event_ids = await Events.filter(club_id=club_id).values_list("event_id", flat=True)
+                await EventService.invalidate_detail(redis, *event_ids)
+
+            return {"message": "Club updated successfully", "club": {
+                "id": club.club_id,
+                "name": club.club_name,
+                "president_id": club.president_id
+            }}, 200
 
         except DoesNotExist:
             return {"error": "Club not found"}, 404
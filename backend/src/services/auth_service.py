@@ -1,5 +1,6 @@
 from src.models import Users, UserRole
-from src.security import hash_password, verify_password, create_access_token
+from src.security import create_access_token
+from src.hashing import hash_password, verify_password, HashPoolSaturated
 from tortoise.exceptions import DoesNotExist
 from src.config import logger
 
@@ -23,7 +24,7 @@ class AuthService:
                 logger.warning(f"Registration failed: Duplicate Email {email}")
                 return {"error": "Email already exists"}, 400
             
-            hashed = hash_password(data.get("password"))
+            hashed = await hash_password(data.get("password"))
             
             full_name = data.get("full_name", "").strip().split(" ")
             first_name = data.get("first_name", full_name[0] if full_name else "")
@@ -52,7 +53,10 @@ class AuthService:
                     "full_name": f"{user.first_name} {user.last_name}"
                 }
             }, 201
-            
+
+        except HashPoolSaturated:
+            logger.warning("Registration rejected: Hash pool saturated")
+            return {"error": "Server is busy, please try again"}, 503
         except Exception as e:
             logger.error(f"CRITICAL Registration Error: {str(e)}", exc_info=True)
             return {"error": f"Registration failed: {str(e)}"}, 500
@@ -71,7 +75,13 @@ class AuthService:
             logger.warning(f"Login failed: Banned/Deleted User - {email}")
             return {"error": "Account is disabled. Please contact admin."}, 403
 
-        if not verify_password(data.get("password"), user.password):
+        try:
+            password_ok = await verify_password(data.get("password"), user.password)
+        except HashPoolSaturated:
+            logger.warning(f"Login rejected: Hash pool saturated - {email}")
+            return {"error": "Server is busy, please try again"}, 503
+
+        if not password_ok:
             logger.warning(f"Login failed: Wrong password - {email}")
             return {"error": "Invalid credentials"}, 401
             
@@ -1,8 +1,18 @@
-import json
-from src.models import Clubs, ClubFollowers, UserRole
+from src.models import Clubs, ClubFollowers, Events, UserRole
+from tortoise import timezone
 from tortoise.exceptions import DoesNotExist
+from tortoise.expressions import Q
+from tortoise.transactions import in_transaction
+from src import cache, counters, mini_profiles, pagination
 from datetime import datetime
 from src.config import logger
+from src.db_router import replica_read
+from src.services.user_service import UserService
+
+CLUB_DETAIL_TTL = 300
+# Detayda gösterilen etkinlik sayısı; devamı /clubs/<id>/events üzerinden
+CLUB_EVENTS_PREVIEW = 10
+MEMBER_STREAM_CHUNK = 500
 
 class ClubService:
 
@@ -23,7 +33,7 @@ class ClubService:
             msg = "Club created successfully"
             if status == "active":
                 logger.info(f"Club Created (Active) by Admin: {club.club_name}")
-                if redis: await redis.delete("clubs:all_active")
+                await cache.invalidate(redis, "clubs:all_active")
             else:
                 logger.info(f"Club Application Submitted: {club.club_name} by User {user_ctx['sub']}")
                 msg = "Club application submitted for approval"
@@ -52,7 +62,9 @@ class ClubService:
             
             logger.info(f"Club Approved: {club.club_name} by Admin {user_ctx['sub']}")
             
-            if redis: await redis.delete("clubs:all_active")
+            await cache.invalidate(redis, "clubs:all_active")
+            await cache.bump_generation(redis, cache.EVENTS_NAMESPACE)
+            await ClubService.invalidate_detail(redis, club_id)
 
             return {"message": f"Club '{club.club_name}' approved successfully"}, 200
         except DoesNotExist:
@@ -70,20 +82,22 @@ class ClubService:
             
             logger.info(f"Club Deleted: {club.club_name} (ID: {club_id})")
             
-            if redis: await redis.delete("clubs:all_active")
+            await cache.invalidate(redis, "clubs:all_active")
+            await cache.bump_generation(redis, cache.EVENTS_NAMESPACE)
+            await ClubService.invalidate_detail(redis, club_id)
 
             return {"message": "Club deleted successfully"}, 200
         except DoesNotExist:
             return {"error": "Club not found"}, 404
 
     @staticmethod
+    @replica_read
     async def get_all_clubs(redis=None):
-        cache_key = "clubs:all_active"
-        if redis:
-            cached_data = await redis.get(cache_key)
-            if cached_data:
-                return json.loads(cached_data), 200
-        
+        # Kulüp listesi değişince anahtar silinir (create/approve/delete); eşzamanlı ıskalar tek sorguda birleşir
+        return await cache.get_or_load(redis, "clubs:all_active", 300, ClubService._load_active_clubs, stale_ttl=60)
+
+    @staticmethod
+    async def _load_active_clubs():
         clubs = await Clubs.filter(is_deleted=False, status="active").all()
         
         clubs_list = [{
@@ -92,63 +106,209 @@ class ClubService:
             "description": c.description,
             "image_url": c.logo_url,
             "status": c.status,
+            "follower_count": c.follower_count,
             "created_at": str(c.created_at)
         } for c in clubs]
             
-        response_data = {"clubs": clubs_list}
-        
-        if redis: await redis.set(cache_key, json.dumps(response_data), ex=300)
-        
-        return response_data, 200
+        return {"clubs": clubs_list}, 200
 
     @staticmethod
-    async def get_club_details(club_id: int, user_ctx=None): 
-        try:
-            club = await Clubs.get(club_id=club_id).prefetch_related("events") 
-            if club.is_deleted: return {"error": "Club not found"}, 404
+    def detail_key(club_id) -> str:
+        return f"club:{club_id}:detail"
 
-            followers_list = []
-            is_authorized_viewer = False
-            
-            if user_ctx:
-                is_admin = user_ctx["role"] == UserRole.ADMIN
-                is_president = club.president_id == user_ctx["sub"]
-                
-                if is_admin or is_president:
-                    is_authorized_viewer = True
-                    followers = await ClubFollowers.filter(club_id=club_id).prefetch_related("user")
-                    followers_list = [{
-                        "user_id": f.user.user_id,
-                        "full_name": f"{f.user.first_name} {f.user.last_name}",
-                        "email": f.user.email
-                    } for f in followers if f.user]
-
-            events_list = [{
-                "id": e.event_id,
-                "title": e.title,
-                "date": str(e.event_date),
-                "location": e.location,
-                "image_url": e.image_url,
-                "capacity": e.quota
-            } for e in club.events if not e.is_deleted]
-            
-            return {
-                "club": {
-                    "id": club.club_id,
-                    "name": club.club_name,
-                    "description": club.description,
-                    "image_url": club.logo_url,
-                    "status": club.status,
-                    "president_id": club.president_id, 
-                    "events": events_list,
-                    "members": followers_list if is_authorized_viewer else [] 
+    @staticmethod
+    async def invalidate_detail(redis, club_id):
+        """Kulüp, etkinlik ve takip yazımlarından sonra paylaşılan detay önbelleğini siler"""
+        if club_id:
+            await cache.invalidate(redis, ClubService.detail_key(club_id))
+
+    @staticmethod
+    async def get_club_details(club_id: int, user_ctx=None, redis=None):
+        """
+        Kulüp bilgisi ve yaklaşan etkinliklerin ilk sayfası herkes için aynıdır ve önbellekten gelir.
+        Üye listesi yalnızca başkan/admin için, ayrı sayfalı uçtan verilir.
+        """
+        result, status = await cache.get_or_load(
+            redis, ClubService.detail_key(club_id), CLUB_DETAIL_TTL,
+            lambda: ClubService._load_club_detail(club_id), stale_ttl=60
+        )
+        if status != 200 or not user_ctx:
+            return result, status
+
+        if user_ctx["role"] == UserRole.ADMIN or result["club"]["president_id"] == user_ctx["sub"]:
+            return {"club": {**result["club"], "can_manage": True, "members_url": f"/clubs/{club_id}/members"}}, 200
+        return result, status
+
+    @staticmethod
+    async def _load_club_detail(club_id: int):
+        club = await Clubs.filter(club_id=club_id, is_deleted=False).first().values(
+            "club_id", "club_name", "description", "logo_url", "status", "follower_count", "president_id"
+        )
+        if not club:
+            return {"error": "Club not found"}, 404
+
+        events, next_cursor = await ClubService._events_page(club_id, None, CLUB_EVENTS_PREVIEW)
+        return {
+            "club": {
+                "id": club["club_id"],
+                "name": club["club_name"],
+                "description": club["description"],
+                "image_url": club["logo_url"],
+                "status": club["status"],
+                "follower_count": club["follower_count"],
+                "president_id": club["president_id"],
+                "events": events,
+                "events_pagination": {
+                    "next_cursor": next_cursor,
+                    "next": f"/clubs/{club_id}/events?cursor={next_cursor}" if next_cursor else None
                 }
-            }, 200
-        except DoesNotExist:
+            }
+        }, 200
+
+    @staticmethod
+    @replica_read
+    async def get_club_events(club_id: int, cursor: str = None, limit: int = 20):
+        if not await Clubs.exists(club_id=club_id, is_deleted=False):
+            return {"error": "Club not found"}, 404
+        try:
+            events, next_cursor = await ClubService._events_page(club_id, cursor, limit)
+        except ValueError:
+            return {"error": "Invalid cursor"}, 400
+        return {"events": events, "pagination": {"limit": limit, "next_cursor": next_cursor}}, 200
+
+    @staticmethod
+    async def _events_page(club_id: int, cursor, limit: int):
+        """
+        Önce yaklaşan etkinlikler (en yakını başta), sonra geçmişler (en yenisi başta).
+        Cursor (yaklaşan mı, tarih, id) tutar; sıralama ve filtre (club_id, event_date) indeksinde yapılır.
+        """
+        now = timezone.now()
+        upcoming, after = True, None
+        if cursor:
+            upcoming, *after = pagination.decode_cursor(cursor, bool, datetime, int)
+
+        fields = ("event_id", "title", "event_date", "location", "image_url", "quota")
+        rows = []
+        if upcoming:
+            query = ClubService._events_query(club_id, True, after, now)
+            rows = await query.limit(limit + 1).values(*fields)
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = pagination.encode_cursor(True, rows[-1]["event_date"], rows[-1]["event_id"])
+                return [ClubService._event_item(r, True) for r in rows], next_cursor
+            after = None
+
+        items = [ClubService._event_item(r, True) for r in rows]
+        remaining = limit - len(items)
+        query = ClubService._events_query(club_id, False, after, now)
+        past = await query.limit(remaining + 1).values(*fields)
+
+        next_cursor = None
+        if len(past) > remaining:
+            past = past[:remaining]
+            if past:
+                next_cursor = pagination.encode_cursor(False, past[-1]["event_date"], past[-1]["event_id"])
+            else:
+                # Sayfa yaklaşanlarla doldu; sıradaki sayfa geçmişlere geçer
+                next_cursor = pagination.encode_cursor(True, rows[-1]["event_date"], rows[-1]["event_id"])
+        return items + [ClubService._event_item(r, False) for r in past], next_cursor
+
+    @staticmethod
+    def _events_query(club_id: int, upcoming: bool, after, now):
+        """Yaklaşanlar (event_date, event_id) artan, geçmişler azalan; after (tarih, id) o yöndeki son satır"""
+        query = Events.filter(club_id=club_id, is_deleted=False)
+        if upcoming:
+            query = query.filter(event_date__gte=now)
+            if after:
+                query = query.filter(Q(event_date__gt=after[0]) | Q(event_date=after[0], event_id__gt=after[1]))
+            return query.order_by("event_date", "event_id")
+        query = query.filter(event_date__lt=now)
+        if after:
+            query = query.filter(Q(event_date__lt=after[0]) | Q(event_date=after[0], event_id__lt=after[1]))
+        return query.order_by("-event_date", "-event_id")
+
+    @staticmethod
+    def _event_item(row, upcoming: bool):
+        return {
+            "id": row["event_id"],
+            "title": row["title"],
+            "date": str(row["event_date"]),
+            "location": row["location"],
+            "image_url": row["image_url"],
+            "capacity": row["quota"],
+            "upcoming": upcoming
+        }
+
+    @staticmethod
+    async def check_manager(user_ctx, club_id: int):
+        """Üye listesine erişim: admin veya kulüp başkanı. Yetkiliyse None, değilse (hata, durum) döner"""
+        club = await Clubs.filter(club_id=club_id, is_deleted=False).first().values("president_id")
+        if not club:
             return {"error": "Club not found"}, 404
+        if user_ctx["role"] != UserRole.ADMIN and club["president_id"] != user_ctx["sub"]:
+            return {"error": "Unauthorized"}, 403
+        return None
+
+    @staticmethod
+    @replica_read
+    async def get_members(user_ctx, club_id: int, cursor: str = None, limit: int = 50, redis=None):
+        denied = await ClubService.check_manager(user_ctx, club_id)
+        if denied:
+            return denied
+        after_id = 0
+        if cursor:
+            try:
+                (after_id,) = pagination.decode_cursor(cursor, int)
+            except ValueError:
+                return {"error": "Invalid cursor"}, 400
+
+        rows = await ClubService._members_after(club_id, after_id, limit + 1)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = pagination.encode_cursor(rows[-1]["id"])
+        members = await ClubService._render_members(redis, rows)
+        return {"members": members, "pagination": {"limit": limit, "next_cursor": next_cursor}}, 200
+
+    @staticmethod
+    async def iter_members(club_id: int, chunk_size: int = MEMBER_STREAM_CHUNK, redis=None):
+        """Binlerce takipçisi olan kulüpler için üyeleri id sırasıyla parça parça verir; bellekte tek parça tutulur"""
+        after_id = 0
+        while True:
+            rows = await ClubService._members_after(club_id, after_id, chunk_size)
+            if not rows:
+                return
+            after_id = rows[-1]["id"]
+            yield await ClubService._render_members(redis, rows, cache_locally=False)
+            if len(rows) < chunk_size:
+                return
+
+    @staticmethod
+    async def _members_after(club_id: int, after_id: int, limit: int):
+        return await ClubService._members_query(club_id, after_id).limit(limit).values("id", "user_id", "user__email")
+
+    @staticmethod
+    def _members_query(club_id: int, after_id: int):
+        # (club_id) indeksi id sırasını da taşır; derin sayfalar OFFSET taraması yapmaz
+        return ClubFollowers.filter(club_id=club_id, id__gt=after_id).order_by("id")
+
+    @staticmethod
+    async def _render_members(redis, rows, cache_locally: bool = True):
+        profiles = await mini_profiles.get_many(redis, [r["user_id"] for r in rows], cache_locally=cache_locally)
+        members = []
+        for r in rows:
+            profile = profiles.get(r["user_id"]) or mini_profiles.unknown(r["user_id"])
+            members.append({
+                "user_id": r["user_id"],
+                "full_name": profile["name"],
+                "email": r["user__email"],
+                "profile_photo": profile["avatar"],
+                "department": profile["department"]
+            })
+        return members
 
     @staticmethod
-    async def follow_club(user_ctx, club_id: int):
+    async def follow_club(user_ctx, club_id: int, redis=None):
         if user_ctx["role"] == UserRole.ADMIN:
              return {"error": "Admins cannot join clubs"}, 400
 
@@ -162,20 +322,28 @@ class ClubService:
             exists = await ClubFollowers.filter(user_id=user_ctx["sub"], club_id=club_id).exists()
             if exists: return {"message": "Already following"}, 400
             
-            await ClubFollowers.create(user_id=user_ctx["sub"], club_id=club_id)
+            async with in_transaction():
+                await ClubFollowers.create(user_id=user_ctx["sub"], club_id=club_id)
+                await counters.adjust(Clubs, "follower_count", 1, club_id=club_id)
+            await UserService.invalidate_summary(redis, user_ctx["sub"])
+            await ClubService.invalidate_detail(redis, club_id)
             return {"message": f"You are now following {club.club_name}"}, 200
         except DoesNotExist:
             return {"error": "Club not found"}, 404
 
     @staticmethod
-    async def leave_club(user_ctx, club_id: int):
-        deleted_count = await ClubFollowers.filter(user_id=user_ctx["sub"], club_id=club_id).delete()
+    async def leave_club(user_ctx, club_id: int, redis=None):
+        async with in_transaction():
+            deleted_count = await ClubFollowers.filter(user_id=user_ctx["sub"], club_id=club_id).delete()
+            await counters.adjust(Clubs, "follower_count", -deleted_count, club_id=club_id)
         if deleted_count == 0:
             return {"error": "You are not following this club"}, 400
+        await UserService.invalidate_summary(redis, user_ctx["sub"])
+        await ClubService.invalidate_detail(redis, club_id)
         return {"message": "Successfully unfollowed"}, 200
 
     @staticmethod
-    async def remove_follower(user_ctx, club_id: int, target_user_id: int):
+    async def remove_follower(user_ctx, club_id: int, target_user_id: int, redis=None):
         try:
             club = await Clubs.get(club_id=club_id)
             is_admin = user_ctx["role"] == UserRole.ADMIN
@@ -183,8 +351,12 @@ class ClubService:
             
             if not (is_admin or is_president): return {"error": "Unauthorized"}, 403
 
-            deleted_count = await ClubFollowers.filter(user_id=target_user_id, club_id=club_id).delete()
+            async with in_transaction():
+                deleted_count = await ClubFollowers.filter(user_id=target_user_id, club_id=club_id).delete()
+                await counters.adjust(Clubs, "follower_count", -deleted_count, club_id=club_id)
             if deleted_count == 0: return {"error": "User is not a follower"}, 404
+            await UserService.invalidate_summary(redis, target_user_id)
+            await ClubService.invalidate_detail(redis, club_id)
             
             logger.info(f"User {target_user_id} removed from Club {club_id} by {user_ctx['sub']}")
             return {"message": "User removed from club"}, 200
@@ -192,6 +364,7 @@ class ClubService:
             return {"error": "Club not found"}, 404
 
     @staticmethod
+    @replica_read
     async def get_my_clubs(user_ctx):
         if user_ctx["role"] == UserRole.ADMIN:
             clubs = await Clubs.filter(is_deleted=False).all()
@@ -1,34 +1,135 @@
+from datetime import datetime
 from src.models import EventComments, Events, Users
 from tortoise.exceptions import DoesNotExist
+from tortoise.transactions import in_transaction
+from src import cache, counters, mini_profiles, pagination, serialization
+from src.db_router import primary_read, replica_read
+from src.services.user_service import UserService
+from src.services.event_service import EventService
+
+# Etkinlik başına en yeni yorumlar Redis listesinde (yeniden eskiye) tutulur; ilk sayfa DB'ye gitmez
+COMMENTS_CACHED = 50
+COMMENTS_CACHE_TTL = 3600
+# Listenin sonuna konur: ondan önceki öğeler etkinliğin tüm yorumlarıdır
+END_MARKER = "_end"
+
+# Yazanlar (ekleme/silme) commit'ten sonra listeyi cache.invalidate ile siler ve sürümünü artırır; liste
+# bir sonraki okumada DB'den (created_at, comment_id) sırasıyla kurulur. Yeniden kurma, DB'yi okumadan
+# önce gördüğü sürüm hâlâ aynıysa listeyi yazar; araya yazma girdiyse eksik ya da silinmiş yorum
+# içerebilecek listeyi yazmaz. Yeni yorum listeye eklenmez: eşzamanlı eklemeler commit sırasıyla
+# değil push sırasıyla dizilir, cursor'lar da listedeki son öğeden üretildiği için sıra bozulmamalı.
+_REBUILD_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then return 0 end
+redis.call('DEL', KEYS[1])
+redis.call('RPUSH', KEYS[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
 
 class CommentService:
 
     @staticmethod
-    async def add_comment(user_ctx, event_id: int, content: str):
+    async def add_comment(user_ctx, event_id: int, content: str, redis=None):
         if not await Events.exists(event_id=event_id):
             return {"error": "Event not found"}, 404
 
-        comment = await EventComments.create(
-            user_id=user_ctx["sub"],
-            event_id=event_id,
-            content=content
-        )
+        async with in_transaction():
+            comment = await EventComments.create(
+                user_id=user_ctx["sub"],
+                event_id=event_id,
+                content=content
+            )
+            await counters.adjust(Events, "comment_count", 1, event_id=event_id)
+        await CommentService.forget_cached(redis, event_id)
+        await UserService.invalidate_summary(redis, user_ctx["sub"])
+        await EventService.invalidate_detail(redis, event_id)
         return {"message": "Comment added", "id": comment.comment_id}, 201
 
     @staticmethod
-    async def get_comments(event_id: int):
-        comments = await EventComments.filter(event_id=event_id).prefetch_related("user").order_by("-created_at")
-        
-        result = []
-        for c in comments:
-            full_name = "Unknown User"
-            if c.user:
-                full_name = f"{c.user.first_name} {c.user.last_name}"
-
-            result.append({
-                "id": c.comment_id,
-                "content": c.content,
-                "user_name": full_name,
-                "created_at": str(c.created_at)
-            })
-        return {"comments": result}, 200
\ No newline at end of file
+    async def get_comments(event_id: int, cursor: str = None, limit: int = 20, redis=None):
+        """(created_at, comment_id) üzerinde keyset sayfalama; ilk sayfa önbellekteki listeden gelir"""
+        if cursor or not redis or limit > COMMENTS_CACHED:
+            try:
+                items, next_cursor = await CommentService._load_page(event_id, cursor, limit)
+            except ValueError:
+                return {"error": "Invalid cursor"}, 400
+        else:
+            items, next_cursor = await CommentService._cached_first_page(redis, event_id, limit)
+
+        authors = await mini_profiles.get_many(redis, [c["user_id"] for c in items])
+        for c in items:
+            author = authors.get(c["user_id"]) or mini_profiles.unknown(c["user_id"])
+            c["user_name"] = author["name"]
+            c["user_avatar"] = author["avatar"]
+        return {"comments": items, "pagination": {"limit": limit, "next_cursor": next_cursor}}, 200
+
+    @staticmethod
+    def cache_key(event_id) -> str:
+        return f"event:{event_id}:comments"
+
+
+    @staticmethod
+    def _render(comment_id: int, content: str, user_id: int, created_at) -> dict:
+        return {"id": comment_id, "content": content, "user_id": user_id, "created_at": str(created_at)}
+
+    @staticmethod
+    @replica_read
+    async def _load_page(event_id: int, cursor, limit: int):
+        query = CommentService._page_query(event_id, cursor)
+        rows = await query.limit(limit + 1).values("comment_id", "content", "user_id", "created_at")
+        rows, next_cursor = pagination.split_page(rows, limit, "comment_id")
+        items = [CommentService._render(r["comment_id"], r["content"], r["user_id"], r["created_at"]) for r in rows]
+        return items, next_cursor
+
+    @staticmethod
+    def _page_query(event_id: int, cursor=None):
+        return pagination.newest_first(EventComments.filter(event_id=event_id), cursor, "comment_id")
+
+    @staticmethod
+    async def _cached_first_page(redis, event_id: int, limit: int):
+        key = CommentService.cache_key(event_id)
+        raw = await redis.lrange(key, 0, limit)
+        if not raw:
+            raw = await CommentService._rebuild(redis, event_id)
+            raw = raw[:limit + 1]
+
+        if END_MARKER in raw:
+            items = [serialization.loads(r) for r in raw[:raw.index(END_MARKER)]]
+            return items, None
+        if len(raw) <= limit:
+            # Silmelerden sonra liste pencereyi dolduramıyor; sayfa DB'den gelir
+            return await CommentService._load_page(event_id, None, limit)
+
+        items = [serialization.loads(r) for r in raw[:limit]]
+        last = items[-1]
+        return items, pagination.encode_cursor(datetime.fromisoformat(last["created_at"]), last["id"])
+
+    @staticmethod
+    async def _rebuild(redis, event_id: int):
+        key = CommentService.cache_key(event_id)
+        version_key = cache.version_key(key)
+        version = await redis.get(version_key) or ""
+        rows = await CommentService._latest_rows(event_id)
+        raw = [
+            serialization.dumps(CommentService._render(r["comment_id"], r["content"], r["user_id"], r["created_at"])).decode("utf-8")
+            for r in rows
+        ]
+        if len(rows) <= COMMENTS_CACHED:
+            raw.append(END_MARKER)
+
+        await cache.run_script(redis, _REBUILD_SCRIPT, [key, version_key], version, COMMENTS_CACHE_TTL, *raw)
+        return raw
+
+    @staticmethod
+    async def _latest_rows(event_id: int):
+        # Liste önbelleğe yazılacağı için gecikmeli replikadan değil birincilden okunur
+        with primary_read():
+            return await CommentService._page_query(event_id).limit(COMMENTS_CACHED + 1).values(
+                "comment_id", "content", "user_id", "created_at"
+            )
+
+    @staticmethod
+    async def forget_cached(redis, event_id: int):
+        """Ekleme/silmeden sonra listeyi düşürür; sürüm artışı süren bir yeniden kurmanın eski listeyi yazmasını önler"""
+        await cache.invalidate(redis, CommentService.cache_key(event_id))
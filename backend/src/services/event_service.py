@@ -1,15 +1,20 @@
-import json
 from src.models import Events, Clubs, EventParticipation, ParticipationStatus, UserRole
-from tortoise.exceptions import DoesNotExist
+from tortoise.exceptions import DoesNotExist, IntegrityError
+from tortoise.transactions import in_transaction
+from src import admission, cache, counters, jobs, pagination, search, serialization
 from src.services.notification_service import NotificationService
+from src.services.user_service import UserService
+from src.services.club_service import ClubService
+from contextlib import nullcontext
 from datetime import datetime
 from tortoise.expressions import Q
-from src.config import logger 
+from src.config import logger, EVENTS_CACHE_TTL, EVENTS_STALE_TTL
+from src.db_router import primary_read, replica_read
 
 class EventService:
 
     @staticmethod
-    async def create_event(user_ctx, data):
+    async def create_event(user_ctx, data, redis=None):
         club_id = data.get("club_id")
         club = await Clubs.get_or_none(club_id=club_id)
         if not club or club.is_deleted:
@@ -40,12 +45,19 @@ class EventService:
         )
         
         logger.info(f"Event Created: '{event.title}' (ID: {event.event_id}) for Club '{club.club_name}'")
+        await search.index_event(event)
+        await cache.bump_generation(redis, cache.EVENTS_NAMESPACE)
+        await ClubService.invalidate_detail(redis, club_id)
 
-        await NotificationService.notify_followers(club.club_id, club.club_name, event.title)
+        if redis:
+            await jobs.enqueue(redis, "notify_followers", club_id=club.club_id, club_name=club.club_name,
+                               event_title=event.title, event_id=event.event_id)
+        else:
+            NotificationService.schedule_follower_fanout(club.club_id, club.club_name, event.title, event.event_id)
         return {"message": "Event created", "event_id": event.event_id}, 201
 
     @staticmethod
-    async def delete_event(user_ctx, event_id: int):
+    async def delete_event(user_ctx, event_id: int, redis=None):
         try:
             event = await Events.get(event_id=event_id).prefetch_related("club")
             is_admin = user_ctx["role"] == UserRole.ADMIN
@@ -56,6 +68,10 @@ class EventService:
             event.is_deleted = True
             event.deleted_at = datetime.utcnow()
             await event.save()
+            await search.remove_event(event_id)
+            await cache.bump_generation(redis, cache.EVENTS_NAMESPACE)
+            await EventService.invalidate_detail(redis, event_id)
+            await ClubService.invalidate_detail(redis, event.club_id)
             
             logger.info(f"Event Deleted: {event.title} (ID: {event_id}) by {user_ctx['sub']}")
             return {"message": "Event deleted"}, 200
@@ -63,43 +79,74 @@ class EventService:
             return {"error": "Event not found"}, 404
 
     @staticmethod
-    async def get_event_detail(event_id: int, user_ctx=None): 
-        try:
-            event = await Events.get(event_id=event_id).prefetch_related("club")
-            if event.is_deleted: return {"error": "Event not found"}, 404
-            
-            participant_count = await EventParticipation.filter(
-                event_id=event_id, status=ParticipationStatus.GOING
-            ).count()
+    def detail_key(event_id) -> str:
+        # Önbellekteki değerin biçimi değişince sürüm soneki artırılır; eski biçim TTL ile düşer
+        return f"event:{event_id}:detail:v2"
+
+    @staticmethod
+    async def invalidate_detail(redis, *event_ids):
+        """Güncelleme, katılım ve yorum yazımlarından sonra paylaşılan detay önbelleğini siler"""
+        await cache.invalidate(redis, *[EventService.detail_key(eid) for eid in event_ids])
+
+    @staticmethod
+    async def get_event_detail(event_id: int, user_ctx=None, redis=None):
+        """
+        Etkinliğin herkes için aynı kısmı önbellekten gelir; kullanıcıya özel is_joined
+        koltuk hash'inden okunur. Sıcak etkinlikte görüntüleme başına SQL sorgusu çalışmaz.
+        """
+        if redis:
+            shared, status = await cache.get_or_load(
+                redis, EventService.detail_key(event_id), EVENTS_CACHE_TTL,
+                lambda: EventService._load_event_detail(event_id)
+            )
+        else:
+            shared, status = await EventService._load_event_detail(event_id)
+        if status != 200:
+            return shared, status
 
-            is_joined = False
-            if user_ctx:
+        is_joined = False
+        if user_ctx:
+            if redis:
+                is_joined = await admission.has_seat(redis, event_id, user_ctx["sub"])
+            else:
                 is_joined = await EventParticipation.filter(
-                    event_id=event_id, 
-                    user_id=user_ctx["sub"], 
+                    event_id=event_id,
+                    user_id=user_ctx["sub"],
                     status=ParticipationStatus.GOING
                 ).exists()
-            
-            return {
-                "event": {
-                    "id": event.event_id,
-                    "title": event.title,
-                    "description": event.description,
-                    "date": str(event.event_date),
-                    "location": event.location,
-                    "capacity": event.quota,
-                    "image_url": event.image_url,
-                    "club_name": event.club.club_name if event.club else "Unknown",
-                    "club_id": event.club.club_id if event.club else None,
-                    "participant_count": participant_count,
-                    "is_joined": is_joined
-                }
-            }, 200
-        except DoesNotExist:
+
+        if isinstance(shared, serialization.RawJSON):
+            # Önbellekte yalnızca etkinlik nesnesi var; alan, gövde parse edilmeden kapanışından önce eklenir
+            flag = b'true' if is_joined else b'false'
+            return serialization.RawJSON(b'{"event":' + shared.body[:-1] + b',"is_joined":' + flag + b'}}'), 200
+        return {"event": {**shared, "is_joined": is_joined}}, 200
+
+    @staticmethod
+    async def _load_event_detail(event_id: int):
+        # Kulüp adı JOIN ile aynı sorguda gelir; katılımcı ve yorum sayıları sayaç kolonlarından okunur
+        event = await Events.filter(event_id=event_id, is_deleted=False).first().values(
+            "event_id", "title", "description", "event_date", "location", "quota", "image_url",
+            "club_id", "participant_count", "comment_count", club_name="club__club_name"
+        )
+        if not event:
             return {"error": "Event not found"}, 404
 
+        return {
+            "id": event["event_id"],
+            "title": event["title"],
+            "description": event["description"],
+            "date": str(event["event_date"]),
+            "location": event["location"],
+            "capacity": event["quota"],
+            "image_url": event["image_url"],
+            "club_name": event["club_name"] or "Unknown",
+            "club_id": event["club_id"],
+            "participant_count": event["participant_count"],
+            "comment_count": event["comment_count"]
+        }, 200
+
     @staticmethod
-    async def update_event(user_ctx, event_id: int, data: dict):
+    async def update_event(user_ctx, event_id: int, data: dict, redis=None):
         try:
             event = await Events.get(event_id=event_id).prefetch_related("club")
             
@@ -118,32 +165,28 @@ class EventService:
                 if cap > 0: event.quota = cap
 
             await event.save()
+            await search.index_event(event)
+            await cache.bump_generation(redis, cache.EVENTS_NAMESPACE)
+            await EventService.invalidate_detail(redis, event_id)
+            await ClubService.invalidate_detail(redis, event.club_id)
             return {"message": "Event updated successfully"}, 200
         except DoesNotExist:
             return {"error": "Event not found"}, 404
 
     @staticmethod
-    async def get_events(redis, page: int = 1, limit: int = 20, search: str = None, date_filter: str = None):
-        cache_key = f"events:page:{page}:lim:{limit}:s:{search}:d:{date_filter}"
-        
-        if redis:
-            cached_data = await redis.get(cache_key)
-            if cached_data: return json.loads(cached_data), 200
-
+    def _listing_query(date_filter: str = None, event_ids=None):
         query = Events.filter(is_deleted=False, club__status="active")
 
-        if search:
-            query = query.filter(Q(title__icontains=search) | Q(description__icontains=search))
+        if event_ids is not None:
+            query = query.filter(event_id__in=event_ids)
         
         if date_filter:
             query = query.filter(event_date__gte=date_filter)
+        return query
 
-        total_count = await query.count()
-
-        offset = (page - 1) * limit
-        events = await query.prefetch_related("club").order_by("event_date").offset(offset).limit(limit)
-        
-        result_list = [{
+    @staticmethod
+    def _listing_item(e):
+        return {
             "id": e.event_id,
             "title": e.title,
             "description": e.description,
@@ -151,8 +194,66 @@ class EventService:
             "club_name": e.club.club_name if e.club else "Unknown",
             "location": e.location,
             "image_url": e.image_url,
-            "capacity": e.quota
-        } for e in events]
+            "capacity": e.quota,
+            "participant_count": e.participant_count,
+            "comment_count": e.comment_count
+        }
+
+    @staticmethod
+    async def _search_ids(redis, search_text: str):
+        """
+        Alaka sırasına göre etkinlik ID'leri; aranacak kelime yoksa None. Önbellek anahtarı normalize edilmiş
+        sorgudur, indekse ise kullanıcının yazdığı metin gider (MySQL FULLTEXT Türkçe harfleri kendisi eşler).
+        """
+        normalized = search.normalize_query(search_text) if search_text else None
+        if not normalized:
+            return None
+        generation = None
+        if redis:
+            cache_key = await cache.versioned_key(redis, cache.EVENTS_NAMESPACE, f"search:{normalized}")
+            # Anahtardan sonra okunur: indeks en az anahtardaki nesil kadar güncel kurulur
+            generation = await cache.get_generation(redis, cache.EVENTS_NAMESPACE)
+            cached = await redis.get(cache_key)
+            if cached: return serialization.loads(cached)
+
+        ids = await search.search_events(search_text, generation=generation)
+        if redis: await redis.set(cache_key, serialization.dumps(ids), ex=EVENTS_CACHE_TTL)
+        return ids
+
+    @staticmethod
+    @replica_read
+    async def get_events(redis, page: int = 1, limit: int = 20, search_text: str = None, date_filter: str = None):
+        normalized = search.normalize_query(search_text) if search_text else None
+
+        async def load():
+            return await EventService._load_events_page(redis, page, limit, search_text, date_filter)
+
+        if not redis:
+            return await load()
+        cache_key = await cache.versioned_key(
+            redis, cache.EVENTS_NAMESPACE, f"page:{page}:lim:{limit}:s:{normalized}:d:{date_filter}"
+        )
+        # İsabette gövde parse edilmeden döner; route baytları doğrudan yazar
+        return await cache.get_or_load(redis, cache_key, EVENTS_CACHE_TTL, load, stale_ttl=EVENTS_STALE_TTL)
+
+    @staticmethod
+    async def _load_events_page(redis, page: int, limit: int, search_text: str, date_filter: str):
+        offset = (page - 1) * limit
+        ranked = await EventService._search_ids(redis, search_text)
+        if ranked is not None:
+            # Arama sonuçları tarihe göre değil alaka düzeyine göre sıralanır
+            visible = set(await EventService._listing_query(date_filter, ranked).values_list("event_id", flat=True))
+            ordered = [event_id for event_id in ranked if event_id in visible]
+            total_count = len(ordered)
+            page_ids = ordered[offset:offset + limit]
+            by_id = {e.event_id: e for e in await Events.filter(event_id__in=page_ids).prefetch_related("club")}
+            events = [by_id[event_id] for event_id in page_ids if event_id in by_id]
+        else:
+            query = EventService._listing_query(date_filter)
+            total_count = await query.count()
+            events = await query.prefetch_related("club").order_by("event_date", "event_id").offset(offset).limit(limit)
+        
+        result_list = [EventService._listing_item(e) for e in events]
             
         response_data = {
             "events": result_list,
@@ -163,19 +264,142 @@ class EventService:
                 "total_pages": (total_count + limit - 1) // limit
             }
         }
+        if ranked is not None:
+            response_data["pagination"]["truncated"] = len(ranked) >= search.MAX_RESULTS
+        return response_data, 200
 
-        if redis: await redis.set(cache_key, json.dumps(response_data), ex=60)
+    @staticmethod
+    @replica_read
+    async def get_events_by_cursor(redis, cursor: str = None, limit: int = 20, search_text: str = None,
+                                   date_filter: str = None, with_total: bool = False):
+        """Keyset sayfalama: (event_date, event_id) sırasında cursor'dan sonraki kayıtlar"""
+        after = None
+        if cursor:
+            try:
+                after = pagination.decode_cursor(cursor, datetime, int)
+            except ValueError:
+                return {"error": "Invalid cursor"}, 400
+
+        normalized = search.normalize_query(search_text) if search_text else None
+
+        async def load():
+            return await EventService._load_cursor_page(redis, after, limit, search_text, date_filter)
+
+        if redis:
+            cache_key = await cache.versioned_key(
+                redis, cache.EVENTS_NAMESPACE, f"cursor:{cursor}:lim:{limit}:s:{normalized}:d:{date_filter}"
+            )
+            response_data, status = await cache.get_or_load(
+                redis, cache_key, EVENTS_CACHE_TTL, load, stale_ttl=EVENTS_STALE_TTL
+            )
+        else:
+            response_data, status = await load()
+
+        if with_total:
+            # Önbellekteki sayfa paylaşıldığı için toplam bir kopyaya eklenir
+            page_info = {**response_data["pagination"]}
+            page_info["approximate_total"] = await EventService._approximate_total(redis, search_text, date_filter)
+            response_data = {**response_data, "pagination": page_info}
+
+        return response_data, status
+
+    @staticmethod
+    async def _load_cursor_page(redis, after, limit: int, search_text: str, date_filter: str):
+        ranked = await EventService._search_ids(redis, search_text)
+        query = EventService._cursor_query(date_filter, ranked, after)
+
+        # Bir fazla kayıt çekip sonraki sayfanın varlığını count() olmadan anlıyoruz
+        events = await query.prefetch_related("club").limit(limit + 1)
+        has_more = len(events) > limit
+        events = events[:limit]
+
+        next_cursor = None
+        if has_more:
+            next_cursor = pagination.encode_cursor(events[-1].event_date, events[-1].event_id)
 
+        response_data = {
+            "events": [EventService._listing_item(e) for e in events],
+            "pagination": {
+                "limit": limit,
+                "next_cursor": next_cursor
+            }
+        }
+        if ranked is not None:
+            response_data["pagination"]["truncated"] = len(ranked) >= search.MAX_RESULTS
         return response_data, 200
 
     @staticmethod
-    async def join_event(user_ctx, event_id: int):
+    def _cursor_query(date_filter: str = None, event_ids=None, after=None):
+        query = EventService._listing_query(date_filter, event_ids)
+        if after:
+            after_date, after_id = after
+            # event_date__gte ayrı yazılınca indeks aralık taramasıyla başlayabiliyor
+            query = query.filter(event_date__gte=after_date).filter(
+                Q(event_date__gt=after_date) | Q(event_id__gt=after_id)
+            )
+        return query.order_by("event_date", "event_id")
+
+    @staticmethod
+    async def _approximate_total(redis, search_text: str = None, date_filter: str = None):
+        """Toplam, listeyle aynı nesil anahtarında tutulur; yalnızca katılımcı sayıları TTL kadar gecikebilir"""
+        normalized = search.normalize_query(search_text) if search_text else None
+        if redis:
+            cache_key = await cache.versioned_key(redis, cache.EVENTS_NAMESPACE, f"count:s:{normalized}:d:{date_filter}")
+            cached = await redis.get(cache_key)
+            if cached is not None: return int(cached)
+
+        # Paylaşılan anahtara yazılacaksa gecikmeli replikadan değil birincilden sayılır
+        with primary_read() if redis else nullcontext():
+            ranked = await EventService._search_ids(redis, search_text)
+            total = await EventService._listing_query(date_filter, ranked).count()
+        if redis: await redis.set(cache_key, total, ex=EVENTS_CACHE_TTL)
+        return total
+
+    @staticmethod
+    async def join_event(user_ctx, event_id: int, redis=None):
         try:
             event = await Events.get(event_id=event_id)
             if event.is_deleted: return {"error": "Event not found"}, 404
-            
-            current_count = await EventParticipation.filter(event_id=event_id, status=ParticipationStatus.GOING).count()
-            if event.quota > 0 and current_count >= event.quota:
+
+            if not redis:
+                return await EventService._join_event_locked(user_ctx, event_id)
+
+            result = await admission.try_admit(redis, event_id, user_ctx["sub"], event.quota)
+            if result == admission.FULL:
+                logger.info(f"Join failed (Full): Event {event_id}, User {user_ctx['sub']}")
+                return {"error": "Event is full"}, 400
+            if result == admission.DUPLICATE:
+                return {"message": "Already joined"}, 400
+            if result != admission.ADMITTED:
+                return {"error": "Please try again"}, 503
+
+            try:
+                async with in_transaction():
+                    await EventParticipation.create(
+                        user_id=user_ctx["sub"],
+                        event_id=event_id,
+                        status=ParticipationStatus.GOING
+                    )
+                    await counters.adjust(Events, "participant_count", 1, event_id=event_id)
+            except IntegrityError:
+                await admission.release_seat(redis, event_id, user_ctx["sub"])
+                return {"message": "Already joined"}, 400
+            except Exception:
+                await admission.release_seat(redis, event_id, user_ctx["sub"])
+                raise
+            await UserService.invalidate_summary(redis, user_ctx["sub"])
+            await EventService.invalidate_detail(redis, event_id)
+            return {"message": "Successfully joined"}, 200
+        except DoesNotExist:
+            return {"error": "Event not found"}, 404
+
+    @staticmethod
+    async def _join_event_locked(user_ctx, event_id: int):
+        """Redis yokken kota kontrolünü etkinlik satırını kilitleyerek yapar"""
+        async with in_transaction():
+            event = await Events.filter(event_id=event_id).select_for_update().get()
+
+            if event.quota > 0 and event.participant_count >= event.quota:
                 logger.info(f"Join failed (Full): Event {event_id}, User {user_ctx['sub']}")
                 return {"error": "Event is full"}, 400
 
@@ -187,19 +411,23 @@ class EventService:
                 event_id=event_id,
                 status=ParticipationStatus.GOING
             )
-            return {"message": "Successfully joined"}, 200
-        except DoesNotExist:
-            return {"error": "Event not found"}, 404
+            await counters.adjust(Events, "participant_count", 1, event_id=event_id)
+        return {"message": "Successfully joined"}, 200
 
     @staticmethod
-    async def leave_event(user_ctx, event_id: int):
-        deleted_count = await EventParticipation.filter(user_id=user_ctx["sub"], event_id=event_id).delete()
+    async def leave_event(user_ctx, event_id: int, redis=None):
+        async with in_transaction():
+            deleted_count = await EventParticipation.filter(user_id=user_ctx["sub"], event_id=event_id).delete()
+            await counters.adjust(Events, "participant_count", -deleted_count, event_id=event_id)
         if deleted_count == 0:
             return {"error": "You are not participating in this event"}, 400
+        if redis: await admission.release_seat(redis, event_id, user_ctx["sub"])
+        await UserService.invalidate_summary(redis, user_ctx["sub"])
+        await EventService.invalidate_detail(redis, event_id)
         return {"message": "Successfully left the event"}, 200
 
     @staticmethod
-    async def remove_participant(user_ctx, event_id: int, target_user_id: int):
+    async def remove_participant(user_ctx, event_id: int, target_user_id: int, redis=None):
         try:
             event = await Events.get(event_id=event_id).prefetch_related("club")
             is_admin = user_ctx["role"] == UserRole.ADMIN
@@ -207,8 +435,13 @@ class EventService:
             
             if not (is_admin or is_president): return {"error": "Unauthorized"}, 403
 
-            deleted_count = await EventParticipation.filter(user_id=target_user_id, event_id=event_id).delete()
+            async with in_transaction():
+                deleted_count = await EventParticipation.filter(user_id=target_user_id, event_id=event_id).delete()
+                await counters.adjust(Events, "participant_count", -deleted_count, event_id=event_id)
             if deleted_count == 0: return {"error": "User is not a participant"}, 404
+            if redis: await admission.release_seat(redis, event_id, target_user_id)
+            await UserService.invalidate_summary(redis, target_user_id)
+            await EventService.invalidate_detail(redis, event_id)
             
             logger.info(f"Participant {target_user_id} removed from Event {event_id} by {user_ctx['sub']}")
             return {"message": "Participant removed"}, 200
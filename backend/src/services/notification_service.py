@@ -1,51 +1,287 @@
-from src.models import Notifications, ClubFollowers
-from tortoise.exceptions import DoesNotExist
+import uuid
+from src.models import Notifications, ClubFollowers, Users
+from tortoise import Tortoise, timezone
+from datetime import datetime
+from tortoise.expressions import Q
+from src import background, jobs, metrics, pagination, realtime
+from src.cache import run_script
+from src.config import logger
+
+FANOUT_CHUNK_SIZE = 1000
+UNREAD_TTL = 86400
+SEED_MARKER_TTL = 30
+SEED_ATTEMPTS = 3
+MARK_READ_MAX_IDS = 500
+
+# Yazan, DB yazısından önce ':pending' sayacını artırır (_begin_unread_change), commit'ten sonra bu betik
+# azaltır. Sayaç yalnızca zaten varsa güncellenir; yoksa ilk okumada DB'den sayılır. Sayaç yokken o sırada
+# sürmekte olan bir sayım varsa işareti silinir: sayım bu değişikliği kaçırmış olabilir, yeniden yapılır.
+_ADJUST_UNREAD_SCRIPT = """
+local touched = 0
+for _, key in ipairs(KEYS) do
+    local pending = key .. ':pending'
+    if tonumber(redis.call('GET', pending) or '0') > 0 then redis.call('DECR', pending) end
+    if redis.call('EXISTS', key) == 1 then
+        local value = redis.call('INCRBY', key, ARGV[1])
+        if value < 0 then redis.call('INCRBY', key, -value) end
+        touched = touched + 1
+    elseif ARGV[1] ~= '0' then
+        redis.call('DEL', key .. ':seed')
+    end
+end
+return touched
+"""
+
+# Sayım başladığından beri işaret silinmediyse (arada biten değişiklik olmadı) ve commit'i sayımla yarışan
+# yazan yoksa (':pending' boş) sayaç kurulur. Aksi halde sayım o yazıyı içerip içermediği bilinemez;
+# sayaç kurulsaydı sonraki INCRBY aynı satırı ikinci kez sayabilirdi.
+_SEED_UNREAD_SCRIPT = """
+local marker = KEYS[1] .. ':seed'
+if redis.call('GET', marker) ~= ARGV[1] then return 0 end
+if tonumber(redis.call('GET', KEYS[1] .. ':pending') or '0') > 0 then return 0 end
+redis.call('DEL', marker)
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3], 'NX')
+return 1
+"""
 
 class NotificationService:
 
     @staticmethod
-    async def create_notification(user_id: int, message: str, club_id: int = None, event_id: int = None):
+    async def create_notification(user_id: int, message: str, club_id: int = None, event_id: int = None, redis=None):
+        await NotificationService._begin_unread_change(redis, [user_id])
         await Notifications.create(
             user_id=user_id, 
             message=message,
             club_id=club_id,
             event_id=event_id
         )
+        await NotificationService._adjust_unread(redis, [user_id], 1)
+        await realtime.publish(redis, [user_id], {"message": message, "club_id": club_id, "event_id": event_id})
+
+    @staticmethod
+    def _unread_key(user_id) -> str:
+        return f"notif:unread:{user_id}"
+
+    @staticmethod
+    async def _begin_unread_change(redis, user_ids):
+        """DB yazısından önce çağrılır; commit'ten sonraki _adjust_unread ile kapanır (çökerse TTL ile düşer)"""
+        if not redis or not user_ids:
+            return
+        async with redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pending = f"{NotificationService._unread_key(user_id)}:pending"
+                pipe.incr(pending)
+                pipe.expire(pending, SEED_MARKER_TTL)
+            await pipe.execute()
+
+    @staticmethod
+    async def _adjust_unread(redis, user_ids, delta: int):
+        if not redis or not user_ids:
+            return
+        keys = [NotificationService._unread_key(u) for u in user_ids]
+        await run_script(redis, _ADJUST_UNREAD_SCRIPT, keys, delta)
+
+    @staticmethod
+    async def get_unread_count(user_id: int, redis=None):
+        if redis:
+            cached = await redis.get(NotificationService._unread_key(user_id))
+            if cached is not None:
+                return {"unread_count": int(cached)}, 200
+
+        if not redis:
+            return {"unread_count": await Notifications.filter(user_id=user_id, is_read=False).count()}, 200
+
+        key = NotificationService._unread_key(user_id)
+        for _ in range(SEED_ATTEMPTS):
+            token = uuid.uuid4().hex
+            await redis.set(f"{key}:seed", token, ex=SEED_MARKER_TTL)
+            count = await Notifications.filter(user_id=user_id, is_read=False).count()
+            if await run_script(redis, _SEED_UNREAD_SCRIPT, [key], token, count, UNREAD_TTL):
+                return {"unread_count": count}, 200
+            metrics.inc("notification_unread_seed_retries_total")
+        # Sürekli yazılan bir kullanıcı: sayı yine doğru, yalnızca önbelleğe alınmaz
+        return {"unread_count": count}, 200
+
+    @staticmethod
+    async def _insert_in_chunks(source_query, table: str, pk: str, where: str, where_params: list,
+                                message: str, club_id: int = None, event_id: int = None,
+                                chunk_size: int = FANOUT_CHUNK_SIZE, label: str = "Fan-out", redis=None,
+                                after_id: int = 0):
+        """
+        Alıcıları birincil anahtar üzerinden parça parça gezer; her parça tek bir
+        INSERT ... SELECT ile yazılır, alıcı satırları Python'a hiç taşınmaz.
+        Bir parça yazılamazsa iş jobs.RetryFrom ile düşer; yeniden deneme after_id'den sürer,
+        yazılmış parçalar tekrar gönderilmez.
+        """
+        conn = Tortoise.get_connection("default")
+        ph = "%s" if conn.capabilities.dialect == "mysql" else "?"
+        sql = (
+            "INSERT INTO notifications (created_at, updated_at, is_deleted, user_id, club_id, event_id, message, is_read) "
+            f"SELECT {ph}, {ph}, 0, user_id, {ph}, {ph}, {ph}, 0 FROM {table} "
+            f"WHERE {where.format(ph=ph)} AND {pk} >= {ph} AND {pk} <= {ph}"
+        )
+
+        sent, last_id = 0, after_id
+        while True:
+            rows = await source_query.filter(**{f"{pk}__gt": last_id}).order_by(pk).limit(chunk_size).values_list(pk, "user_id")
+            if not rows:
+                break
+            first_id, chunk_last_id = rows[0][0], rows[-1][0]
+            user_ids = [user_id for _, user_id in rows]
+            now = timezone.now()
+            try:
+                await NotificationService._begin_unread_change(redis, user_ids)
+                written, _ = await conn.execute_query(
+                    sql, [now, now, club_id, event_id, message, *where_params, first_id, chunk_last_id]
+                )
+            except Exception as e:
+                metrics.inc("notification_fanout_failed_chunks_total")
+                logger.error(f"{label} chunk failed ({pk} {first_id}-{chunk_last_id}), resuming after {last_id}: {str(e)}")
+                raise jobs.RetryFrom(e, after_id=last_id) from e
+            last_id = chunk_last_id
+            sent += written
+            metrics.inc("notification_fanout_rows_total", written)
+
+            # Satırlar yazıldı: sayaç / canlı bildirim hatası parçayı başarısız saymaz (sayaç TTL ile düzelir)
+            try:
+                await NotificationService._adjust_unread(redis, user_ids, 1)
+                await realtime.publish(redis, user_ids, {"message": message, "club_id": club_id, "event_id": event_id})
+            except Exception as e:
+                logger.warning(f"{label} side effects failed ({pk} {first_id}-{chunk_last_id}): {str(e)}")
+            logger.info(f"{label} progress: {sent} notifications written")
+
+        logger.info(f"{label} finished: {sent} sent")
+        return sent
 
     @staticmethod
-    async def notify_followers(club_id: int, club_name: str, event_title: str):
-        followers = await ClubFollowers.filter(club_id=club_id).all()
-        
+    async def notify_followers(club_id: int, club_name: str, event_title: str, event_id: int = None,
+                               chunk_size: int = FANOUT_CHUNK_SIZE, redis=None, after_id: int = 0):
         message = f"📢 '{club_name}' yeni bir etkinlik paylaştı: {event_title}"
-        for f in followers:
-            await Notifications.create(
-                user_id=f.user_id, 
-                message=message,
-                club_id=club_id
+        return await NotificationService._insert_in_chunks(
+            ClubFollowers.filter(club_id=club_id), "club_followers", "id", "club_id = {ph}", [club_id],
+            message, club_id=club_id, event_id=event_id, chunk_size=chunk_size, label=f"Fan-out for Club {club_id}",
+            redis=redis, after_id=after_id
+        )
+
+    @staticmethod
+    def schedule_follower_fanout(club_id: int, club_name: str, event_title: str, event_id: int = None):
+        return background.spawn(
+            NotificationService.notify_followers(club_id, club_name, event_title, event_id),
+            name=f"fanout:club:{club_id}:event:{event_id}"
+        )
+
+    @staticmethod
+    async def send_announcement(message: str, chunk_size: int = FANOUT_CHUNK_SIZE, redis=None, after_id: int = 0):
+        """Aktif tüm kullanıcılara user_id aralıklarıyla set tabanlı duyuru yazar"""
+        return await NotificationService._insert_in_chunks(
+            Users.filter(is_deleted=False), "users", "user_id", "is_deleted = 0", [],
+            f"📢 SİSTEM DUYURUSU: {message}", chunk_size=chunk_size, label="Global announcement", redis=redis,
+            after_id=after_id
+        )
+
+    @staticmethod
+    def _feed_query(user_id: int, is_read: bool, after=None):
+        query = Notifications.filter(user_id=user_id, is_read=is_read)
+        if after:
+            created_at, notif_id = after
+            query = query.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, notification_id__lt=notif_id))
+        return query.order_by("-created_at", "-notification_id")
+
+    @staticmethod
+    async def get_my_notifications(user_id: int, cursor: str = None, limit: int = 20):
+        """
+        Okunmamışlar önce, her grup içinde yeniden eskiye. İki grup ayrı ayrı, tek yönlü keyset
+        taramasıyla okunur: her biri (user_id, is_read, created_at) indeksinde geriye doğru yürür,
+        sıralama için filesort gerekmez ve sayfa derinliği sorgu maliyetini değiştirmez.
+        """
+        is_read, after = False, None
+        if cursor:
+            try:
+                is_read, *after = pagination.decode_cursor(cursor, bool, datetime, int)
+            except ValueError:
+                return {"error": "Invalid cursor"}, 400
+
+        rows = []
+        # Cursor okunmuşlara geçtiyse okunmamış grubu bitmiştir
+        for group_read in ((True,) if is_read else (False, True)):
+            query = NotificationService._feed_query(user_id, group_read, after if group_read == is_read else None)
+            rows += await query.limit(limit + 1 - len(rows)).values(
+                "notification_id", "message", "is_read", "created_at", "club_id", "event_id"
             )
+            if len(rows) > limit:
+                break
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        result_list = [{
+            "id": n["notification_id"],
+            "message": n["message"],
+            "is_read": n["is_read"],
+            "created_at": str(n["created_at"]),
+            "club_id": n["club_id"],
+            "event_id": n["event_id"]
+        } for n in rows]
+
+        page_info = {"limit": limit, "next_cursor": None, "start_cursor": None, "end_cursor": None}
+        if rows:
+            # Toplu okundu işaretlemesi için sayfanın iki ucu (since / before)
+            first, last = rows[0], rows[-1]
+            page_info["start_cursor"] = pagination.encode_cursor(first["is_read"], first["created_at"], first["notification_id"])
+            page_info["end_cursor"] = pagination.encode_cursor(last["is_read"], last["created_at"], last["notification_id"])
+            if has_more:
+                page_info["next_cursor"] = page_info["end_cursor"]
+
+        return {"notifications": result_list, "pagination": page_info}, 200
 
     @staticmethod
-    async def get_my_notifications(user_id: int):
-        notifs = await Notifications.filter(user_id=user_id).order_by("-is_read", "-created_at")
-        result_list = []
-        for n in notifs:
-            result_list.append({
-                "id": n.notification_id,
-                "message": n.message,
-                "is_read": n.is_read,
-                "created_at": str(n.created_at),
-                "club_id": n.club_id if hasattr(n, "club_id") else None,
-                "event_id": n.event_id if hasattr(n, "event_id") else None
-            })
-        
-        return {"notifications": result_list}, 200
-
-    @staticmethod
-    async def mark_as_read(notif_id: int, user_id: int):
-        try:
-            notif = await Notifications.get(notification_id=notif_id, user_id=user_id)
-            notif.is_read = True
-            await notif.save()
+    async def mark_as_read(notif_id: int, user_id: int, redis=None):
+        await NotificationService._begin_unread_change(redis, [user_id])
+        updated = await Notifications.filter(notification_id=notif_id, user_id=user_id, is_read=False).update(is_read=True)
+        await NotificationService._adjust_unread(redis, [user_id], -updated)
+        if updated:
             return {"message": "Marked as read"}, 200
-        except DoesNotExist:
-            return {"error": "Notification not found"}, 404
\ No newline at end of file
+
+        if not await Notifications.exists(notification_id=notif_id, user_id=user_id):
+            return {"error": "Notification not found"}, 404
+        return {"message": "Marked as read"}, 200
+
+    @staticmethod
+    async def mark_many_as_read(user_id: int, ids=None, before: str = None, mark_all: bool = False, redis=None,
+                                since: str = None):
+        """
+        Verilen ID'leri, akışta since ile before arasında (iki uç dahil) gösterilmiş okunmamışları
+        ya da tümünü tek UPDATE ile okundu yapar. Sayfa gösterildikten sonra gelenler aralığa girmez.
+        """
+        query = Notifications.filter(user_id=user_id, is_read=False)
+
+        if ids is not None:
+            if not isinstance(ids, list) or len(ids) > MARK_READ_MAX_IDS:
+                return {"error": f"ids must be a list of at most {MARK_READ_MAX_IDS} items"}, 400
+            try:
+                ids = [int(i) for i in ids]
+            except (TypeError, ValueError):
+                return {"error": "ids must be integers"}, 400
+            query = query.filter(notification_id__in=ids)
+        elif before or since:
+            if not (before and since):
+                return {"error": "before and since must be given together"}, 400
+            try:
+                before_read, before_at, before_id = pagination.decode_cursor(before, bool, datetime, int)
+                since_read, since_at, since_id = pagination.decode_cursor(since, bool, datetime, int)
+            except ValueError:
+                return {"error": "Invalid cursor"}, 400
+            if since_read:
+                # İlk gösterilen bildirim zaten okunmuştu: aralıkta okunmamış yok
+                return {"message": "Marked as read", "updated": 0}, 200
+            query = query.filter(Q(created_at__lt=since_at) | Q(created_at=since_at, notification_id__lte=since_id))
+            if not before_read:
+                query = query.filter(
+                    Q(created_at__gt=before_at) | Q(created_at=before_at, notification_id__gte=before_id)
+                )
+        elif not mark_all:
+            return {"error": "Provide ids, before or all"}, 400
+
+        await NotificationService._begin_unread_change(redis, [user_id])
+        updated = await query.update(is_read=True)
+        await NotificationService._adjust_unread(redis, [user_id], -updated)
+        return {"message": "Marked as read", "updated": updated}, 200
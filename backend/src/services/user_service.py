@@ -1,9 +1,14 @@
+import asyncio
 from src.models import EventParticipation, ParticipationStatus, Users, EventComments, ClubFollowers
 from tortoise.exceptions import DoesNotExist
+from src import cache, mini_profiles, pagination
+from src.config import PROFILE_CACHE_TTL, PROFILE_ACTIVITY_LIMIT
+from src.db_router import replica_read
 
 class UserService:
 
     @staticmethod
+    @replica_read
     async def get_user_history(user_id: int):
         participations = await EventParticipation.filter(
             user_id=user_id, 
@@ -24,54 +29,146 @@ class UserService:
         return {"history": history}, 200
 
     @staticmethod
-    async def get_user_profile(user_id: int):
-        try:
-            user = await Users.get(user_id=user_id)
-            
-            participations = await EventParticipation.filter(user_id=user_id).prefetch_related("event", "event__club")
-            participated_events = [
-                {
-                    "id": p.event.event_id,
-                    "title": p.event.title,
-                    "date": str(p.event.event_date),
-                    "club_name": p.event.club.club_name if p.event.club else "Unknown"
-                } for p in participations if p.event
-            ]
-            
-            followed = await ClubFollowers.filter(user_id=user_id).prefetch_related("club")
-            clubs = [{"id": f.club.club_id, "name": f.club.club_name} for f in followed if f.club]
-            
-            user_comments = await EventComments.filter(user_id=user_id).prefetch_related("event").order_by("-created_at")
-            comments_list = [{
-                "id": c.comment_id,
-                "content": c.content,
-                "event_id": c.event.event_id if c.event else None,
-                "event_title": c.event.title if c.event else "Deleted Event",
-                "created_at": str(c.created_at)
-            } for c in user_comments]
+    def summary_key(user_id) -> str:
+        return f"user:{user_id}:summary"
 
-            return {
-                "profile": {
-                    "id": user.user_id,
-                    "email": user.email,
-                    "full_name": f"{user.first_name} {user.last_name}",
-                    "department": user.department,
-                    "role": user.role,
-                    "profile_photo": user.profile_image,
-                    "bio": user.bio,
-                    "interests": user.interests
-                },
-                "activities": {
-                    "participated_events": participated_events,
-                    "followed_clubs": clubs,
-                    "comments": comments_list
-                }
-            }, 200
-        except DoesNotExist:
+    @staticmethod
+    async def invalidate_summary(redis, *user_ids):
+        """Katılım, takip, yorum ve profil yazımlarından sonra önbellekteki özeti siler"""
+        await cache.invalidate(redis, *[UserService.summary_key(uid) for uid in user_ids])
+
+    @staticmethod
+    async def get_user_profile(user_id: int, redis=None):
+        if not redis:
+            return await UserService._load_profile(user_id)
+        return await cache.get_or_load(
+            redis, UserService.summary_key(user_id), PROFILE_CACHE_TTL, lambda: UserService._load_profile(user_id)
+        )
+
+    @staticmethod
+    async def _load_profile(user_id: int):
+        """Kullanıcı satırı, üç aktivite listesinin ilk sayfaları ve sayımları eşzamanlı sorgulanır"""
+        limit = PROFILE_ACTIVITY_LIMIT
+        user, events, clubs, comments, event_total, club_total, comment_total = await asyncio.gather(
+            Users.filter(user_id=user_id).first().values(
+                "user_id", "email", "first_name", "last_name", "department", "role", "profile_image", "bio", "interests"
+            ),
+            UserService._participations_page(user_id, None, limit),
+            UserService._followed_clubs_page(user_id, None, limit),
+            UserService._comments_page(user_id, None, limit),
+            EventParticipation.filter(user_id=user_id).count(),
+            ClubFollowers.filter(user_id=user_id).count(),
+            EventComments.filter(user_id=user_id).count(),
+        )
+        if not user:
             return {"error": "User not found"}, 404
 
+        def page_info(endpoint, next_cursor, total):
+            return {
+                "total": total,
+                "next_cursor": next_cursor,
+                "next": f"/users/profile/{endpoint}?cursor={next_cursor}&limit={limit}" if next_cursor else None
+            }
+
+        return {
+            "profile": {
+                "id": user["user_id"],
+                "email": user["email"],
+                "full_name": f"{user['first_name']} {user['last_name']}",
+                "department": user["department"],
+                "role": user["role"],
+                "profile_photo": user["profile_image"],
+                "bio": user["bio"],
+                "interests": user["interests"]
+            },
+            "activities": {
+                "participated_events": events[0],
+                "followed_clubs": clubs[0],
+                "comments": comments[0]
+            },
+            "pagination": {
+                "participated_events": page_info("events", events[1], event_total),
+                "followed_clubs": page_info("clubs", clubs[1], club_total),
+                "comments": page_info("comments", comments[1], comment_total)
+            }
+        }, 200
+
+    @staticmethod
+    @replica_read
+    async def get_participations(user_id: int, cursor: str = None, limit: int = 20):
+        try:
+            items, next_cursor = await UserService._participations_page(user_id, cursor, limit)
+        except ValueError:
+            return {"error": "Invalid cursor"}, 400
+        return {"participated_events": items, "pagination": {"limit": limit, "next_cursor": next_cursor}}, 200
+
+    @staticmethod
+    @replica_read
+    async def get_followed_clubs(user_id: int, cursor: str = None, limit: int = 20):
+        try:
+            items, next_cursor = await UserService._followed_clubs_page(user_id, cursor, limit)
+        except ValueError:
+            return {"error": "Invalid cursor"}, 400
+        return {"followed_clubs": items, "pagination": {"limit": limit, "next_cursor": next_cursor}}, 200
+
+    @staticmethod
+    @replica_read
+    async def get_comments(user_id: int, cursor: str = None, limit: int = 20):
+        try:
+            items, next_cursor = await UserService._comments_page(user_id, cursor, limit)
+        except ValueError:
+            return {"error": "Invalid cursor"}, 400
+        return {"comments": items, "pagination": {"limit": limit, "next_cursor": next_cursor}}, 200
+
+    # Sorgu kurucuları ayrı tutulur; tests/test_query_plans.py servislerin çalıştırdığı sorgunun planını denetler
+    @staticmethod
+    def _participations_query(user_id: int, cursor):
+        return pagination.newest_first(EventParticipation.filter(user_id=user_id), cursor, "participation_id")
+
+    @staticmethod
+    def _followed_clubs_query(user_id: int, cursor):
+        return pagination.newest_first(ClubFollowers.filter(user_id=user_id), cursor, "id")
+
+    @staticmethod
+    def _comments_query(user_id: int, cursor):
+        return pagination.newest_first(EventComments.filter(user_id=user_id), cursor, "comment_id")
+
+    @staticmethod
+    async def _participations_page(user_id: int, cursor, limit: int):
+        query = UserService._participations_query(user_id, cursor)
+        rows = await query.limit(limit + 1).values(
+            "participation_id", "created_at", "event_id", "event__title", "event__event_date", "event__club__club_name"
+        )
+        rows, next_cursor = pagination.split_page(rows, limit, "participation_id")
+        return [{
+            "id": r["event_id"],
+            "title": r["event__title"],
+            "date": str(r["event__event_date"]),
+            "club_name": r["event__club__club_name"] or "Unknown"
+        } for r in rows], next_cursor
+
+    @staticmethod
+    async def _followed_clubs_page(user_id: int, cursor, limit: int):
+        query = UserService._followed_clubs_query(user_id, cursor)
+        rows = await query.limit(limit + 1).values("id", "created_at", "club_id", "club__club_name")
+        rows, next_cursor = pagination.split_page(rows, limit, "id")
+        return [{"id": r["club_id"], "name": r["club__club_name"]} for r in rows], next_cursor
+
+    @staticmethod
+    async def _comments_page(user_id: int, cursor, limit: int):
+        query = UserService._comments_query(user_id, cursor)
+        rows = await query.limit(limit + 1).values("comment_id", "content", "created_at", "event_id", "event__title")
+        rows, next_cursor = pagination.split_page(rows, limit, "comment_id")
+        return [{
+            "id": r["comment_id"],
+            "content": r["content"],
+            "event_id": r["event_id"],
+            "event_title": r["event__title"] or "Deleted Event",
+            "created_at": str(r["created_at"])
+        } for r in rows], next_cursor
+
     @staticmethod
-    async def update_profile(user_id: int, data: dict):
+    async def update_profile(user_id: int, data: dict, redis=None):
         try:
             user = await Users.get(user_id=user_id)
             
@@ -86,6 +183,8 @@ class UserService:
             if "profile_photo" in data: user.profile_image = data["profile_photo"]
                 
             await user.save()
+            await UserService.invalidate_summary(redis, user_id)
+            await mini_profiles.invalidate(redis, user_id)
             return {
                 "message": "Profile updated",
                 "profile": {
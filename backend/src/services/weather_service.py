@@ -1,77 +1,188 @@
+import asyncio
+import time
 import aiohttp
-import json
-from src.config import logger
+from src import cache, http_client, metrics, search, serialization
+from src.circuit import CircuitBreaker
+from src.config import (
+    logger, GEOCODING_API_URL, WEATHER_API_URL, GEOCODE_CACHE_TTL,
+    WEATHER_CIRCUIT_FAILURES, WEATHER_CIRCUIT_RESET_SECONDS,
+)
+
+WEATHER_TTL = 900
+WEATHER_STALE_TTL = 300
+# Open-Meteo erişilemezken sunulacak son başarılı ölçüm
+LAST_KNOWN_TTL = 86400
+# Bulunamayan şehirler de kısa süre tutulur; aynı hatalı isim tekrar tekrar sorgulanmaz
+GEOCODE_MISS_TTL = 3600
+# Şehir başına istek sayısı (önceden yükleyici en popüler şehirleri buradan seçer)
+POPULAR_KEY = "weather:popular"
+# Dakikalık üst servis çağrı sayaçları; tüm süreçlerin çağrıları burada toplanır
+UPSTREAM_BUCKET_TTL = 3600
+
+
+class UpstreamError(Exception):
+    pass
+
 
 class WeatherService:
 
+    breaker = CircuitBreaker("open_meteo", WEATHER_CIRCUIT_FAILURES, WEATHER_CIRCUIT_RESET_SECONDS)
+
+    @staticmethod
+    def normalize_city(city: str) -> str:
+        """"İSTANBUL", "istanbul " ve "Istanbul" aynı önbellek anahtarına iner"""
+        return " ".join(search.tokenize(city or "", min_length=1))
+
     @staticmethod
     async def get_current_weather(redis, city: str = "Istanbul"):
-        cache_key = f"weather:{city.lower()}"
-        
-        if redis:
-            cached_data = await redis.get(cache_key)
-            if cached_data:
-                logger.info(f"Weather fetched from Cache for {city}")
-                return json.loads(cached_data), 200
+        city_key = WeatherService.normalize_city(city)
+        if not city_key:
+            return {"error": "City is required"}, 400
+
+        # Aynı şehir için eşzamanlı ıskalar tek bir Open-Meteo çağrısında birleşir; hata yanıtları önbelleğe girmez
+        result, status = await cache.get_or_load(
+            redis, WeatherService.cache_key(city_key), WEATHER_TTL,
+            lambda: WeatherService._fetch_weather(redis, city, city_key), stale_ttl=WEATHER_STALE_TTL
+        )
+        if status >= 500 and redis:
+            last_known = await redis.get(f"weather:last:{city_key}")
+            if last_known:
+                metrics.inc("weather_last_known_served_total")
+                return {"weather": serialization.loads(last_known), "stale": True}, 200
+        return result, status
+
+    @staticmethod
+    def cache_key(city_key: str) -> str:
+        return f"weather:{city_key}"
+
+    @staticmethod
+    def geo_key(city_key: str) -> str:
+        return f"geo:{city_key}"
+
+    @staticmethod
+    async def cached_place(redis, city_key: str):
+        """Önbellekteki geocode sonucu; hiç sorgulanmadıysa ya da şehir bulunamadıysa None"""
+        cached = await redis.get(WeatherService.geo_key(city_key))
+        if cached is None:
+            return None
+        return serialization.loads(cached) or None
+
+    @staticmethod
+    async def refresh_city(redis, city_key: str, place: dict):
+        """Önceden yükleyici için: süresi dolmadan değeri kilit altında yeniler (geocode önbellekten gelir)"""
+        return await cache.refresh(
+            redis, WeatherService.cache_key(city_key),
+            lambda: WeatherService._fetch_weather(redis, place["name"], city_key), WEATHER_TTL, WEATHER_STALE_TTL
+        )
+
+    @staticmethod
+    async def record_request(redis, city: str):
+        city_key = WeatherService.normalize_city(city)
+        if redis and city_key:
+            await redis.zincrby(POPULAR_KEY, 1, city_key)
 
-        headers = {
-            "User-Agent": "CampusHub-Project/1.0 (Student Project; contact@example.com)"
+    @staticmethod
+    async def popular_cities(redis, limit: int):
+        return await redis.zrevrange(POPULAR_KEY, 0, limit - 1)
+
+    @staticmethod
+    async def _count_upstream_call(redis, kind: str):
+        metrics.inc(f"weather_upstream_{kind}_calls_total")
+        if not redis:
+            return
+        bucket = f"weather:upstream:{int(time.time() // 60)}"
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hincrby(bucket, kind, 1)
+            pipe.expire(bucket, UPSTREAM_BUCKET_TTL)
+            await pipe.execute()
+
+    @staticmethod
+    async def upstream_stats(redis, minutes: int = 15):
+        """Son dakikalardaki Open-Meteo çağrıları (kullanıcı istekleri ve önceden yükleme birlikte)"""
+        now_minute = int(time.time() // 60)
+        async with redis.pipeline(transaction=False) as pipe:
+            for minute in range(now_minute - minutes + 1, now_minute + 1):
+                pipe.hgetall(f"weather:upstream:{minute}")
+            buckets = await pipe.execute()
+        totals = {"geocode": 0, "forecast": 0}
+        for bucket in buckets:
+            for kind, count in bucket.items():
+                totals[kind] = totals.get(kind, 0) + int(count)
+        return {
+            "window_minutes": minutes,
+            "calls": totals,
+            "calls_per_minute": round(sum(totals.values()) / minutes, 2),
         }
 
+    @staticmethod
+    async def _geocode(redis, city: str, city_key: str):
+        """{"name", "latitude", "longitude"}; şehir bulunamazsa boş dict"""
+        geo_key = WeatherService.geo_key(city_key)
+        if redis:
+            cached = await redis.get(geo_key)
+            if cached is not None:
+                return serialization.loads(cached)
+
+        params = {"name": city.strip(), "count": 1, "language": "tr", "format": "json"}
+        await WeatherService._count_upstream_call(redis, "geocode")
+        async with http_client.get_session().get(GEOCODING_API_URL, params=params) as geo_resp:
+            if geo_resp.status != 200:
+                raise UpstreamError(f"Geo API Error: {geo_resp.status}")
+            geo_data = await geo_resp.json()
+
+        results = geo_data.get("results")
+        place = {}
+        if results:
+            place = {"name": results[0]["name"], "latitude": results[0]["latitude"], "longitude": results[0]["longitude"]}
+        if redis:
+            await redis.set(geo_key, serialization.dumps(place), ex=GEOCODE_CACHE_TTL if place else GEOCODE_MISS_TTL)
+        return place
+
+    @staticmethod
+    async def _fetch_weather(redis, city: str, city_key: str):
+        breaker = WeatherService.breaker
+        if not breaker.allow():
+            metrics.inc("weather_circuit_rejected_total")
+            return {"error": "Weather service unavailable"}, 503
+
         try:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                
-                geo_url = f"https://geocoding-api.open-meteo.com/v1/search?name={city}&count=1&language=tr&format=json"
-                
-                async with session.get(geo_url, headers=headers) as geo_resp:
-                    if geo_resp.status != 200:
-                        logger.error(f"Geo API Error: {geo_resp.status}")
-                        return {"error": "Geocoding service unavailable"}, 503
-                    
-                    geo_data = await geo_resp.json()
-                    
-                    if not geo_data.get("results"):
-                        return {"error": "City not found"}, 404
-                        
-                    lat = geo_data["results"][0]["latitude"]
-                    lon = geo_data["results"][0]["longitude"]
-                    city_name = geo_data["results"][0]["name"]
-
-                weather_url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
-                
-                async with session.get(weather_url, headers=headers) as weather_resp:
-                    if weather_resp.status != 200:
-                        logger.error(f"Weather API Error: {weather_resp.status}")
-                        return {"error": "Weather service unavailable"}, 503
-                        
-                    w_data = await weather_resp.json()
-                    current = w_data.get("current_weather", {})
-
-                    weather_code = current.get("weathercode", 0)
-                    description = WeatherService.get_weather_desc(weather_code)
-
-                    weather_info = {
-                        "city": city_name,
-                        "temperature": current.get("temperature"),
-                        "wind_speed": current.get("windspeed"),
-                        "description": description,
-                        "latitude": lat,
-                        "longitude": lon
-                    }
-
-                    if redis:
-                        await redis.set(cache_key, json.dumps(weather_info), ex=900)
-                    
-                    logger.info(f"Weather fetched from Open-Meteo for {city}")
-                    return {"weather": weather_info}, 200
-
-        except aiohttp.ClientConnectorError as e:
-            logger.error(f"Connection Error: {str(e)}")
-            return {"error": "Internet connection failed inside Docker"}, 500
+            place = await WeatherService._geocode(redis, city, city_key)
+            if not place:
+                breaker.record_success()
+                return {"error": "City not found"}, 404
+
+            params = {"latitude": place["latitude"], "longitude": place["longitude"], "current_weather": "true"}
+            await WeatherService._count_upstream_call(redis, "forecast")
+            async with http_client.get_session().get(WEATHER_API_URL, params=params) as weather_resp:
+                if weather_resp.status != 200:
+                    raise UpstreamError(f"Weather API Error: {weather_resp.status}")
+                w_data = await weather_resp.json()
+        except (UpstreamError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            breaker.record_failure()
+            logger.error(f"Weather upstream failed for {city}: {str(e) or type(e).__name__}")
+            return {"error": "Weather service unavailable"}, 503
         except Exception as e:
+            breaker.record_failure()
             logger.error(f"Weather Service General Error: {str(e)}")
             return {"error": f"Service Error: {str(e)}"}, 500
 
+        breaker.record_success()
+        current = w_data.get("current_weather", {})
+        weather_code = current.get("weathercode", 0)
+        weather_info = {
+            "city": place["name"],
+            "temperature": current.get("temperature"),
+            "wind_speed": current.get("windspeed"),
+            "description": WeatherService.get_weather_desc(weather_code),
+            "latitude": place["latitude"],
+            "longitude": place["longitude"]
+        }
+        if redis:
+            await redis.set(f"weather:last:{city_key}", serialization.dumps(weather_info), ex=LAST_KNOWN_TTL)
+
+        logger.info(f"Weather fetched from Open-Meteo for {city}")
+        return {"weather": weather_info}, 200
+
     @staticmethod
     def get_weather_desc(code):
         codes = {
@@ -80,4 +191,4 @@ class WeatherService:
             55: "Yoğun Çiseleme", 61: "Hafif Yağmur", 63: "Yağmur", 65: "Şiddetli Yağmur",
             71: "Hafif Kar", 73: "Kar Yağışlı", 75: "Yoğun Kar", 95: "Fırtına"
         }
-        return codes.get(code, "Bilinmiyor")
\ No newline at end of file
+        return codes.get(code, "Bilinmiyor")
@@ -0,0 +1,29 @@
+from src import cache
+from src.jobs import job
+from src.reconcile import reconcile_counters
+from src.services.event_service import EventService
+from src.services.notification_service import NotificationService
+
+
+@job("notify_followers")
+async def notify_followers(redis, club_id: int, club_name: str, event_title: str, event_id: int = None,
+                           after_id: int = 0):
+    await NotificationService.notify_followers(club_id, club_name, event_title, event_id, redis=redis, after_id=after_id)
+
+
+@job("send_announcement")
+async def send_announcement(redis, message: str, after_id: int = 0):
+    await NotificationService.send_announcement(message, redis=redis, after_id=after_id)
+
+
+@job("reconcile_counters")
+async def reconcile(redis, batch_size: int = 500):
+    await reconcile_counters(batch_size)
+
+
+@job("rebuild_events_cache")
+async def rebuild_events_cache(redis, pages: int = 3, limit: int = 20):
+    """Yeni nesle geçip ilk sayfaları önceden ısıtır; kullanıcı istekleri soğuk önbelleğe düşmez"""
+    await cache.bump_generation(redis, cache.EVENTS_NAMESPACE)
+    for page in range(1, pages + 1):
+        await EventService.get_events(redis, page, limit)
@@ -0,0 +1,46 @@
+import argparse
+import asyncio
+import signal
+from redis import asyncio as aioredis
+from src.config import REDIS_URL, JOB_WORKER_CONCURRENCY, logger
+from src.database import init_db, warm_pools, close_db
+from src.boot import BootTimer
+from src.jobs import Worker
+from src import http_client
+from src.prefetch import WeatherPrefetcher
+import src.tasks  # noqa: F401  (iş tanımlarını kaydeder)
+
+
+async def main(concurrency: int):
+    timer = BootTimer("Job worker")
+    with timer.phase("db_init"):
+        await init_db()
+    with timer.phase("db_pool"):
+        await warm_pools()
+    with timer.phase("redis"):
+        redis = aioredis.from_url(REDIS_URL, decode_responses=True)
+    timer.log()
+    worker = Worker(redis, concurrency=concurrency)
+    prefetcher = WeatherPrefetcher(redis)
+
+    def stop():
+        worker.stop()
+        prefetcher.stop()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop)
+
+    try:
+        await asyncio.gather(worker.run(), prefetcher.run())
+    finally:
+        await close_db()
+        await http_client.close_http_session()
+        await redis.close()
+        logger.info("Worker connections closed.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CampusHub background job worker")
+    parser.add_argument("--concurrency", type=int, default=JOB_WORKER_CONCURRENCY)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency))
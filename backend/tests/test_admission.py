@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from fakeredis import FakeAsyncRedis
+from tortoise import Tortoise
+from src.models import Users, Clubs, Events, EventParticipation, ParticipationStatus, UserRole
+from src.services.event_service import EventService
+from src.config import TORTOISE_ORM
+from src import admission
+from datetime import datetime, timedelta
+
+@pytest_asyncio.fixture(autouse=True)
+async def setup_test_db():
+    await Tortoise.init(config=TORTOISE_ORM)
+    await Tortoise.generate_schemas(safe=True)
+    yield
+    await Tortoise.close_connections()
+
+async def _make_event(quota, user_count):
+    await Users.bulk_create([
+        Users(user_id=10000 + i, email=f"u{i}@campus.hub", password="x", first_name="U", last_name=str(i))
+        for i in range(user_count)
+    ])
+    club = await Clubs.create(club_name="Kalabalık Kulüp", status="active")
+    return await Events.create(
+        title="Konser", event_date=datetime.now() + timedelta(days=3), club=club, quota=quota
+    )
+
+def _ctx(user_id):
+    return {"sub": user_id, "role": UserRole.STUDENT}
+
+@pytest.mark.asyncio
+async def test_concurrent_joins_never_exceed_quota():
+    quota, users = 150, 2000
+    event = await _make_event(quota, users)
+    redis = FakeAsyncRedis(decode_responses=True)
+
+    results = await asyncio.gather(*[
+        EventService.join_event(_ctx(10000 + i), event.event_id, redis) for i in range(users)
+    ])
+
+    joined = [r for r, status in results if status == 200]
+    full = [r for r, status in results if r.get("error") == "Event is full"]
+    assert len(joined) == quota
+    assert len(full) == users - quota
+    assert await EventParticipation.filter(event_id=event.event_id).count() == quota
+    assert await admission.seat_count(redis, event.event_id) == quota
+
+@pytest.mark.asyncio
+async def test_leave_gives_seat_back_and_cold_start_rebuilds():
+    event = await _make_event(1, 3)
+    redis = FakeAsyncRedis(decode_responses=True)
+
+    assert (await EventService.join_event(_ctx(10000), event.event_id, redis))[1] == 200
+    assert (await EventService.join_event(_ctx(10000), event.event_id, redis))[0] == {"message": "Already joined"}
+    assert (await EventService.join_event(_ctx(10001), event.event_id, redis))[0] == {"error": "Event is full"}
+
+    await EventService.leave_event(_ctx(10000), event.event_id, redis)
+    assert (await EventService.join_event(_ctx(10001), event.event_id, redis))[1] == 200
+
+    # Redis'in boşaldığı durumda sayaç veritabanından geri kurulmalı
+    await redis.flushall()
+    assert (await EventService.join_event(_ctx(10002), event.event_id, redis))[0] == {"error": "Event is full"}
+    assert await EventParticipation.filter(
+        event_id=event.event_id, status=ParticipationStatus.GOING
+    ).count() == 1
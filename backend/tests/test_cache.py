@@ -0,0 +1,114 @@
+import asyncio
+import time
+import pytest
+from fakeredis import FakeAsyncRedis
+from src import background, cache, serialization
+from src.serialization import RawJSON
+
+class CountingLoader:
+    def __init__(self, delay=0.05, status=200):
+        self.calls = 0
+        self.delay = delay
+        self.status = status
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"version": self.calls}, self.status
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    redis = FakeAsyncRedis(decode_responses=True)
+    loader = CountingLoader()
+
+    results = await asyncio.gather(*[cache.get_or_load(redis, "k", 60, loader) for _ in range(50)])
+
+    assert loader.calls == 1
+    assert all(result == ({"version": 1}, 200) for result in results)
+    hit, status = await cache.get_or_load(redis, "k", 60, loader)
+    assert isinstance(hit, RawJSON) and hit["version"] == 1 and status == 200
+    assert not await redis.exists(cache._lock_key("k"))
+
+@pytest.mark.asyncio
+async def test_waits_for_other_worker_holding_the_lock(monkeypatch):
+    redis = FakeAsyncRedis(decode_responses=True)
+    loader = CountingLoader()
+    await redis.set(cache._lock_key("k"), "other-worker", px=cache.LOCK_TTL_MS)
+
+    async def other_worker_finishes():
+        await asyncio.sleep(0.1)
+        await cache._store(redis, "k", {"version": "other"}, 60, 0, 0.1)
+
+    result, _ = (await asyncio.gather(cache.get_or_load(redis, "k", 60, loader), other_worker_finishes()))[0]
+    assert result["version"] == "other"
+    assert loader.calls == 0
+
+    # Kilit sahibi sonuç yazmadan kaybolursa kısa beklemeden sonra yerel yüklemeye düşülür
+    monkeypatch.setattr(cache, "LOCK_WAIT_SECONDS", 0.1)
+    await redis.set(cache._lock_key("k2"), "stuck-worker", px=cache.LOCK_TTL_MS)
+    result, _ = await cache.get_or_load(redis, "k2", 60, loader)
+    assert result == {"version": 1}
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_refreshing():
+    redis = FakeAsyncRedis(decode_responses=True)
+    loader = CountingLoader()
+    body = serialization.dumps({"version": 0})
+    await redis.set("k", f"{time.time() - 1:.3f}|0.01|".encode() + body, ex=60)
+
+    stale, status = await cache.get_or_load(redis, "k", 60, loader, stale_ttl=30)
+    assert stale["version"] == 0 and status == 200
+    await background.drain()
+
+    fresh, _ = await cache.get_or_load(redis, "k", 60, loader, stale_ttl=30)
+    assert fresh["version"] == 1
+    assert loader.calls == 1
+    assert 60 < await redis.ttl("k") <= 90
+
+@pytest.mark.asyncio
+async def test_probabilistic_early_refresh_and_errors_not_cached():
+    redis = FakeAsyncRedis(decode_responses=True)
+    loader = CountingLoader(delay=0.01)
+    await cache.get_or_load(redis, "k", 60, loader)
+    # Çok büyük beta: bitişe daha 60 saniye varken yenileme tetiklenir
+    cached, _ = await cache.get_or_load(redis, "k", 60, loader, beta=1e9)
+    assert cached["version"] == 1
+    await background.drain()
+    assert loader.calls == 2
+
+    failing = CountingLoader(delay=0, status=503)
+    assert (await cache.get_or_load(redis, "err", 60, failing))[1] == 503
+    assert (await cache.get_or_load(redis, "err", 60, failing))[1] == 503
+    assert failing.calls == 2 and not await redis.exists("err")
+
+@pytest.mark.asyncio
+async def test_unparseable_value_is_treated_as_miss():
+    redis = FakeAsyncRedis(decode_responses=True)
+    loader = CountingLoader(delay=0)
+    # Eski biçimde (düz JSON) ya da bozuk yazılmış değerler 500 yerine ıskalama sayılır
+    await redis.set("k", '{"version": "legacy"}')
+
+    assert await cache.expires_in(redis, "k") is None
+    assert not await redis.exists("k")
+
+    await redis.set("k", "garbage|x|{}")
+    assert await cache.get_or_load(redis, "k", 60, loader) == ({"version": 1}, 200)
+    assert loader.calls == 1
+    assert 0 < await cache.expires_in(redis, "k") <= 60
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_is_not_overwritten_by_stale_result():
+    redis = FakeAsyncRedis(decode_responses=True)
+    versions = iter(["eski", "yeni"])
+
+    async def loader():
+        # Yükleme satırları okuduktan sonra bir yazı commit edip anahtarı geçersiz kılar
+        value = next(versions)
+        if value == "eski":
+            await cache.invalidate(redis, "k")
+        return {"value": value}, 200
+
+    assert await cache.get_or_load(redis, "k", 60, loader) == ({"value": "eski"}, 200)
+    assert not await redis.exists("k")
+    assert (await cache.get_or_load(redis, "k", 60, loader))[0] == {"value": "yeni"}
+    assert (await cache.get_or_load(redis, "k", 60, loader))[0]["value"] == "yeni"
@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+from tortoise.exceptions import DBConnectionError
+from src import config, metrics
+from src.db_pool import InstrumentedMySQLClient, InstrumentedPool
+
+class FakePool:
+    """aiomysql.Pool'un InstrumentedPool'un kullandığı kısmı"""
+
+    def __init__(self, maxsize):
+        self.minsize = 1
+        self.maxsize = maxsize
+        self._used = set()
+        self._free = asyncio.Queue()
+        for i in range(maxsize):
+            self._free.put_nowait(i)
+
+    @property
+    def size(self):
+        return len(self._used) + self._free.qsize()
+
+    @property
+    def freesize(self):
+        return self._free.qsize()
+
+    async def acquire(self):
+        conn = await self._free.get()
+        self._used.add(conn)
+        return conn
+
+    def release(self, conn):
+        self._used.discard(conn)
+        self._free.put_nowait(conn)
+
+def test_mysql_url_gets_pool_settings():
+    conn = config._db_connection("mysql://hub:secret@db:3306/campushub")
+    assert conn["engine"] == "src.db_pool"
+    creds = conn["credentials"]
+    assert (creds["host"], creds["database"]) == ("db", "campushub")
+    assert creds["maxsize"] == config.DB_POOL_MAX_SIZE
+    assert creds["pool_recycle"] == config.DB_POOL_RECYCLE_SECONDS
+    assert creds["acquire_timeout"] == config.DB_POOL_ACQUIRE_TIMEOUT
+    assert config._db_connection("sqlite://:memory:") == "sqlite://:memory:"
+
+def test_client_keeps_acquire_timeout_out_of_aiomysql_kwargs():
+    client = InstrumentedMySQLClient(
+        connection_name="default", host="db", port=3306, user="u", password="p", database="d",
+        minsize=2, maxsize=8, pool_recycle=60, acquire_timeout=3,
+    )
+    assert client.acquire_timeout == 3.0
+    assert "acquire_timeout" not in client.extra
+    assert (client.pool_minsize, client.pool_maxsize, client.extra["pool_recycle"]) == (2, 8, 60)
+
+@pytest.mark.asyncio
+async def test_pool_gauges_and_acquire_timeout():
+    metrics.reset()
+    pool = InstrumentedPool(FakePool(maxsize=2), acquire_timeout=0.05)
+    first = await pool.acquire()
+    await pool.acquire()
+    assert pool.stats() == {"size": 2, "min_size": 1, "max_size": 2, "in_use": 2, "idle": 0, "waiting": 0}
+
+    # Havuz dolu: üçüncü istek bekler, süre dolunca DB hatasına dönüşür
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+    assert pool.stats()["waiting"] == 1
+    with pytest.raises(DBConnectionError):
+        await waiter
+    assert pool.stats()["waiting"] == 0
+
+    pool.release(first)
+    assert pool.stats()["idle"] == 1
+    await pool.acquire()
+
+    snap = metrics.snapshot()
+    assert snap["counters"]["db_pool_acquire_timeouts_total"] == 1
+    assert snap["histograms"]["db_pool_acquire_seconds"]["count"] == 3
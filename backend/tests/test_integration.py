@@ -4,10 +4,13 @@ from tortoise import Tortoise
 from src.models import Users, UserRole, Clubs, ClubFollowers, Events, EventParticipation, ParticipationStatus
 from src.security import hash_password
 from src.config import TORTOISE_ORM
+from src import background, mini_profiles, serialization
+from src.serialization import RawJSON, respond
 from datetime import datetime, timedelta
 
 @pytest_asyncio.fixture(autouse=True)
 async def setup_test_db():
+    mini_profiles.clear_local()
     await Tortoise.init(config=TORTOISE_ORM)
     await Tortoise.generate_schemas(safe=True)
     yield
@@ -71,4 +74,553 @@ async def test_event_participation_integration():
     await participation.delete()
     await event.delete()
     await club.delete()
-    await user.delete()
\ No newline at end of file
+    await user.delete()
+
+@pytest.mark.asyncio
+async def test_denormalized_counters_and_reconciliation():
+    """Sayaçların işlemlerle güncellenmesini ve sapmanın onarılmasını test eder."""
+    from src.services.event_service import EventService
+    from src.services.club_service import ClubService
+    from src.services.comment_service import CommentService
+    from src.reconcile import reconcile_counters
+
+    student = await Users.create(
+        user_id=555, email="counter_test@campus.hub",
+        password="x", first_name="Sayac", last_name="Test", role=UserRole.STUDENT
+    )
+    club = await Clubs.create(club_name="Sayaç Kulübü", status="active")
+    event = await Events.create(
+        title="Sayaç Etkinliği", event_date=datetime.now() + timedelta(days=2), club=club, quota=10
+    )
+    ctx = {"sub": student.user_id, "role": UserRole.STUDENT}
+
+    await EventService.join_event(ctx, event.event_id)
+    await ClubService.follow_club(ctx, club.club_id)
+    await CommentService.add_comment(ctx, event.event_id, "Harika!")
+
+    await event.refresh_from_db()
+    await club.refresh_from_db()
+    assert (event.participant_count, event.comment_count, club.follower_count) == (1, 1, 1)
+
+    await EventService.leave_event(ctx, event.event_id)
+    await ClubService.leave_club(ctx, club.club_id)
+    await event.refresh_from_db()
+    await club.refresh_from_db()
+    assert (event.participant_count, club.follower_count) == (0, 0)
+
+    await Events.filter(event_id=event.event_id).update(participant_count=42, comment_count=0)
+    repaired = await reconcile_counters(batch_size=1)
+    await event.refresh_from_db()
+    assert repaired == {"events": 1, "clubs": 0}
+    assert (event.participant_count, event.comment_count) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_event_cursor_pagination_matches_offset_order():
+    """Cursor modu, sayfa modu ile aynı sırayı tekrarsız vermeli."""
+    from src.services.event_service import EventService
+
+    club = await Clubs.create(club_name="Sayfalama Kulübü", status="active")
+    same_day = datetime.now() + timedelta(days=1)
+    for i in range(7):
+        # Aynı tarihli etkinlikler event_id ile ayrışmalı
+        await Events.create(title=f"Etkinlik {i}", event_date=same_day if i < 4 else same_day + timedelta(hours=i), club=club)
+
+    by_page, _ = await EventService.get_events(None, page=1, limit=10)
+    expected = [e["id"] for e in by_page["events"]]
+
+    seen, cursor = [], None
+    while True:
+        result, status = await EventService.get_events_by_cursor(None, cursor, limit=3, with_total=True)
+        assert status == 200
+        assert result["pagination"]["approximate_total"] == 7
+        seen += [e["id"] for e in result["events"]]
+        cursor = result["pagination"]["next_cursor"]
+        if not cursor:
+            break
+    assert seen == expected
+
+    _, status = await EventService.get_events_by_cursor(None, "bozuk-cursor")
+    assert status == 400
+
+
+@pytest.mark.asyncio
+async def test_event_listing_cache_invalidated_by_generation_bump():
+    """Etkinlik oluşturma, önbellekteki liste sayfalarını anında geçersiz kılmalı."""
+    from fakeredis import FakeAsyncRedis
+    from src.services.event_service import EventService
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    await Users.create(user_id=444, email="cache_test@campus.hub", password="x", first_name="A", last_name="B")
+    club = await Clubs.create(club_name="Önbellek Kulübü", status="active")
+    admin = {"sub": 444, "role": UserRole.ADMIN}
+    data = {"club_id": club.club_id, "title": "İlk", "date": datetime.now() + timedelta(days=1), "capacity": 5}
+
+    await EventService.create_event(admin, data, redis)
+    first, _ = await EventService.get_events(redis)
+    assert first["pagination"]["total"] == 1
+
+    await Events.create(title="Gizli", event_date=datetime.now(), club=club)
+    cached, _ = await EventService.get_events(redis)
+    assert cached["pagination"]["total"] == 1
+
+    # İsabette gövde parse edilmeden, olduğu gibi yanıta yazılır
+    assert isinstance(cached, RawJSON)
+    response = respond(cached, 200)
+    assert response.body == cached.body
+    assert response.content_type == "application/json"
+    assert respond(first, 200).body == serialization.dumps(first)
+
+    await EventService.create_event(admin, {**data, "title": "İkinci"}, redis)
+    fresh, _ = await EventService.get_events(redis)
+    assert fresh["pagination"]["total"] == 3
+    await background.drain()
+
+
+
+@pytest.mark.asyncio
+async def test_follower_fanout_runs_in_background_in_chunks():
+    """Etkinlik oluşturma, bildirimleri beklemeden dönmeli; fan-out arka planda parça parça yazmalı."""
+    from src.models import Notifications
+    from src.services.event_service import EventService
+    from src.services.notification_service import NotificationService
+
+    president = await Users.create(user_id=333, email="fanout@campus.hub", password="x", first_name="B", last_name="K")
+    club = await Clubs.create(club_name="Fan-out Kulübü", status="active", president=president)
+    await Users.bulk_create([
+        Users(user_id=20000 + i, email=f"f{i}@campus.hub", password="x", first_name="T", last_name=str(i))
+        for i in range(25)
+    ])
+    await ClubFollowers.bulk_create([ClubFollowers(user_id=20000 + i, club_id=club.club_id) for i in range(25)])
+
+    data = {"club_id": club.club_id, "title": "Tanışma", "date": datetime.now() + timedelta(days=1), "capacity": 5}
+    result, status = await EventService.create_event({"sub": 333, "role": UserRole.CLUB_ADMIN}, data)
+    assert status == 201
+    await background.drain()
+    assert await Notifications.filter(event_id=result["event_id"]).count() == 25
+
+    sent = await NotificationService.notify_followers(club.club_id, club.club_name, "Tekrar", chunk_size=10)
+    assert sent == 25
+    assert await Notifications.filter(user_id=20024, club_id=club.club_id).count() == 2
+    latest = await Notifications.filter(user_id=20024).order_by("-notification_id").first()
+    assert latest.message.endswith("Tekrar") and latest.is_read is False
+
+
+@pytest.mark.asyncio
+async def test_global_announcement_is_set_based_and_skips_banned_users():
+    """Duyuru, yasaklı kullanıcıları atlayarak parça parça INSERT ... SELECT ile yazılmalı."""
+    from src.models import Notifications
+    from src.services.admin_service import AdminService
+    from src.services.notification_service import NotificationService
+
+    await Users.bulk_create([
+        Users(user_id=30000 + i, email=f"a{i}@campus.hub", password="x", first_name="D", last_name=str(i),
+              is_deleted=(i % 5 == 0))
+        for i in range(23)
+    ])
+
+    sent = await NotificationService.send_announcement("Sınav haftası", chunk_size=4)
+    assert sent == 18
+    assert await Notifications.filter(user_id=30000).count() == 0
+    assert await Notifications.filter(message="📢 SİSTEM DUYURUSU: Sınav haftası").count() == 18
+
+    result, status = await AdminService.send_global_announcement("Bahar şenliği")
+    assert status == 202
+    await background.drain()
+    assert await Notifications.filter(message__contains="Bahar şenliği").count() == 18
+
+
+@pytest.mark.asyncio
+async def test_unread_notification_counter():
+    """Okunmamış sayacı Redis'ten okunmalı, oluşturma ve okuma ile güncellenmeli."""
+    from fakeredis import FakeAsyncRedis
+    from src.models import Notifications
+    from src.services.notification_service import NotificationService
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    user = await Users.create(user_id=222, email="unread@campus.hub", password="x", first_name="O", last_name="K")
+    await NotificationService.create_notification(user.user_id, "Eski bildirim")
+
+    # İlk okuma DB'den sayar ve Redis'e yazar
+    assert (await NotificationService.get_unread_count(user.user_id, redis))[0] == {"unread_count": 1}
+    await NotificationService.create_notification(user.user_id, "Yeni bildirim", redis=redis)
+    await NotificationService.send_announcement("Duyuru", redis=redis)
+    assert await redis.get("notif:unread:222") == "3"
+
+    first = await Notifications.filter(user_id=user.user_id).first()
+    await NotificationService.mark_as_read(first.notification_id, user.user_id, redis)
+    await NotificationService.mark_as_read(first.notification_id, user.user_id, redis)
+    assert (await NotificationService.get_unread_count(user.user_id, redis))[0] == {"unread_count": 2}
+    assert (await NotificationService.mark_as_read(999999, user.user_id, redis))[1] == 404
+
+
+@pytest.mark.asyncio
+async def test_unread_counter_seed_retries_when_notification_arrives_during_count(monkeypatch):
+    """Sayım ile sayacın kurulması arasında gelen bildirim kaybolmamalı."""
+    from fakeredis import FakeAsyncRedis
+    from src.models import Notifications
+    from src.services import notification_service
+    from src.services.notification_service import NotificationService
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    await Users.create(user_id=223, email="race@campus.hub", password="x", first_name="R", last_name="C")
+    await NotificationService.create_notification(223, "Eski bildirim")
+    arrivals = ["Sayım sırasında gelen"]
+
+    class RacingQuery:
+        def __init__(self, query):
+            self.query = query
+
+        async def count(self):
+            counted = await self.query.count()
+            if arrivals:
+                await NotificationService.create_notification(223, arrivals.pop(), redis=redis)
+            return counted
+
+    class RacingNotifications:
+        create = Notifications.create
+
+        @staticmethod
+        def filter(**kwargs):
+            return RacingQuery(Notifications.filter(**kwargs))
+
+    monkeypatch.setattr(notification_service, "Notifications", RacingNotifications)
+    assert (await NotificationService.get_unread_count(223, redis))[0] == {"unread_count": 2}
+    assert await redis.get("notif:unread:223") == "2"
+
+
+@pytest.mark.asyncio
+async def test_unread_counter_not_double_counted_when_seed_runs_between_commit_and_adjust():
+    """Commit sayımdan önce, sayaç güncellemesi kurulumdan sonra gelirse değişiklik iki kez sayılmamalı."""
+    from fakeredis import FakeAsyncRedis
+    from src.models import Notifications
+    from src.services.notification_service import NotificationService
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    await Users.create(user_id=224, email="order@campus.hub", password="x", first_name="S", last_name="R")
+    await NotificationService.create_notification(224, "Eski bildirim")
+
+    # Yazan commit etti, sayaç güncellemesi henüz gelmedi; bu arada sayım yapılır
+    await NotificationService._begin_unread_change(redis, [224])
+    await Notifications.create(user_id=224, message="Yeni bildirim")
+    assert (await NotificationService.get_unread_count(224, redis))[0] == {"unread_count": 2}
+    await NotificationService._adjust_unread(redis, [224], 1)
+    assert (await NotificationService.get_unread_count(224, redis))[0] == {"unread_count": 2}
+    assert await redis.get("notif:unread:224") == "2"
+
+    # Okundu işaretlemesi ters yönde aynı sırayla
+    await redis.delete("notif:unread:224")
+    await NotificationService._begin_unread_change(redis, [224])
+    await Notifications.filter(user_id=224, message="Yeni bildirim").update(is_read=True)
+    assert (await NotificationService.get_unread_count(224, redis))[0] == {"unread_count": 1}
+    await NotificationService._adjust_unread(redis, [224], -1)
+    assert (await NotificationService.get_unread_count(224, redis))[0] == {"unread_count": 1}
+    assert await redis.get("notif:unread:224") == "1"
+
+
+@pytest.mark.asyncio
+async def test_notification_feed_cursor_and_bulk_mark_read():
+    """Akış okunmamışları önce vermeli, cursor ile tekrarsız ilerlemeli; toplu okundu tek UPDATE olmalı."""
+    from src.models import Notifications
+    from src.services.notification_service import NotificationService
+
+    user = await Users.create(user_id=111, email="feed@campus.hub", password="x", first_name="A", last_name="K")
+    base = datetime.now()
+    await Notifications.bulk_create([
+        Notifications(user_id=111, message=f"n{i}", is_read=(i % 3 == 0)) for i in range(10)
+    ])
+    for n in await Notifications.filter(user_id=111):
+        await Notifications.filter(notification_id=n.notification_id).update(
+            created_at=base - timedelta(minutes=n.notification_id)
+        )
+
+    seen, cursor = [], None
+    while True:
+        page, status = await NotificationService.get_my_notifications(111, cursor, limit=3)
+        assert status == 200
+        seen += page["notifications"]
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor:
+            break
+    assert len({n["id"] for n in seen}) == 10
+    assert [n["is_read"] for n in seen] == [False] * 6 + [True] * 4
+
+    first_page, _ = await NotificationService.get_my_notifications(111, None, limit=2)
+    # Sayfa gösterildikten sonra gelen bildirim aralığa girmemeli
+    await Notifications.create(user_id=111, message="yeni", created_at=base + timedelta(minutes=1))
+    page_info = first_page["pagination"]
+    assert (await NotificationService.mark_many_as_read(111, before=page_info["end_cursor"]))[1] == 400
+    result, _ = await NotificationService.mark_many_as_read(
+        111, before=page_info["end_cursor"], since=page_info["start_cursor"]
+    )
+    assert result["updated"] == 2
+    result, _ = await NotificationService.mark_many_as_read(111, ids=[seen[2]["id"], seen[-1]["id"]])
+    assert result["updated"] == 1
+    result, _ = await NotificationService.mark_many_as_read(111, mark_all=True)
+    assert result["updated"] == 4
+    assert await Notifications.filter(user_id=111, is_read=False).count() == 0
+
+@pytest.mark.asyncio
+async def test_profile_summary_caps_lists_and_is_invalidated_by_activity(monkeypatch):
+    """Profil listeleri sınırlı gelmeli, devamı cursor ile alınmalı; aktivite yazımı özeti silmeli."""
+    from fakeredis import FakeAsyncRedis
+    from src.models import EventComments
+    from src.services import user_service
+    from src.services.user_service import UserService
+    from src.services.comment_service import CommentService
+
+    monkeypatch.setattr(user_service, "PROFILE_ACTIVITY_LIMIT", 2)
+    redis = FakeAsyncRedis(decode_responses=True)
+    await Users.create(user_id=222, email="profile@campus.hub", password="x", first_name="Ayşe", last_name="Kaya")
+    club = await Clubs.create(club_name="Profil Kulübü", status="active")
+    event = await Events.create(title="Söyleşi", event_date=datetime.now() + timedelta(days=1), club=club)
+    for i in range(5):
+        await EventComments.create(user_id=222, event=event, content=f"yorum {i}")
+
+    profile, status = await UserService.get_user_profile(222, redis)
+    assert status == 200 and profile["profile"]["full_name"] == "Ayşe Kaya"
+    assert [c["content"] for c in profile["activities"]["comments"]] == ["yorum 4", "yorum 3"]
+    page_info = profile["pagination"]["comments"]
+    assert page_info["total"] == 5 and page_info["next"].startswith("/users/profile/comments?cursor=")
+
+    rest, cursor = [], page_info["next_cursor"]
+    while cursor:
+        page, _ = await UserService.get_comments(222, cursor, limit=2)
+        rest += [c["content"] for c in page["comments"]]
+        cursor = page["pagination"]["next_cursor"]
+    assert rest == ["yorum 2", "yorum 1", "yorum 0"]
+    assert (await UserService.get_comments(222, "bozuk"))[1] == 400
+
+    cached, _ = await UserService.get_user_profile(222, redis)
+    assert isinstance(cached, RawJSON)
+
+    ctx = {"sub": 222, "role": UserRole.STUDENT}
+    await CommentService.add_comment(ctx, event.event_id, "yeni yorum", redis)
+    assert not await redis.exists(UserService.summary_key(222))
+    profile, _ = await UserService.get_user_profile(222, redis)
+    assert profile["activities"]["comments"][0]["content"] == "yeni yorum"
+    assert profile["pagination"]["comments"]["total"] == 6
+
+    await UserService.update_profile(222, {"bio": "Merhaba"}, redis)
+    profile, _ = await UserService.get_user_profile(222, redis)
+    assert profile["profile"]["bio"] == "Merhaba"
+    assert (await UserService.get_user_profile(999, redis))[1] == 404
+
+@pytest.mark.asyncio
+async def test_event_detail_shared_cache_with_per_user_overlay():
+    """Detayın ortak kısmı önbellekten gelmeli; is_joined kullanıcıya göre, katılımda önbellek silinmeli."""
+    from fakeredis import FakeAsyncRedis
+    from src.services.event_service import EventService
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    for uid in (333, 334):
+        await Users.create(user_id=uid, email=f"detail{uid}@campus.hub", password="x", first_name="D", last_name="T")
+    club = await Clubs.create(club_name="Detay Kulübü", status="active")
+    event = await Events.create(title="Panel", event_date=datetime.now() + timedelta(days=2), club=club, quota=10)
+    await EventParticipation.create(user_id=333, event=event, status=ParticipationStatus.GOING)
+    await Events.filter(event_id=event.event_id).update(participant_count=1)
+
+    first, status = await EventService.get_event_detail(event.event_id, {"sub": 333}, redis)
+    assert status == 200 and first["event"]["club_name"] == "Detay Kulübü" and first["event"]["is_joined"] is True
+
+    # DB'deki değişiklik (geçersiz kılma olmadan) görünmez: ortak kısım SQL'e gitmeden önbellekten gelir
+    await Events.filter(event_id=event.event_id).update(title="Değişti")
+    cached, _ = await EventService.get_event_detail(event.event_id, {"sub": 334}, redis)
+    assert isinstance(cached, RawJSON)
+    assert cached["event"]["title"] == "Panel" and cached["event"]["is_joined"] is False
+    # Baytlarla eklenen alan gövdeyi geçerli JSON olarak bırakmalı
+    assert serialization.loads(cached.body) == {"event": {**first["event"], "is_joined": False}}
+    assert (await EventService.get_event_detail(event.event_id, {"sub": 333}, redis))[0]["event"]["is_joined"] is True
+
+    result, _ = await EventService.join_event({"sub": 334, "role": UserRole.STUDENT}, event.event_id, redis)
+    assert result == {"message": "Successfully joined"}
+    joined, _ = await EventService.get_event_detail(event.event_id, {"sub": 334}, redis)
+    assert joined["event"]["title"] == "Değişti"
+    assert joined["event"]["participant_count"] == 2 and joined["event"]["is_joined"] is True
+
+    await Events.filter(event_id=event.event_id).update(is_deleted=True)
+    await EventService.invalidate_detail(redis, event.event_id)
+    assert (await EventService.get_event_detail(event.event_id, None, redis))[1] == 404
+    assert (await EventService.get_event_detail(event.event_id, None))[1] == 404
+
+@pytest.mark.asyncio
+async def test_club_detail_pages_events_in_sql_and_streams_members():
+    """Etkinlikler yaklaşan önce sayfalanmalı, silinenler gelmemeli; üyeler yalnızca yöneticiye, parça parça."""
+    from fakeredis import FakeAsyncRedis
+    from src.services.club_service import ClubService
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    president = await Users.create(user_id=444, email="pres@campus.hub", password="x", first_name="B", last_name="K")
+    club = await Clubs.create(club_name="Sayfalı Kulüp", status="active", president=president)
+    now = datetime.now()
+    for days, title in [(3, "u3"), (1, "u1"), (2, "u2"), (-1, "p1"), (-5, "p5")]:
+        await Events.create(title=title, event_date=now + timedelta(days=days), club=club)
+    await Events.create(title="silinmiş", event_date=now + timedelta(days=4), club=club, is_deleted=True)
+    for uid in range(450, 455):
+        await Users.create(user_id=uid, email=f"m{uid}@campus.hub", password="x", first_name="Üye", last_name=str(uid))
+        await ClubFollowers.create(user_id=uid, club=club)
+    await Clubs.filter(club_id=club.club_id).update(follower_count=5)
+
+    titles, cursor = [], None
+    while True:
+        page, status = await ClubService.get_club_events(club.club_id, cursor, limit=2)
+        assert status == 200
+        titles += [e["title"] for e in page["events"]]
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor:
+            break
+    assert titles == ["u1", "u2", "u3", "p1", "p5"]
+
+    student = {"sub": 450, "role": UserRole.STUDENT}
+    detail, _ = await ClubService.get_club_details(club.club_id, student, redis)
+    assert [e["title"] for e in detail["club"]["events"]] == titles and "can_manage" not in detail["club"]
+    cached, _ = await ClubService.get_club_details(club.club_id, student, redis)
+    assert isinstance(cached, RawJSON)
+    managed, _ = await ClubService.get_club_details(club.club_id, {"sub": 444, "role": UserRole.CLUB_ADMIN}, redis)
+    assert managed["club"]["can_manage"] is True
+
+    await ClubService.leave_club(student, club.club_id, redis)
+    assert (await ClubService.get_club_details(club.club_id, student, redis))[0]["club"]["follower_count"] == 4
+
+    assert (await ClubService.get_members(student, club.club_id))[1] == 403
+    manager = {"sub": 444, "role": UserRole.CLUB_ADMIN}
+    first, _ = await ClubService.get_members(manager, club.club_id, limit=3)
+    second, _ = await ClubService.get_members(manager, club.club_id, first["pagination"]["next_cursor"], limit=3)
+    assert [m["user_id"] for m in first["members"] + second["members"]] == [451, 452, 453, 454]
+    assert second["pagination"]["next_cursor"] is None
+
+    chunks = [chunk async for chunk in ClubService.iter_members(club.club_id, chunk_size=3)]
+    assert [len(c) for c in chunks] == [3, 1] and chunks[0][0]["full_name"] == "Üye 451"
+
+@pytest.mark.asyncio
+async def test_comment_thread_first_page_cached_write_through():
+    """İlk sayfa Redis listesinden gelmeli; ekleme/silme listeyi güncellemeli, derin sayfalar DB'den."""
+    from fakeredis import FakeAsyncRedis
+    from src.models import EventComments
+    from src.services.admin_service import AdminService
+    from src.services.comment_service import CommentService
+    from src.services.user_service import UserService
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    await Users.create(user_id=555, email="yorum@campus.hub", password="x", first_name="Can", last_name="Ak")
+    club = await Clubs.create(club_name="Yorum Kulübü", status="active")
+    event = await Events.create(title="Konser", event_date=datetime.now() + timedelta(days=1), club=club)
+    for i in range(5):
+        await EventComments.create(user_id=555, event=event, content=f"c{i}")
+
+    page, _ = await CommentService.get_comments(event.event_id, None, 2, redis)
+    assert [c["content"] for c in page["comments"]] == ["c4", "c3"] and page["comments"][0]["user_name"] == "Can Ak"
+    deep, _ = await CommentService.get_comments(event.event_id, page["pagination"]["next_cursor"], 3, redis)
+    assert [c["content"] for c in deep["comments"]] == ["c2", "c1", "c0"] and deep["pagination"]["next_cursor"] is None
+
+    # Liste artık önbellekte: DB'ye gitmeden görünür
+    await EventComments.filter(event_id=event.event_id).update(content="db")
+    page, _ = await CommentService.get_comments(event.event_id, None, 10, redis)
+    assert [c["content"] for c in page["comments"]] == ["c4", "c3", "c2", "c1", "c0"]
+
+    # Ekleme listeyi düşürür; sonraki okuma DB'den sıralı kurar
+    await UserService.update_profile(555, {"full_name": "Can Akın"}, redis)
+    ctx = {"sub": 555, "role": UserRole.STUDENT}
+    _, status = await CommentService.add_comment(ctx, event.event_id, "yeni", redis)
+    assert status == 201
+    assert not await redis.exists(CommentService.cache_key(event.event_id))
+    page, _ = await CommentService.get_comments(event.event_id, None, 10, redis)
+    assert [c["content"] for c in page["comments"]] == ["yeni", "db", "db", "db", "db", "db"]
+    assert page["comments"][0]["user_name"] == "Can Akın" and page["pagination"]["next_cursor"] is None
+
+    await AdminService.delete_comment(page["comments"][1]["id"], redis)
+    page, _ = await CommentService.get_comments(event.event_id, None, 10, redis)
+    assert [c["content"] for c in page["comments"]] == ["yeni", "db", "db", "db", "db"]
+    assert (await CommentService.get_comments(event.event_id, "bozuk", 10, redis))[1] == 400
+
+@pytest.mark.asyncio
+async def test_comment_list_rebuild_does_not_lose_or_resurrect_comments(monkeypatch):
+    """Soğuk listeyi kuran okuma ile eşzamanlı ekleme/silme, listeye eksik ya da silinmiş yorum yazdırmamalı."""
+    from fakeredis import FakeAsyncRedis
+    from src.models import EventComments
+    from src.services.admin_service import AdminService
+    from src.services.comment_service import CommentService
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    await Users.create(user_id=556, email="yorum2@campus.hub", password="x", first_name="Ece", last_name="Su")
+    club = await Clubs.create(club_name="Yarış Kulübü", status="active")
+    event = await Events.create(title="Söyleşi", event_date=datetime.now() + timedelta(days=1), club=club)
+    old = await EventComments.create(user_id=556, event=event, content="eski")
+    ctx = {"sub": 556, "role": UserRole.STUDENT}
+
+    # Liste soğukken eklenen yorum ilk okumada görünür
+    await CommentService.add_comment(ctx, event.event_id, "ilk", redis)
+    page, _ = await CommentService.get_comments(event.event_id, None, 10, redis)
+    assert [c["content"] for c in page["comments"]] == ["ilk", "eski"]
+
+    latest_rows = CommentService._latest_rows
+    during_rebuild = []
+
+    async def racing_rows(event_id):
+        rows = await latest_rows(event_id)
+        for write in during_rebuild:
+            await write()
+        return rows
+
+    monkeypatch.setattr(CommentService, "_latest_rows", racing_rows)
+
+    # Yeniden kurma DB'yi okuduktan sonra gelen yorum kaybolmamalı
+    await redis.delete(CommentService.cache_key(event.event_id))
+    during_rebuild[:] = [lambda: CommentService.add_comment(ctx, event.event_id, "arada", redis)]
+    await CommentService.get_comments(event.event_id, None, 10, redis)
+    during_rebuild.clear()
+    page, _ = await CommentService.get_comments(event.event_id, None, 10, redis)
+    assert [c["content"] for c in page["comments"]] == ["arada", "ilk", "eski"]
+
+    # Yeniden kurmayla yarışan admin silmesi yorumu geri getirmemeli
+    await redis.delete(CommentService.cache_key(event.event_id))
+    during_rebuild[:] = [lambda: AdminService.delete_comment(old.comment_id, redis)]
+    await CommentService.get_comments(event.event_id, None, 10, redis)
+    during_rebuild.clear()
+    page, _ = await CommentService.get_comments(event.event_id, None, 10, redis)
+    assert [c["content"] for c in page["comments"]] == ["arada", "ilk"]
+
+@pytest.mark.asyncio
+async def test_failed_announcement_chunk_fails_job_and_retry_resumes(monkeypatch):
+    """Yazılamayan parça işi düşürmeli; yeniden deneme kaldığı yerden sürmeli, kimse iki kez almamalı."""
+    from fakeredis import FakeAsyncRedis
+    from tortoise import Tortoise
+    from src import jobs
+    from src.models import Notifications
+    from src.services.notification_service import NotificationService
+
+    @jobs.job("test_small_chunk_announcement")
+    async def announce(redis, message, after_id=0):
+        await NotificationService.send_announcement(message, chunk_size=4, redis=redis, after_id=after_id)
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    await Users.bulk_create([
+        Users(user_id=40000 + i, email=f"r{i}@campus.hub", password="x", first_name="R", last_name=str(i))
+        for i in range(10)
+    ])
+
+    conn = Tortoise.get_connection("default")
+    execute_query = conn.execute_query
+    inserts = []
+
+    async def flaky_execute(sql, values=None):
+        if sql.startswith("INSERT INTO notifications"):
+            inserts.append(values[-2])
+            if len(inserts) == 2:
+                raise ConnectionError("db gone")
+        return await execute_query(sql, values)
+
+    monkeypatch.setattr(conn, "execute_query", flaky_execute)
+    worker = jobs.Worker(redis, block_ms=10, retry_base=0)
+    await jobs.ensure_group(redis)
+    await jobs.enqueue(redis, "test_small_chunk_announcement", message="Yeniden")
+
+    assert await worker.run_once() == 1
+    stats = await jobs.queue_stats(redis)
+    assert stats["delayed"] == 1 and stats["counters"]["test_small_chunk_announcement:retried"] == 1
+    assert await Notifications.filter(message__contains="Yeniden").count() == 4
+
+    await worker.promote_delayed()
+    assert await worker.run_once() == 1
+    assert await Notifications.filter(message__contains="Yeniden").count() == 10
+    assert await Notifications.filter(user_id=40000, message__contains="Yeniden").count() == 1
@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from fakeredis import FakeAsyncRedis
+from src import jobs
+
+calls = []
+
+@jobs.job("test_echo")
+async def echo(redis, value):
+    calls.append(value)
+
+@jobs.job("test_always_fails")
+async def always_fails(redis):
+    raise RuntimeError("boom")
+
+@pytest.mark.asyncio
+async def test_job_is_processed_and_acknowledged():
+    redis = FakeAsyncRedis(decode_responses=True)
+    worker = jobs.Worker(redis, block_ms=10)
+    await jobs.ensure_group(redis)
+
+    await jobs.enqueue(redis, "test_echo", value="merhaba")
+    assert await worker.run_once() == 1
+    assert calls[-1] == "merhaba"
+
+    stats = await jobs.queue_stats(redis)
+    assert stats["in_progress"] == 0
+    assert stats["counters"]["test_echo:succeeded"] == 1
+
+@pytest.mark.asyncio
+async def test_failing_job_retries_then_goes_to_dead_letter():
+    redis = FakeAsyncRedis(decode_responses=True)
+    worker = jobs.Worker(redis, block_ms=10, max_attempts=3, retry_base=0)
+    await jobs.ensure_group(redis)
+
+    await jobs.enqueue(redis, "test_always_fails")
+    for _ in range(3):
+        assert await worker.run_once() == 1
+        await worker.promote_delayed()
+
+    stats = await jobs.queue_stats(redis)
+    assert stats["dead"] == 1
+    assert stats["delayed"] == 0
+    assert stats["counters"]["test_always_fails:retried"] == 2
+    dead = await redis.xrange(jobs.DEAD)
+    assert dead[0][1]["attempt"] == "3"
+
+@pytest.mark.asyncio
+async def test_stale_job_from_crashed_consumer_is_reclaimed():
+    redis = FakeAsyncRedis(decode_responses=True)
+    await jobs.ensure_group(redis)
+    await jobs.enqueue(redis, "test_echo", value="kurtarıldı")
+
+    # Mesajı alıp onaylamadan kaybolan bir worker
+    await redis.xreadgroup(jobs.GROUP, "crashed", {jobs.STREAM: ">"}, count=1)
+
+    worker = jobs.Worker(redis, claim_idle_ms=0)
+    await worker.reclaim_stale()
+    assert calls[-1] == "kurtarıldı"
+    assert (await jobs.queue_stats(redis))["in_progress"] == 0
+
+@pytest.mark.asyncio
+async def test_job_stays_pending_when_retry_cannot_be_written(monkeypatch):
+    redis = FakeAsyncRedis(decode_responses=True)
+    worker = jobs.Worker(redis, block_ms=10, max_attempts=3, retry_base=0, claim_idle_ms=0)
+    await jobs.ensure_group(redis)
+    await jobs.enqueue(redis, "test_always_fails")
+
+    async def redis_down(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(worker, "_handle_failure", redis_down)
+    assert await worker.run_once() == 1
+    assert (await jobs.queue_stats(redis))["in_progress"] == 1
+
+    # Redis geri gelince iş kaybolmamış olarak yeniden alınır ve yeniden denemeye yazılır
+    monkeypatch.undo()
+    await worker.reclaim_stale()
+    stats = await jobs.queue_stats(redis)
+    assert stats["in_progress"] == 0 and stats["delayed"] == 1
+
+@jobs.job("test_slow")
+async def slow(redis, value):
+    await asyncio.sleep(0.5)
+    calls.append(value)
+
+@pytest.mark.asyncio
+async def test_long_running_job_is_not_reclaimed_while_it_runs():
+    redis = FakeAsyncRedis(decode_responses=True)
+    await jobs.ensure_group(redis)
+    await jobs.enqueue(redis, "test_slow", value="uzun")
+    busy = jobs.Worker(redis, block_ms=10, claim_idle_ms=200)
+    other = jobs.Worker(redis, claim_idle_ms=200)
+    other.name = "other-worker"
+
+    async def reclaim_while_running():
+        for _ in range(4):
+            await asyncio.sleep(0.1)
+            await other.reclaim_stale()
+
+    await asyncio.gather(busy.run_once(), reclaim_while_running())
+    # Sahiplik tazelendiği için iş ikinci kez çalışmadı
+    assert calls.count("uzun") == 1
+    assert (await jobs.queue_stats(redis))["in_progress"] == 0
@@ -0,0 +1,82 @@
+import pytest
+import pytest_asyncio
+from fakeredis import FakeAsyncRedis
+from tortoise import Tortoise
+from tortoise.queryset import QuerySet
+from src import metrics, mini_profiles
+from src.config import TORTOISE_ORM
+from src.models import Users, UserRole
+from src.services.admin_service import AdminService
+from src.services.user_service import UserService
+
+@pytest_asyncio.fixture(autouse=True)
+async def setup_test_db():
+    mini_profiles.clear_local()
+    metrics.reset()
+    await Tortoise.init(config=TORTOISE_ORM)
+    await Tortoise.generate_schemas(safe=True)
+    yield
+    await Tortoise.close_connections()
+
+def db_queries():
+    return metrics.snapshot()["counters"].get("mini_profile_db_queries_total", 0)
+
+@pytest.mark.asyncio
+async def test_batched_lookup_goes_through_lru_then_redis_then_db():
+    redis = FakeAsyncRedis(decode_responses=True)
+    await Users.create(user_id=1, email="a@campus.hub", password="hash", first_name="Ada", last_name="Y",
+                       department="Fizik", profile_image="a.png", bio="uzun biyografi")
+    await Users.create(user_id=2, email="b@campus.hub", password="hash", first_name="Baran", last_name="T")
+
+    profiles = await mini_profiles.get_many(redis, [1, 2, 1, 99])
+    assert set(profiles) == {1, 2} and db_queries() == 1
+    assert profiles[1] == {"id": 1, "name": "Ada Y", "avatar": "a.png", "department": "Fizik",
+                           "role": "student", "is_active": True}
+
+    # Süreç içi LRU boşalsa da Redis hash'i DB'ye gitmeden cevaplar
+    await mini_profiles.get_many(redis, [1, 2])
+    mini_profiles.clear_local()
+    assert (await mini_profiles.get_many(redis, [1, 2]))[2]["name"] == "Baran T"
+    assert db_queries() == 1
+
+@pytest.mark.asyncio
+async def test_profile_role_and_ban_changes_invalidate():
+    redis = FakeAsyncRedis(decode_responses=True)
+    await Users.create(user_id=3, email="c@campus.hub", password="hash", first_name="Cem", last_name="O")
+    await mini_profiles.get_many(redis, [3])
+
+    await UserService.update_profile(3, {"full_name": "Cem Öz", "department": "Tarih"}, redis)
+    profile = (await mini_profiles.get_many(redis, [3]))[3]
+    assert (profile["name"], profile["department"]) == ("Cem Öz", "Tarih")
+
+    await AdminService.update_user_role(3, UserRole.CLUB_ADMIN.value, redis)
+    assert (await mini_profiles.get_many(redis, [3]))[3]["role"] == "club_admin"
+
+    await AdminService.toggle_user_ban(3, redis)
+    assert (await mini_profiles.get_many(redis, [3]))[3]["is_active"] is False
+
+@pytest.mark.asyncio
+async def test_redis_entries_expire_and_stale_load_is_not_written_back(monkeypatch):
+    redis = FakeAsyncRedis(decode_responses=True)
+    await Users.create(user_id=4, email="d@campus.hub", password="hash", first_name="Deniz", last_name="K")
+    await mini_profiles.get_many(redis, [4])
+    assert 0 < await redis.ttl(mini_profiles.cache_key(4)) <= mini_profiles.MINI_PROFILE_CACHE_TTL
+
+    # Yükleme DB'yi okuduktan sonra profil değişir: eski ad Redis'e yazılmamalı
+    await mini_profiles.invalidate(redis, 4)
+    mini_profiles.clear_local()
+    values = QuerySet.values
+
+    async def racing_values(query, *args, **kwargs):
+        rows = await values(query, *args, **kwargs)
+        await Users.filter(user_id=4).update(first_name="Derin")
+        await mini_profiles.invalidate(redis, 4)
+        return rows
+
+    monkeypatch.setattr(QuerySet, "values", racing_values)
+    assert (await mini_profiles.get_many(redis, [4]))[4]["name"] == "Deniz K"
+    monkeypatch.undo()
+    assert not await redis.exists(mini_profiles.cache_key(4))
+
+    mini_profiles.clear_local()
+    assert (await mini_profiles.get_many(redis, [4]))[4]["name"] == "Derin K"
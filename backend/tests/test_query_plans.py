@@ -0,0 +1,87 @@
+import re
+import pytest
+import pytest_asyncio
+from datetime import datetime
+from tortoise import Tortoise
+from src import mini_profiles, pagination
+from src.models import Clubs, ClubFollowers, EventParticipation, Notifications, ParticipationStatus
+from src.services.club_service import ClubService
+from src.services.comment_service import CommentService
+from src.services.event_service import EventService
+from src.services.notification_service import NotificationService
+from src.services.user_service import UserService
+from src.config import TORTOISE_ORM
+
+NOW = datetime(2025, 1, 1, 12, 0)
+
+CURSOR = pagination.encode_cursor(NOW, 10)
+
+# Servislerin sıcak yollarda çalıştırdığı sorgular, servislerin kendi sorgu kurucularından alınır;
+# her biri bir indeksle karşılanmalı
+HOT_QUERIES = {
+    "event_listing": lambda: EventService._listing_query(None).order_by("event_date", "event_id").limit(21),
+    "event_listing_cursor": lambda: EventService._cursor_query(None, None, (NOW, 10)).limit(21),
+    "active_clubs": lambda: Clubs.filter(is_deleted=False, status="active"),
+    "club_events_upcoming": lambda: ClubService._events_query(1, True, (NOW, 10), NOW).limit(21),
+    "club_events_past": lambda: ClubService._events_query(1, False, (NOW, 10), NOW).limit(21),
+    "club_members": lambda: ClubService._members_query(1, 100).limit(51),
+    "club_follower_fanout": lambda: ClubFollowers.filter(club_id=1, id__gt=100).order_by("id").limit(1000),
+    "event_participants": lambda: EventParticipation.filter(event_id=1, status=ParticipationStatus.GOING),
+    "user_history": lambda: EventParticipation.filter(user_id=1, status=ParticipationStatus.GOING).order_by("-created_at"),
+    "event_comments": lambda: CommentService._page_query(1, CURSOR).limit(21),
+    "user_participations": lambda: UserService._participations_query(1, CURSOR).limit(21),
+    "user_followed_clubs": lambda: UserService._followed_clubs_query(1, CURSOR).limit(21),
+    "user_comments": lambda: UserService._comments_query(1, CURSOR).limit(21),
+    "mini_profiles": lambda: mini_profiles._rows_query([1, 2, 3]),
+    "notification_feed_unread": lambda: NotificationService._feed_query(1, False, (NOW, 10)).limit(21),
+    "notification_feed_read": lambda: NotificationService._feed_query(1, True).limit(21),
+    "unread_count": lambda: Notifications.filter(user_id=1, is_read=False),
+}
+
+# Keyset sayfaları sırayı indeksten okumalı; filesort sayfa derinliğinden bağımsız olarak tüm eşleşenleri sıralar
+KEYSET_QUERIES = sorted(name for name in HOT_QUERIES if name not in ("active_clubs", "event_participants",
+                                                                     "mini_profiles", "unread_count"))
+
+# Sadece tablo adıyla biten "SCAN <tablo>" satırı tam tarama demektir
+_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def setup_test_db():
+    await Tortoise.init(config=TORTOISE_ORM)
+    await Tortoise.generate_schemas(safe=True)
+    yield
+    await Tortoise.close_connections()
+
+
+async def _full_scans(conn, sql: str):
+    if conn.capabilities.dialect == "mysql":
+        # Boş tabloda optimizer yine de ALL seçebilir; kullanılabilir indeks hiç yoksa tam taramadır
+        rows = await conn.execute_query_dict("EXPLAIN " + sql)
+        return [r["table"] for r in rows if r["type"] == "ALL" and not r["possible_keys"]]
+    rows = await conn.execute_query_dict("EXPLAIN QUERY PLAN " + sql)
+    return [m.group(1) for m in (_FULL_SCAN.match(r["detail"]) for r in rows) if m]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+async def test_hot_queries_use_an_index(name):
+    conn = Tortoise.get_connection("default")
+    sql = HOT_QUERIES[name]().sql(params_inline=True)
+    assert await _full_scans(conn, sql) == [], f"{name} tam tablo taraması yapıyor: {sql}"
+
+
+async def _filesorts(conn, sql: str):
+    if conn.capabilities.dialect == "mysql":
+        rows = await conn.execute_query_dict("EXPLAIN " + sql)
+        return [r["table"] for r in rows if "Using filesort" in (r["Extra"] or "")]
+    rows = await conn.execute_query_dict("EXPLAIN QUERY PLAN " + sql)
+    return [r["detail"] for r in rows if "TEMP B-TREE FOR ORDER BY" in r["detail"]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", KEYSET_QUERIES)
+async def test_keyset_pages_read_order_from_an_index(name):
+    conn = Tortoise.get_connection("default")
+    sql = HOT_QUERIES[name]().sql(params_inline=True)
+    assert await _filesorts(conn, sql) == [], f"{name} sıralama için filesort yapıyor: {sql}"
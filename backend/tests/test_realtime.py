@@ -0,0 +1,48 @@
+import asyncio
+import json
+import pytest
+from fakeredis import FakeAsyncRedis
+from src import realtime
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = asyncio.Queue()
+
+    async def send(self, data):
+        await self.sent.put(json.loads(data))
+
+@pytest.mark.asyncio
+async def test_publish_reaches_connection_through_redis_pubsub():
+    redis = FakeAsyncRedis(decode_responses=True)
+    hub_task = asyncio.create_task(realtime.hub.run(redis))
+    ws = FakeWebSocket()
+    serve_task = asyncio.create_task(realtime.serve(ws, 42, heartbeat=0.2))
+    try:
+        assert (await asyncio.wait_for(ws.sent.get(), 1))["type"] == "ready"
+        await asyncio.sleep(0.1)  # aboneliğin oturması için
+
+        await realtime.publish(redis, [41, 42], {"message": "Yeni etkinlik"})
+        message = await asyncio.wait_for(ws.sent.get(), 2)
+        assert message == {"type": "notification", "message": "Yeni etkinlik"}
+
+        # Mesaj yoksa heartbeat gönderilir
+        assert (await asyncio.wait_for(ws.sent.get(), 1))["type"] == "ping"
+    finally:
+        serve_task.cancel()
+        hub_task.cancel()
+        await asyncio.gather(serve_task, hub_task, return_exceptions=True)
+    assert realtime.hub.connection_count == 0
+
+@pytest.mark.asyncio
+async def test_slow_connection_drops_messages_and_asks_for_resync():
+    conn = realtime.Connection(user_id=7, max_queue=2)
+    realtime.hub.register(conn)
+    try:
+        raw = json.dumps({"user_ids": [7], "payload": {"message": "x"}})
+        for _ in range(5):
+            realtime.hub.dispatch(raw)
+        assert conn.queue.qsize() == 2
+        assert (await conn.next_message(0.1)) == {"type": "resync"}
+        assert (await conn.next_message(0.1))["type"] == "notification"
+    finally:
+        realtime.hub.unregister(conn)
@@ -0,0 +1,76 @@
+import itertools
+import shutil
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+from fakeredis import FakeAsyncRedis
+from tortoise import Tortoise
+from src import db_router
+from src.models import Clubs, Events
+from src.services.event_service import EventService
+
+MODULES = {"models": {"models": ["src.models"], "default_connection": "default"}}
+
+@pytest_asyncio.fixture
+async def primary_and_replica(tmp_path, monkeypatch):
+    """İki SQLite dosyası: replika, birincilin ilk halinin kopyası (replikasyon gecikmesini taklit eder)"""
+    primary, replica = tmp_path / "primary.sqlite3", tmp_path / "replica.sqlite3"
+    await Tortoise.init(config={"connections": {"default": f"sqlite://{primary}"}, "apps": MODULES})
+    await Tortoise.generate_schemas()
+    club = await Clubs.create(club_name="Replika Kulübü", status="active")
+    await Events.create(title="Replikada da var", event_date=datetime.now() + timedelta(days=1), club=club)
+    await Tortoise.close_connections()
+    shutil.copy(primary, replica)
+
+    await Tortoise.init(config={
+        "connections": {"default": f"sqlite://{primary}", "replica_0": f"sqlite://{replica}"},
+        "apps": MODULES,
+        "routers": ["src.db_router.ReplicaRouter"],
+    })
+    monkeypatch.setattr(db_router, "_replicas", itertools.cycle(["replica_0"]))
+    yield club
+    await Tortoise.close_connections()
+
+async def _listed_titles():
+    result, _ = await EventService.get_events(None)
+    return {e["title"] for e in result["events"]}
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_and_writes_to_primary(primary_and_replica):
+    await Events.create(title="Sadece birincilde", event_date=datetime.now() + timedelta(days=2), club=primary_and_replica)
+
+    # Yazma birincile gitti, salt okunur servis metodu ise replikadan okuyor
+    assert await Events.filter(title="Sadece birincilde").exists()
+    assert await _listed_titles() == {"Replikada da var"}
+
+@pytest.mark.asyncio
+async def test_recent_writer_reads_from_primary(primary_and_replica):
+    redis = FakeAsyncRedis(decode_responses=True)
+    await Events.create(title="Sadece birincilde", event_date=datetime.now() + timedelta(days=2), club=primary_and_replica)
+    await db_router.pin_to_primary(redis, 7)
+
+    assert await db_router.use_primary_if_pinned(redis, 8) is False
+    assert await _listed_titles() == {"Replikada da var"}
+
+    assert await db_router.use_primary_if_pinned(redis, 7) is True
+    assert await _listed_titles() == {"Replikada da var", "Sadece birincilde"}
+    assert 0 < await redis.ttl(db_router._pin_key(7)) <= db_router.READ_YOUR_WRITES_SECONDS
+
+@pytest.mark.asyncio
+async def test_cache_fill_reads_from_primary(primary_and_replica):
+    redis = FakeAsyncRedis(decode_responses=True)
+    await Events.create(title="Sadece birincilde", event_date=datetime.now() + timedelta(days=2), club=primary_and_replica)
+
+    # Paylaşılan önbelleği dolduran yükleme replikanın gecikmiş halini yazmamalı
+    result, _ = await EventService.get_events(redis)
+    assert {e["title"] for e in result["events"]} == {"Replikada da var", "Sadece birincilde"}
+    # Önbelleksiz okuma replikada kalır
+    assert await _listed_titles() == {"Replikada da var"}
+
+@pytest.mark.asyncio
+async def test_cached_approximate_total_counts_on_primary(primary_and_replica):
+    redis = FakeAsyncRedis(decode_responses=True)
+    await Events.create(title="Sadece birincilde", event_date=datetime.now() + timedelta(days=2), club=primary_and_replica)
+
+    result, _ = await EventService.get_events_by_cursor(redis, with_total=True)
+    assert result["pagination"]["approximate_total"] == 2
@@ -0,0 +1,87 @@
+import pytest
+import pytest_asyncio
+from tortoise import Tortoise
+from src.models import Clubs, Events, UserRole
+from src.services.event_service import EventService
+from src.config import TORTOISE_ORM
+from src import search
+from datetime import datetime, timedelta
+
+@pytest_asyncio.fixture(autouse=True)
+async def setup_test_db():
+    await Tortoise.init(config=TORTOISE_ORM)
+    await Tortoise.generate_schemas(safe=True)
+    search.get_index().reset()
+    yield
+    await Tortoise.close_connections()
+
+def test_turkish_tokenization():
+    assert search.tokenize("IŞIK Kulübü'nün İstanbul Etkinliği") == ["isik", "kulubu", "istanbul", "etkinligi"]
+    assert search.normalize_query("  Python  ile VERİ ") == search.normalize_query("veri python İLE")
+
+@pytest.mark.asyncio
+async def test_event_search_ranking_and_incremental_updates():
+    club = await Clubs.create(club_name="Arama Kulübü", status="active")
+    when = datetime.now() + timedelta(days=1)
+    in_title = await Events.create(title="Python Atölyesi", description="Temel kavramlar", event_date=when, club=club)
+    in_desc = await Events.create(title="Haftalık Buluşma", description="Bu hafta python konuşacağız", event_date=when, club=club)
+    await Events.create(title="Satranç Turnuvası", description="Açık turnuva", event_date=when, club=club)
+
+    result, _ = await EventService.get_events(None, search_text="PYTHON")
+    assert [e["id"] for e in result["events"]] == [in_title.event_id, in_desc.event_id]
+
+    result, _ = await EventService.get_events(None, search_text="satranc turnuva")
+    assert [e["title"] for e in result["events"]] == ["Satranç Turnuvası"]
+
+    admin = {"sub": 1, "role": UserRole.ADMIN}
+    await EventService.update_event(admin, in_desc.event_id, {"description": "Gitar dersi"})
+    await EventService.delete_event(admin, in_title.event_id)
+
+    result, _ = await EventService.get_events(None, search_text="python")
+    assert result["events"] == []
+    result, _ = await EventService.get_events(None, search_text="gitar")
+    assert result["pagination"]["total"] == 1
+
+@pytest.mark.asyncio
+async def test_mysql_fulltext_receives_unfolded_terms(monkeypatch):
+    """Önbellek anahtarı ASCII'ye indirgenir ama FULLTEXT'e kullanıcının yazdığı Türkçe harfler gider"""
+    received = []
+
+    class FakeConnection:
+        async def execute_query_dict(self, sql, params):
+            received.append(params[0])
+            return []
+
+    class FakeTortoise:
+        @staticmethod
+        def get_connection(name):
+            return FakeConnection()
+
+    monkeypatch.setattr(search, "Tortoise", FakeTortoise)
+    monkeypatch.setattr(search, "get_index", lambda: search.MySQLFullTextIndex())
+
+    result, _ = await EventService.get_events(None, search_text="IŞIK Atölyesi")
+    assert result["events"] == []
+    assert received == ["+ışık* +atölyesi*"]
+
+@pytest.mark.asyncio
+async def test_in_memory_index_rebuilds_when_another_worker_bumps_generation():
+    """Başka worker'ın yazması bu süreçteki indekse uğramaz; "events" nesli değişince indeks yeniden kurulur"""
+    from fakeredis import FakeAsyncRedis
+    from src import cache
+    redis = FakeAsyncRedis()
+    club = await Clubs.create(club_name="Arama Kulübü", status="active")
+    when = datetime.now() + timedelta(days=1)
+    await Events.create(title="Python Atölyesi", description="Temel kavramlar", event_date=when, club=club)
+
+    result, _ = await EventService.get_events(redis, search_text="python")
+    assert result["pagination"]["total"] == 1
+    assert result["pagination"]["truncated"] is False
+
+    # Diğer worker: kaydı yazar, kendi indeksini günceller, nesli artırır
+    await Events.create(title="İleri Python", description="Asenkron programlama", event_date=when, club=club)
+    await cache.bump_generation(redis, cache.EVENTS_NAMESPACE)
+
+    result, _ = await EventService.get_events(redis, search_text="python")
+    assert result["pagination"]["total"] == 2
+    await redis.aclose()
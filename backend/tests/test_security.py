@@ -13,4 +13,29 @@ def test_jwt_operations():
     decoded = decode_access_token(token)
     assert decoded is not None
     assert str(decoded["sub"]) == str(user_id)
-    assert decoded["role"] == role
\ No newline at end of file
+    assert decoded["role"] == role
+
+@pytest.mark.asyncio
+async def test_async_hashing_pool():
+    from src import hashing
+    hashing.init_hash_pool(workers=1)
+    try:
+        hashed = await hashing.hash_password("campus_123")
+        assert await hashing.verify_password("campus_123", hashed) is True
+        assert await hashing.verify_password("wrong_pass", hashed) is False
+    finally:
+        await hashing.shutdown_hash_pool()
+
+@pytest.mark.asyncio
+async def test_hashing_pool_rejects_when_saturated():
+    import asyncio
+    from src import hashing
+    hashing.init_hash_pool(workers=1, max_pending=1)
+    try:
+        results = await asyncio.gather(
+            hashing.hash_password("a"), hashing.hash_password("b"), return_exceptions=True
+        )
+        assert isinstance(results[0], str)
+        assert isinstance(results[1], hashing.HashPoolSaturated)
+    finally:
+        await hashing.shutdown_hash_pool()
@@ -0,0 +1,26 @@
+import pytest
+from tortoise.exceptions import OperationalError
+from src import database, metrics
+from src.boot import BootTimer
+from src.models import Events
+
+@pytest.mark.asyncio
+async def test_fast_boot_opens_pool_without_touching_schema():
+    metrics.reset()
+    timer = BootTimer("Test worker")
+    with timer.phase("db_init"):
+        await database.init_db()
+    with timer.phase("db_pool"):
+        await database.warm_pools()
+    timer.log()
+    try:
+        # Şema migrate adımına bırakıldığı için boş veritabanında tablo yok
+        with pytest.raises(OperationalError):
+            await Events.all().count()
+    finally:
+        await database.close_db()
+
+    assert [label for label, _ in timer.phases] == ["db_init", "db_pool"]
+    histograms = metrics.snapshot()["histograms"]
+    assert histograms["boot_seconds"]["count"] == 1
+    assert histograms["boot_db_pool_seconds"]["count"] == 1
@@ -0,0 +1,132 @@
+import asyncio
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from fakeredis import FakeAsyncRedis
+from src import http_client
+from src.circuit import CircuitBreaker, OPEN
+from src.services import weather_service
+from src.services.weather_service import WeatherService
+
+class FakeOpenMeteo:
+    """Geocoding ve forecast uçlarını taklit eden yerel sunucu"""
+
+    def __init__(self):
+        self.calls = {"search": 0, "forecast": 0}
+        self.fail = False
+        self.delay = 0
+
+    async def search(self, request):
+        self.calls["search"] += 1
+        if request.query["name"].lower() == "atlantis":
+            return web.json_response({"generationtime_ms": 0.1})
+        return web.json_response({"results": [{"name": "İstanbul", "latitude": 41.01, "longitude": 28.97}]})
+
+    async def forecast(self, request):
+        self.calls["forecast"] += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            return web.json_response({"error": True}, status=502)
+        return web.json_response({"current_weather": {"temperature": 18.5, "windspeed": 7.2, "weathercode": 2}})
+
+@pytest_asyncio.fixture
+async def upstream(monkeypatch):
+    fake = FakeOpenMeteo()
+    app = web.Application()
+    app.router.add_get("/v1/search", fake.search)
+    app.router.add_get("/v1/forecast", fake.forecast)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    monkeypatch.setattr(weather_service, "GEOCODING_API_URL", f"http://127.0.0.1:{port}/v1/search")
+    monkeypatch.setattr(weather_service, "WEATHER_API_URL", f"http://127.0.0.1:{port}/v1/forecast")
+    monkeypatch.setattr(WeatherService, "breaker", CircuitBreaker("test_weather", failure_threshold=2, reset_timeout=60))
+    monkeypatch.setattr(http_client, "_session", aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=0.3)))
+    yield fake
+    await http_client.close_http_session()
+    await runner.cleanup()
+
+@pytest.mark.asyncio
+async def test_geocode_is_cached_separately_from_weather(upstream):
+    redis = FakeAsyncRedis(decode_responses=True)
+
+    result, status = await WeatherService.get_current_weather(redis, "İSTANBUL")
+    assert status == 200 and result["weather"]["description"] == "Parçalı Bulutlu"
+    cached, _ = await WeatherService.get_current_weather(redis, " istanbul")
+    assert cached["weather"] == result["weather"]
+    assert upstream.calls == {"search": 1, "forecast": 1}
+
+    # Hava durumu süresi dolsa da koordinatlar önbellekten gelir
+    await redis.delete("weather:istanbul")
+    await WeatherService.get_current_weather(redis, "Istanbul")
+    assert upstream.calls == {"search": 1, "forecast": 2}
+    assert await redis.ttl("geo:istanbul") > 86400
+
+    assert (await WeatherService.get_current_weather(redis, "Atlantis"))[1] == 404
+    assert (await WeatherService.get_current_weather(redis, "atlantis"))[1] == 404
+    assert upstream.calls["search"] == 2
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_serves_last_known_weather(upstream):
+    redis = FakeAsyncRedis(decode_responses=True)
+    fresh, _ = await WeatherService.get_current_weather(redis, "Istanbul")
+
+    upstream.fail = True
+    for _ in range(2):
+        await redis.delete("weather:istanbul")
+        result, status = await WeatherService.get_current_weather(redis, "Istanbul")
+        assert status == 200
+        assert result == {"weather": fresh["weather"], "stale": True}
+    assert WeatherService.breaker.state == OPEN
+
+    # Devre açıkken Open-Meteo'ya hiç gidilmez
+    calls = upstream.calls["forecast"]
+    await redis.delete("weather:istanbul")
+    assert (await WeatherService.get_current_weather(redis, "Istanbul"))[1] == 200
+    assert upstream.calls["forecast"] == calls
+
+@pytest.mark.asyncio
+async def test_slow_upstream_counts_as_failure(upstream):
+    redis = FakeAsyncRedis(decode_responses=True)
+    upstream.delay = 1
+    result, status = await WeatherService.get_current_weather(redis, "Istanbul")
+    assert status == 503 and result == {"error": "Weather service unavailable"}
+    assert WeatherService.breaker.failures == 1
+    assert not await redis.exists("weather:istanbul")
+
+@pytest.mark.asyncio
+async def test_prefetcher_refreshes_popular_cities_before_expiry(upstream):
+    from src.prefetch import WeatherPrefetcher, LOCK_KEY
+    redis = FakeAsyncRedis(decode_responses=True)
+    for city in ("İstanbul", "istanbul", "ISTANBUL"):
+        await WeatherService.record_request(redis, city)
+    await WeatherService.record_request(redis, "Ankara")
+    prefetcher = WeatherPrefetcher(redis, top_n=1, interval=60, ahead=120)
+
+    # Geocode henüz önbellekte yok: katlanmış anahtarla ("istanbul") Open-Meteo sorgulanmaz
+    assert (await prefetcher.run_once())["skipped"] == 1
+    assert upstream.calls == {"search": 0, "forecast": 0}
+    # Popülerlik yarılandı, tek istekli şehir de henüz listede
+    assert await redis.zscore("weather:popular", "istanbul") == 1.5
+    # Aynı aralıkta ikinci tur (başka bir worker) çalışmaz
+    assert await prefetcher.run_once() is None
+
+    await WeatherService.get_current_weather(redis, "İstanbul")
+    await redis.delete(WeatherService.cache_key("istanbul"), LOCK_KEY)
+    assert (await prefetcher.run_once())["refreshed"] == 1
+    # Yenileme önbellekteki geocode'u kullanır
+    assert upstream.calls == {"search": 1, "forecast": 2}
+
+    await redis.delete(LOCK_KEY)
+    assert (await prefetcher.run_once())["fresh"] == 1
+    assert upstream.calls["forecast"] == 2
+
+    # Kullanıcı isteği önceden yüklenmiş değere denk gelir
+    await WeatherService.get_current_weather(redis, "Istanbul")
+    assert upstream.calls["forecast"] == 2
+    stats = await WeatherService.upstream_stats(redis)
+    assert stats["calls"] == {"geocode": 1, "forecast": 2}